@@ -0,0 +1,37 @@
+# athena/api/google_api/_fastjson.py
+
+# External Imports
+from googleapiclient import model                       # Response body deserialization
+
+# Optional Imports
+try:
+    import orjson                                       # Fast parser, when installed
+except ImportError:
+    orjson = None
+
+
+_original_deserialize = model.JsonModel.deserialize
+
+
+def _deserialize(self, content):
+    """
+    Drop-in replacement for JsonModel.deserialize that parses with orjson.
+
+    Anything orjson rejects (e.g. an empty body) goes to the original method so
+    error handling is unchanged.
+    """
+    try:
+        body = orjson.loads(content)
+    except orjson.JSONDecodeError:
+        return _original_deserialize(self, content)
+    if self._data_wrapper and isinstance(body, dict) and 'data' in body:
+        body = body['data']
+    return body
+
+
+def install():
+    """
+    Parse Google API response bodies with orjson. Does nothing if orjson is not installed.
+    """
+    if orjson is not None:
+        model.JsonModel.deserialize = _deserialize
@@ -7,6 +7,8 @@ import configparser                                                 # For config
 import json
 import os                                                           # For file operations
 import logging                                                      # For logging
+import random                                                       # For retry jitter
+import threading                                                    # For bounding in-flight work
 import time                                                         # For time operations
 
 # External Imports
@@ -14,6 +16,7 @@ from google.api_core import retry                                   # For retryi
 from google.oauth2 import service_account                           # For service account credentials
 from googleapiclient.discovery import build                         # For building API service
 from google.auth.exceptions import RefreshError                     # For handling credential refresh errors
+from googleapiclient.errors import HttpError                        # For handling API errors
 from google.auth.transport.requests import Request as GoogleAuthRequest
 from google.oauth2 import service_account
 
@@ -24,6 +27,11 @@ logger = logging.getLogger(__name__)                                # Get logger
 # Local Imports
 from athena.api import _API_Path                                            # API path structure
 from athena.utils.data_utils import DataUtilities                       # Data utilities for processing data
+from athena.utils.rate_utils import TokenBucket                         # Request rate limiting
+from athena.utils.cache_utils import TTLCache                           # Response caching
+from athena.api.google_api import _fastjson                             # orjson response parsing
+
+_fastjson.install()
 
 
 class Initialize:
@@ -176,9 +184,18 @@ class Devices(Initialize):
     MAX_BATCH_SIZE = 50
     MAX_RETRIES = 3
     RETRY_DELAY = 1  # seconds
+    MAX_DEVICE_PAGE_SIZE = 300       # chromeosdevices.list maxResults ceiling
+    FALLBACK_DEVICE_PAGE_SIZE = 150  # Page size after a server error on a large page
     REBOOT_COMMAND_TYPE = "REBOOT"
+    RESET_MAX_WORKERS = 8            # Concurrent issueCommand calls during bulk resets
+    API_QPS = 20                     # Admin SDK per-user queries-per-second ceiling
+    MAX_RATE_LIMIT_RETRIES = 6
+    RATE_LIMIT_REASONS = frozenset({'rateLimitExceeded', 'userRateLimitExceeded', 'servingLimitExceeded', 'quotaExceeded'})
 
-    _instance = None
+    _local = threading.local()       # Per-thread instances for get_instance()
+    _rate_limiter = TokenBucket(API_QPS)
+    _org_unit_cache = TTLCache(maxsize=1, ttl=600)  # list_organizational_units; OUs rarely change
+    _device_cache = TTLCache(maxsize=1024, ttl=30)  # find_device by identifier and field set; cleared by writes
 
     def __init__(self):
         """
@@ -188,16 +205,24 @@ class Devices(Initialize):
         self.credentials = self.read_credentials()
         self.admin = self.load_admin()
         self.service = None
+        self._thread_services = threading.local()  # Per-thread service cache; see load_service
         self.verify_configuration()
-        self._device_cache = {}
         logging.getLogger('googleapiclient.discovery_cache').setLevel(logging.ERROR)
 
     ## GET INSTANCE
     @staticmethod
     def get_instance():
-        if Devices._instance is None:
-            Devices._instance = Devices()
-        return Devices._instance
+        """
+        Return this thread's shared Devices instance, creating it on first use.
+
+        Instances are per thread because the underlying httplib2 connection is not
+        thread-safe; within a thread, the instance and its open connection are reused
+        across calls, which is what keeps a long-lived process from re-handshaking.
+        """
+        instance = getattr(Devices._local, 'instance', None)
+        if instance is None:
+            instance = Devices._local.instance = Devices()
+        return instance
 
     def load_admin(self):
         """
@@ -242,11 +267,26 @@ class Devices(Initialize):
         if credentials is None:
             credentials = self.admin
 
+        # Reuse the service (and its HTTP connection) built for the admin credentials, but
+        # only within one thread: httplib2 connections must not be shared between threads,
+        # and worker pools such as list_all_devices' call this from many threads at once
+        key = (service_name, version)
+        cacheable = credentials is self.admin
+        services = getattr(self._thread_services, 'services', None)
+        if services is None:
+            services = self._thread_services.services = {}
+        if cacheable and key in services:
+            return services[key]
+
         try:
-            service = build(service_name, version, credentials=credentials)
+            # Use the discovery document bundled with the client; no fetch or file cache
+            service = build(service_name, version, credentials=credentials,
+                            cache_discovery=False, static_discovery=True)
         except RefreshError as e:
             logger.error(f"Failed to refresh credentials: {str(e)}")
             raise
+        if cacheable:
+            services[key] = service
         return service
 
     def process_device(self, device, keys, include_null):
@@ -273,7 +313,7 @@ class Devices(Initialize):
                 return None
         return data
 
-    def find_device(self, identifier, identifier_type='annotatedAssetId', *args, include_null=False):
+    def find_device(self, identifier, identifier_type='annotatedAssetId', *args, include_null=False, use_cache=True):
         """
         Find a device by its annotatedAssetId or serialNumber across all organizational units.
         Args:
@@ -282,6 +322,8 @@ class Devices(Initialize):
             Either 'annotatedAssetId' or 'serialNumber'. Defaults to 'annotatedAssetId'.
         *args: Fields to retrieve for the device. If not specified, default fields will be used.
         include_null (bool): Whether to include fields with null values in the response.
+        use_cache (bool): Whether a recently cached result may be returned. Pass False
+            when the current value is needed, e.g. before overwriting it.
         Returns:
         dict or str: The device information if found, None otherwise.
                     If only one field is requested, returns the value directly.
@@ -289,10 +331,10 @@ class Devices(Initialize):
         if identifier_type not in ['annotatedAssetId', 'serialNumber']:
             raise ValueError("identifier_type must be either 'annotatedAssetId' or 'serialNumber'")
 
-        # Check cache first
-        cache_key = f"{identifier_type}:{identifier}"
-        if cache_key in self._device_cache:
-            result = self._device_cache[cache_key]
+        # Check cache first; a lookup for fewer fields must not satisfy a later, wider one
+        cache_key = (identifier_type, identifier, args, include_null)
+        result = self._device_cache.get(cache_key) if use_cache else None
+        if result is not None:
             return list(result.values())[0] if len(args) == 1 else result
 
         try:
@@ -348,6 +390,60 @@ class Devices(Initialize):
             logging.exception("Exception details:")
             return None
 
+    def invalidate_devices(self):
+        """
+        Drop cached find_device results after devices have been modified.
+
+        Entries are keyed by field set as well as identifier, and a write may be
+        addressed by deviceId while the cache is keyed by asset ID or serial, so
+        the whole cache is cleared rather than picking out entries.
+        """
+        self._device_cache.clear()
+
+    def search_devices(self, query, *args, max_results=10, include_null=False):
+        """
+        Search devices server-side with the Admin SDK device query syntax.
+
+        Args:
+        query (str): Search string, e.g. 'asset_id:1234', 'user:jdoe' or free text
+            (free text matches across the searchable device fields).
+        *args: Fields to retrieve for each device. Defaults to the basic device fields.
+        max_results (int): Maximum number of devices to return. Defaults to 10.
+        include_null (bool): Whether to include fields with null values in the response.
+        Returns:
+        list: Matching devices (possibly empty). Errors are logged and yield an empty list.
+        """
+        fields = args or [
+            'deviceId', 'serialNumber', 'annotatedAssetId', 'model', 'status',
+            'orgUnitPath', 'annotatedUser', 'annotatedLocation', 'notes',
+            'lastSync', 'osVersion', 'platformVersion'
+        ]
+
+        try:
+            service = self.load_service()
+            fields_param = ','.join(DataUtilities.expand_dot_notation(fields))
+
+            results = service.chromeosdevices().list(
+                customerId='my_customer',
+                query=query,
+                maxResults=max_results,
+                projection='FULL',
+                fields=f'chromeosdevices({fields_param})'
+            ).execute()
+
+            return [self.process_device(device, fields, include_null) for device in results.get('chromeosdevices', [])]
+
+        except RefreshError as e:
+            error_message = f"Failed to refresh credentials: {str(e)}"
+            logging.error(error_message)
+            logging.error("Please check your ADMIN email in the configuration.")
+            return []
+        except Exception as e:
+            error_message = f"An error occurred: {str(e)}"
+            logging.error(error_message)
+            logging.exception("Exception details:")
+            return []
+
     def get_device_info(self, devices, identifier_type='annotatedAssetId'):
         """
         Retrieve device information including status.
@@ -503,6 +599,9 @@ class Devices(Initialize):
         if not target_ou.startswith('Chromebooks/'):
             target_ou = f"Chromebooks/{target_ou}"
 
+        # Moves can add or empty an OU
+        self._org_unit_cache.clear()
+
         # Load the service
         self.service = self.load_service()
 
@@ -536,6 +635,7 @@ class Devices(Initialize):
                 if 'failure' in batch_result:
                     results['failure'].extend(batch_result['failure'])
 
+        self.invalidate_devices()
         return results
 
     def deprovision(self, devices, target_ou=None):
@@ -587,6 +687,8 @@ class Devices(Initialize):
                         "reason": str(e)
                     })
 
+        self.invalidate_devices()
+
         # If target_ou is provided, move the successfully deprovisioned devices to that OU
         if target_ou and results['success']:
             move_devices = [d['annotatedAssetId'] for d in results['success']]
@@ -793,6 +895,10 @@ class Devices(Initialize):
         Returns:
             dict or str: Dictionary containing OU information or formatted JSON string.
         """
+        response = self._org_unit_cache.get('organizationalUnits')
+        if response is not None:
+            return json.dumps(response, indent=4, ensure_ascii=False) if formatted else response
+
         try:
             service = self.load_service()
 
@@ -849,6 +955,7 @@ class Devices(Initialize):
                 'message': f'Successfully retrieved {len(formatted_ous)} organizational units',
                 'organizationalUnits': formatted_ous
             }
+            self._org_unit_cache['organizationalUnits'] = response
 
             if formatted:
                 return json.dumps(response, indent=4, ensure_ascii=False)
@@ -879,39 +986,61 @@ class Devices(Initialize):
         """
         if isinstance(devices, str):
             devices = [devices]
+        # 'status' is keyed by identifier, so reset each device once however often it was listed
+        devices = list(dict.fromkeys(devices))
 
         # Load the service
         self.service = self.load_service()
 
-        # Get device info
-        device_info_list = self.get_device_info(devices)
-
         results = {
             'success': [],
-            'failure': []
+            'failure': [],
+            'status': {}
         }
+        lock = threading.Lock()
+        # Bound the commands queued or in flight so lookups don't run far ahead of the resets
+        slots = threading.BoundedSemaphore(self.RESET_MAX_WORKERS)
 
-        with ThreadPoolExecutor() as executor:
-            future_to_device = {
-                executor.submit(self.process_reset_device, device_info): device_info
-                for device_info in device_info_list
-            }
-            for future in as_completed(future_to_device):
-                device_info = future_to_device[future]
-                try:
-                    result = future.result()
-                    results['success'].append(result)
-                except Exception as e:
-                    logging.error(f"Failed to send WIPE_USERS command to device {device_info.get('annotatedAssetId', device_info['deviceId'])}: {str(e)}")
+        def record(identifier, device_info, future):
+            slots.release()
+            try:
+                result = future.result()
+            except Exception as e:
+                logging.error(f"Failed to send WIPE_USERS command to device {device_info.get('annotatedAssetId', device_info['deviceId'])}: {str(e)}")
+                with lock:
                     results['failure'].append({
                         'deviceId': device_info['deviceId'],
                         'annotatedAssetId': device_info.get('annotatedAssetId'),
                         'reason': str(e)
                     })
+                    results['status'][identifier] = str(e)
+            else:
+                with lock:
+                    results['success'].append(result)
+                    results['status'][identifier] = 'ok'
+
+        with ThreadPoolExecutor(max_workers=self.RESET_MAX_WORKERS) as executor:
+            for identifier in devices:
+                # Get device info
+                device_info_list = self.get_device_info([identifier])
+                if not device_info_list:
+                    with lock:
+                        results['failure'].append({
+                            'deviceId': None,
+                            'annotatedAssetId': identifier,
+                            'reason': 'Device not found'
+                        })
+                        results['status'][identifier] = 'Device not found'
+                    continue
+
+                device_info = device_info_list[0]
+                slots.acquire()
+                future = executor.submit(self.process_reset_device, device_info)
+                future.add_done_callback(lambda f, i=identifier, d=device_info: record(i, d, f))
 
         return results
 
-    def list_all_devices_by_ou(self, organizational_unit_path=None, batch_size=100, recent_users_limit=1, formatted=False, include_null=False):
+    def list_all_devices_by_ou(self, organizational_unit_path=None, batch_size=100, recent_users_limit=1, formatted=False, include_null=False, stream=False):
         """
         List ALL devices in a specific organizational unit using pagination.
 
@@ -921,73 +1050,28 @@ class Devices(Initialize):
             recent_users_limit (int): Maximum number of recent users to include. Defaults to 1.
             formatted (bool): Whether to return formatted JSON string or Python object.
             include_null (bool): Whether to include fields with null values in the response.
+            stream (bool): Return a generator of device pages (one list per API call)
+                           instead of the collected response. Errors are raised, not returned.
 
         Returns:
-            dict or str: Dictionary containing all device information or formatted JSON string.
+            dict or str or generator: Dictionary containing all device information, formatted JSON string,
+                                      or a page generator when stream=True.
         """
-        try:
-            service = self.load_service()
-
-            if organizational_unit_path and organizational_unit_path != '/':
-                if not organizational_unit_path.startswith('/'):
-                    full_organizational_unit_path = f'/{organizational_unit_path}'
-                else:
-                    full_organizational_unit_path = organizational_unit_path
-            else:
-                full_organizational_unit_path = '/'
-
-            logger.info(f"Retrieving all devices from organizational unit: {full_organizational_unit_path}")
-
-            # Updated default fields list to include more available information
-            fields = [
-                'deviceId', 'serialNumber', 'status', 'lastSync', 'annotatedUser',
-                'annotatedAssetId', 'annotatedLocation', 'notes', 'model', 'osVersion',
-                'platformVersion', 'firmwareVersion', 'macAddress', 'orgUnitPath',
-                'recentUsers', 'lastKnownNetwork', 'bootMode', 'lastEnrollmentTime',
-                'supportEndDate', 'orderNumber', 'willAutoRenew', 'meid', 'etag',
-                'activeTimeRanges', 'cpuStatusReports', 'diskVolumeReports',
-                'systemRamTotal', 'systemRamFreeReports'
-            ]
-
-            expanded_fields = DataUtilities.expand_dot_notation(fields)
-            fields_param = ','.join(expanded_fields)
+        if stream:
+            return self.iter_device_pages_by_ou(organizational_unit_path, batch_size, recent_users_limit, include_null)
 
+        try:
             all_devices = []
-            page_token = None
+            devices_by_ou = {}
             total_requests = 0
+            full_organizational_unit_path = self._normalize_ou_path(organizational_unit_path)
 
-            while True:
+            for devices in self.iter_device_pages_by_ou(organizational_unit_path, batch_size, recent_users_limit, include_null):
                 total_requests += 1
-
-                # Build the request parameters
-                request_params = {
-                    'customerId': 'my_customer',
-                    'orgUnitPath': full_organizational_unit_path,
-                    'maxResults': batch_size,
-                    'projection': 'FULL',
-                    'fields': f'chromeosdevices({fields_param}),nextPageToken'
-                }
-
-                if page_token:
-                    request_params['pageToken'] = page_token
-
-                # Make the API call
-                results = service.chromeosdevices().list(**request_params).execute()
-                devices = results.get('chromeosdevices', [])
-
-                if devices:
-                    # Process recent users for each device
-                    for device in devices:
-                        if 'recentUsers' in device:
-                            device['recentUsers'] = device['recentUsers'][:recent_users_limit]
-
-                        processed_device = self.process_device(device, fields, include_null)
-                        all_devices.append(processed_device)
-
-                # Check if there are more pages
-                page_token = results.get('nextPageToken')
-                if not page_token:
-                    break
+                all_devices.extend(devices)
+                # Group devices by organizational unit as pages arrive
+                for device in devices:
+                    devices_by_ou.setdefault(device.get('orgUnitPath', '/'), []).append(device)
 
             if not all_devices:
                 response = {
@@ -995,14 +1079,6 @@ class Devices(Initialize):
                     "devices": []
                 }
             else:
-                # Group devices by organizational unit if needed
-                devices_by_ou = {}
-                for device in all_devices:
-                    ou_path = device.get('orgUnitPath', '/')
-                    if ou_path not in devices_by_ou:
-                        devices_by_ou[ou_path] = []
-                    devices_by_ou[ou_path].append(device)
-
                 response = {
                     "message": f"{len(all_devices)} devices retrieved successfully from {full_organizational_unit_path} in {total_requests} API calls.",
                     "devices": all_devices,
@@ -1028,6 +1104,120 @@ class Devices(Initialize):
             logging.exception("Exception details:")
             return {"error": error_message}
 
+    @staticmethod
+    def _normalize_ou_path(organizational_unit_path):
+        """
+        Return an absolute organizational unit path, defaulting to the root.
+        """
+        if organizational_unit_path and organizational_unit_path != '/':
+            if not organizational_unit_path.startswith('/'):
+                return f'/{organizational_unit_path}'
+            return organizational_unit_path
+        return '/'
+
+    def iter_device_pages_by_ou(self, organizational_unit_path=None, batch_size=100, recent_users_limit=1, include_null=False, include_children=False, fields=None, raw=False):
+        """
+        Yield the devices of an organizational unit one API page at a time.
+
+        Args:
+            organizational_unit_path (str): The organizational unit path to search. Defaults to None (root).
+            batch_size (int): The number of devices to retrieve per API call. Defaults to 100.
+            recent_users_limit (int): Maximum number of recent users to include. Defaults to 1.
+            include_null (bool): Whether to include fields with null values in the response.
+            include_children (bool): Also return devices from every child organizational unit.
+            fields (list): Device fields to request. Defaults to the full set the sync and
+                           detail views use; pass fewer to shrink each page on the wire.
+            raw (bool): Yield the device dicts as the API returned them instead of copying
+                        each one through process_device. The fields mask already limits their keys.
+
+        Yields:
+            list: Processed devices from each page (may be empty).
+        """
+        service = self.load_service()
+        full_organizational_unit_path = self._normalize_ou_path(organizational_unit_path)
+
+        logger.info(f"Retrieving all devices from organizational unit: {full_organizational_unit_path}")
+
+        # Updated default fields list to include more available information
+        fields = fields or [
+            'deviceId', 'serialNumber', 'status', 'lastSync', 'annotatedUser',
+            'annotatedAssetId', 'annotatedLocation', 'notes', 'model', 'osVersion',
+            'platformVersion', 'firmwareVersion', 'macAddress', 'orgUnitPath',
+            'recentUsers', 'lastKnownNetwork', 'bootMode', 'lastEnrollmentTime',
+            'supportEndDate', 'orderNumber', 'willAutoRenew', 'meid', 'etag',
+            'activeTimeRanges', 'cpuStatusReports', 'diskVolumeReports',
+            'systemRamTotal', 'systemRamFreeReports'
+        ]
+
+        expanded_fields = DataUtilities.expand_dot_notation(fields)
+        fields_param = ','.join(expanded_fields)
+
+        page_token = None
+
+        while True:
+            # Build the request parameters
+            request_params = {
+                'customerId': 'my_customer',
+                'orgUnitPath': full_organizational_unit_path,
+                'maxResults': batch_size,
+                'projection': 'FULL',
+                'fields': f'chromeosdevices({fields_param}),nextPageToken'
+            }
+
+            if include_children:
+                request_params['includeChildOrgunits'] = True
+
+            if page_token:
+                request_params['pageToken'] = page_token
+
+            # Make the API call; large pages occasionally fail with 5xx, so retry
+            # with backoff and a smaller page size before giving up
+            for attempt in range(self.MAX_RETRIES):
+                try:
+                    results = service.chromeosdevices().list(**request_params).execute()
+                    break
+                except HttpError as e:
+                    if e.resp.status < 500 or attempt == self.MAX_RETRIES - 1:
+                        raise
+                    batch_size = min(batch_size, self.FALLBACK_DEVICE_PAGE_SIZE)
+                    request_params['maxResults'] = batch_size
+                    logger.warning(f"Retrying device page after HTTP {e.resp.status} with maxResults={batch_size} (Attempt {attempt + 1})")
+                    time.sleep(self.RETRY_DELAY * 2 ** attempt)
+
+            # Process recent users for each device
+            processed = []
+            for device in results.get('chromeosdevices', []):
+                if 'recentUsers' in device:
+                    device['recentUsers'] = device['recentUsers'][:recent_users_limit]
+                processed.append(device if raw else self.process_device(device, fields, include_null))
+            yield processed
+
+            # Check if there are more pages
+            page_token = results.get('nextPageToken')
+            if not page_token:
+                break
+
+    def list_all_devices_iter(self, batch_size=100, recent_users_limit=1, include_null=False, fields=None, raw=False):
+        """
+        Lazily yield every device under '/Chromebooks', fetching one page at a time.
+
+        Unlike list_all_devices, nothing is requested until the caller asks for it,
+        so a caller that stops early (e.g. after enough search matches) skips the
+        remaining pages entirely. Errors are raised, not returned.
+
+        Args:
+            batch_size (int): The number of devices to retrieve per API call. Defaults to 100.
+            recent_users_limit (int): Maximum number of recent users to include. Defaults to 1.
+            include_null (bool): Whether to include fields with null values in the response.
+            fields (list): Device fields to request. Defaults to the full field set.
+            raw (bool): Yield API device dicts without copying them through process_device.
+
+        Yields:
+            dict: One processed device at a time.
+        """
+        for devices in self.iter_device_pages_by_ou('/Chromebooks', batch_size, recent_users_limit, include_null, include_children=True, fields=fields, raw=raw):
+            yield from devices
+
     def list_all_devices(self, batch_size=100, recent_users_limit=1, formatted=False, include_null=False):
         """
         List ALL devices across all organizational units using pagination and parallel execution.
@@ -1127,9 +1317,16 @@ class Devices(Initialize):
             "commandType": "WIPE_USERS"
         }
 
-        for attempt in range(self.MAX_RETRIES):
+        # Runs on worker threads while the caller keeps looking devices up; use this thread's own
+        # service rather than self.service, since httplib2 connections must not be shared
+        service = self.load_service()
+
+        attempt = 0
+        rate_limited = 0
+        while True:
             try:
-                command = self.service.customer().devices().chromeos().issueCommand(
+                self._rate_limiter.acquire()
+                command = service.customer().devices().chromeos().issueCommand(
                     customerId=customerId,
                     deviceId=deviceId,
                     body=body
@@ -1142,12 +1339,37 @@ class Devices(Initialize):
                     "commandId": command.get('commandId')
                 }
             except Exception as e:
-                if attempt == self.MAX_RETRIES - 1:
-                    logging.error(f"Failed to send WIPE_USERS command to device {device_info.get('annotatedAssetId', deviceId)} after {self.MAX_RETRIES} attempts: {str(e)}")
+                if self._is_rate_limited(e) and rate_limited < self.MAX_RATE_LIMIT_RETRIES:
+                    retry_after = min(2 ** rate_limited, 32) + random.random()
+                    rate_limited += 1
+                    logging.warning(f"Rate limited sending WIPE_USERS command to device {device_info.get('annotatedAssetId', deviceId)}; retrying in {retry_after:.1f}s")
+                    time.sleep(retry_after)
+                    continue
+                attempt += 1
+                if attempt == self.MAX_RETRIES or self._is_rate_limited(e):
+                    logging.error(f"Failed to send WIPE_USERS command to device {device_info.get('annotatedAssetId', deviceId)} after {attempt + rate_limited} attempts: {str(e)}")
                     raise
                 time.sleep(self.RETRY_DELAY)
                 logging.warning(f"Retrying WIPE_USERS command for device {device_info.get('annotatedAssetId', deviceId)} due to error: {str(e)} (Attempt {attempt + 1})")
 
+    @classmethod
+    def _is_rate_limited(cls, error):
+        """
+        Return True if error is an Admin SDK rate-limit or quota response (429, or 403 with a rate-limit reason).
+        """
+        if not isinstance(error, HttpError):
+            return False
+        status = error.resp.status
+        if status == 429:
+            return True
+        if status != 403:
+            return False
+        try:
+            details = json.loads(error.content).get('error', {}).get('errors', [])
+        except (ValueError, AttributeError):
+            return False
+        return any(detail.get('reason') in cls.RATE_LIMIT_REASONS for detail in details)
+
     def update_device_notes(self, identifier, notes_content, identifier_type='annotatedAssetId'):
         """
         Update the notes field for a device in Google Admin Console.
@@ -1163,8 +1385,8 @@ class Devices(Initialize):
         try:
             logging.info(f"🔄 [Google API] Starting notes update for device {identifier}")
 
-            # First, find the device to get its deviceId
-            device_info = self.find_device(identifier, identifier_type, 'deviceId', 'notes')
+            # First, find the device to get its deviceId; read live so previousNotes is the current value
+            device_info = self.find_device(identifier, identifier_type, 'deviceId', 'notes', use_cache=False)
             if not device_info:
                 logging.error(f"❌ [Google API] Device not found: {identifier}")
                 return {"success": False, "error": f"Device not found: {identifier}"}
@@ -1191,6 +1413,7 @@ class Devices(Initialize):
                         body=body
                     ).execute()
 
+                    self.invalidate_devices()
                     logging.info(f"✅ [Google API] Notes updated successfully for device {identifier}")
                     return {
                         "success": True,
@@ -1211,6 +1434,190 @@ class Devices(Initialize):
             logging.error(f"❌ [Google API] Failed to update notes for device {identifier}: {str(e)}")
             return {"success": False, "error": str(e), "identifier": identifier}
 
+    def _execute_batched(self, service, requests, callback, label):
+        """
+        Send API requests through the Admin SDK batch endpoint, MAX_BATCH_SIZE at a time.
+
+        If a batch call itself fails, that chunk's requests are sent one by one instead.
+
+        Args:
+            service: The service the requests were built from.
+            requests (list): (key, request) tuples.
+            callback (callable): Called as callback(key, response, exception) for every request.
+            label (str): What the requests do, for the fallback warning.
+        """
+        for start in range(0, len(requests), self.MAX_BATCH_SIZE):
+            chunk = requests[start:start + self.MAX_BATCH_SIZE]
+
+            def on_response(request_id, response, exception, chunk=chunk):
+                callback(chunk[int(request_id)][0], response, exception)
+
+            batch = service.new_batch_http_request(callback=on_response)
+            for n, (_, request) in enumerate(chunk):
+                batch.add(request, request_id=str(n))
+
+            try:
+                batch.execute()
+            except HttpError as e:
+                logger.warning(f"Batch {label} failed ({e.resp.status}); retrying requests individually")
+                for key, request in chunk:
+                    try:
+                        response = request.execute()
+                    except Exception as request_error:
+                        callback(key, None, request_error)
+                    else:
+                        callback(key, response, None)
+
+    def update_device_notes_bulk(self, updates, identifier_type='annotatedAssetId'):
+        """
+        Update the notes of many devices in few HTTP calls.
+
+        Device IDs are looked up and the notes written through the Admin SDK batch
+        endpoint, so N updates cost about 2 * N / MAX_BATCH_SIZE round-trips.
+
+        Args:
+            updates (list): (identifier, notes_content) tuples; a repeated identifier keeps its last notes.
+            identifier_type (str): Type of identifier ('annotatedAssetId' or 'serialNumber')
+
+        Returns:
+            list: One dict per identifier, shaped like update_device_notes' result.
+        """
+        if identifier_type not in ['annotatedAssetId', 'serialNumber']:
+            raise ValueError("identifier_type must be either 'annotatedAssetId' or 'serialNumber'")
+
+        notes_by_identifier = dict(updates)
+        query_param = 'asset_id' if identifier_type == 'annotatedAssetId' else 'id'
+        service = self.load_service()
+        results = {}
+        found = {}
+
+        def record_lookup(identifier, response, exception):
+            devices = (response or {}).get('chromeosdevices', [])
+            if exception is not None:
+                results[identifier] = {"success": False, "error": str(exception), "identifier": identifier}
+            elif not devices:
+                results[identifier] = {"success": False, "error": f"Device not found: {identifier}", "identifier": identifier}
+            else:
+                found[identifier] = devices[0]
+
+        self._execute_batched(service, [
+            (identifier, service.chromeosdevices().list(
+                customerId='my_customer',
+                query=f'{query_param}:{identifier}',
+                fields='chromeosdevices(deviceId,notes)'
+            )) for identifier in notes_by_identifier
+        ], record_lookup, 'device lookup')
+
+        def record_update(identifier, response, exception):
+            if exception is not None:
+                results[identifier] = {"success": False, "error": str(exception), "identifier": identifier}
+            else:
+                results[identifier] = {
+                    "success": True,
+                    "deviceId": found[identifier]['deviceId'],
+                    "identifier": identifier,
+                    "previousNotes": found[identifier].get('notes', ''),
+                    "newNotes": notes_by_identifier[identifier]
+                }
+
+        self._execute_batched(service, [
+            (identifier, service.chromeosdevices().update(
+                customerId='my_customer',
+                deviceId=device['deviceId'],
+                body={"notes": notes_by_identifier[identifier]}
+            )) for identifier, device in found.items()
+        ], record_update, 'notes update')
+
+        self.invalidate_devices()
+        updated = sum(result['success'] for result in results.values())
+        logger.info(f"Bulk notes update finished: {updated}/{len(results)} devices updated")
+        return [results[identifier] for identifier in notes_by_identifier]
+
+    @staticmethod
+    def _normalize_chromebook_ou(target_org_unit):
+        """
+        Return target_org_unit as an absolute path under '/Chromebooks'.
+        """
+        if not target_org_unit.startswith('/'):
+            target_org_unit = '/' + target_org_unit
+
+        if not target_org_unit.startswith('/Chromebooks'):
+            target_org_unit = '/Chromebooks' + target_org_unit.replace('/Chromebooks', '')
+
+        return target_org_unit
+
+    def move_devices_bulk(self, pairs):
+        """
+        Move many Chrome OS devices, possibly to different organizational units, in few HTTP calls.
+
+        Devices are grouped by target OU into moveDevicesToOu calls of up to MAX_BATCH_SIZE
+        device IDs, and those calls are sent together through the Admin SDK batch endpoint.
+
+        Args:
+            pairs (list): (device_id, target_org_unit) tuples.
+
+        Returns:
+            list: One dict per device with 'device_id', 'org_unit', 'success' and, on failure, 'error'.
+        """
+        # Moves can add or empty an OU
+        self._org_unit_cache.clear()
+
+        # Group device IDs by normalized target OU
+        by_ou = {}
+        for device_id, target_org_unit in pairs:
+            by_ou.setdefault(self._normalize_chromebook_ou(target_org_unit), []).append(device_id)
+
+        # One moveDevicesToOu call per OU chunk
+        moves = [
+            (org_unit, device_ids[i:i + self.MAX_BATCH_SIZE])
+            for org_unit, device_ids in by_ou.items()
+            for i in range(0, len(device_ids), self.MAX_BATCH_SIZE)
+        ]
+
+        self.service = self.load_service()
+        results = []
+
+        def record(org_unit, device_ids, exception):
+            for device_id in device_ids:
+                result = {'device_id': device_id, 'org_unit': org_unit, 'success': exception is None}
+                if exception is not None:
+                    result['error'] = str(exception)
+                results.append(result)
+
+        for start in range(0, len(moves), self.MAX_BATCH_SIZE):
+            chunk = moves[start:start + self.MAX_BATCH_SIZE]
+            requests = [
+                self.service.chromeosdevices().moveDevicesToOu(
+                    customerId='my_customer',
+                    orgUnitPath=org_unit,
+                    body={"deviceIds": device_ids}
+                ) for org_unit, device_ids in chunk
+            ]
+
+            def callback(request_id, response, exception):
+                org_unit, device_ids = chunk[int(request_id)]
+                record(org_unit, device_ids, exception)
+
+            batch = self.service.new_batch_http_request(callback=callback)
+            for n, request in enumerate(requests):
+                batch.add(request, request_id=str(n))
+
+            try:
+                batch.execute()
+            except HttpError as e:
+                # The batch call itself failed; send this chunk's moves one by one
+                logger.warning(f"Batch device move failed ({e.resp.status}); retrying moves individually")
+                for (org_unit, device_ids), request in zip(chunk, requests):
+                    try:
+                        request.execute()
+                        record(org_unit, device_ids, None)
+                    except Exception as move_error:
+                        record(org_unit, device_ids, move_error)
+
+        self.invalidate_devices()
+        logger.info(f"Bulk move finished: {sum(r['success'] for r in results)}/{len(results)} devices moved in {len(moves)} move calls")
+        return results
+
     def move_chrome_os_device(self, device_id, target_org_unit):
         """
         Move a single Chrome OS device to a different organizational unit.
@@ -1226,11 +1633,10 @@ class Devices(Initialize):
             logging.info(f"🔄 [Google API] Moving device {device_id} to {target_org_unit}")
 
             # Prepend '/Chromebooks' to the target OU if not already present
-            if not target_org_unit.startswith('/'):
-                target_org_unit = '/' + target_org_unit
+            target_org_unit = self._normalize_chromebook_ou(target_org_unit)
 
-            if not target_org_unit.startswith('/Chromebooks'):
-                target_org_unit = '/Chromebooks' + target_org_unit.replace('/Chromebooks', '')
+            # Moves can add or empty an OU
+            self._org_unit_cache.clear()
 
             # Load the service
             self.service = self.load_service()
@@ -1248,6 +1654,7 @@ class Devices(Initialize):
                         body=body
                     ).execute()
 
+                    self.invalidate_devices()
                     logging.info(f"✅ [Google API] Device {device_id} moved successfully to {target_org_unit}")
                     return True
 
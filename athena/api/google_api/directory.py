@@ -2,24 +2,55 @@
 
 # Standard Imports
 import ast                                              # For parsing strings
+import asyncio                                          # For async page iteration
 import json                                            # For JSON parsing
 import configparser                                     # For config file
+import hashlib                                          # For config fingerprints
+import itertools                                        # For chunking batch requests
 import os                                               # For file operations
+import random                                           # For retry jitter
+import re                                               # For email validation
+from collections import Counter                         # For report tallies
+import threading                                        # For guarding the shared service
+import time                                             # For cache warm-up delay
+from concurrent.futures import ThreadPoolExecutor       # For the batch fallback
 import logging                                          # For logging
-from typing import Optional, List, Dict, Any, Union    # For type hints
+from typing import Optional, List, Dict, Any, Union, Iterator, AsyncIterator, Iterable, Tuple    # For type hints
 
 # External Imports
 from google.oauth2 import service_account               # For service account credentials
 from googleapiclient.discovery import build             # For building API service
 from google.auth.exceptions import RefreshError         # For handling credential refresh errors
 from googleapiclient.errors import HttpError            # For handling API errors
+import google_auth_httplib2                             # For per-thread authorized transports
+import httplib2                                         # For per-thread HTTP connections
 
 # Set up logging
-logging.basicConfig(level=logging.INFO)                 # Set logging level
 logger = logging.getLogger(__name__)                    # Get logger
 
 # Local Imports
 from .. import _API_Path                       # API path structure
+from athena.utils.cache_utils import TTLCache  # Short-lived response caching
+from . import _fastjson                        # orjson response parsing
+
+_fastjson.install()
+
+# Email address shape accepted by validate_email_format
+_EMAIL_RE = re.compile(r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$")
+
+# Partial-response mask for user listings that only need summary fields
+_LISTING_FIELDS = 'users(id,primaryEmail,name,isAdmin,suspended,orgUnitPath),nextPageToken'
+
+# Fingerprints of configurations that already passed verify_configuration
+_validated_config_hashes = set()
+
+# Parsed service account credentials, keyed by key source and scopes, plus their
+# delegated (with_subject) copies. Cleared in forked children so worker processes
+# never share token state with their parent.
+_credentials_cache = {}
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_credentials_cache.clear)
 
 class Initialize:
     """
@@ -87,6 +118,7 @@ class Initialize:
         # If env vars are provided, synthesize a ConfigParser
         env_admin = os.environ.get('GOOGLE_ADMIN_EMAIL')
         env_scopes = os.environ.get('GOOGLE_SCOPES')
+        env_student_template = os.environ.get('GOOGLE_STUDENT_EMAIL_TEMPLATE')
 
         if env_admin or env_scopes:
             cfg = configparser.ConfigParser()
@@ -95,6 +127,8 @@ class Initialize:
                 cfg['Settings']['ADMIN'] = env_admin
             if env_scopes:
                 cfg['Settings']['SCOPES'] = env_scopes
+            if env_student_template:
+                cfg['Settings']['STUDENT_EMAIL_TEMPLATE'] = env_student_template
             return cfg
 
         # Fallback to legacy config.ini
@@ -149,34 +183,100 @@ class Initialize:
         key_json = os.environ.get('GOOGLE_SERVICE_ACCOUNT_JSON')
         key_file = os.environ.get('GOOGLE_SERVICE_ACCOUNT_FILE')
 
+        if key_json:
+            source = ('json', hashlib.blake2b(key_json.encode(), digest_size=16).hexdigest())
+        elif key_file and os.path.isfile(key_file):
+            source = ('file', key_file, os.path.getmtime(key_file))
+        else:
+            # Fallback to legacy bundled key.json
+            key_file = self.read_key()
+            source = ('file', key_file, os.path.getmtime(key_file) if os.path.isfile(key_file) else None)
+
+        # Parsing the RSA key is the expensive part; reuse it for the life of the process
+        self._credentials_key = (source, tuple(scopes))
+        credentials = _credentials_cache.get(self._credentials_key)
+        if credentials is not None:
+            return credentials
+
         if key_json:
             try:
                 info = json.loads(key_json)
             except json.JSONDecodeError:
                 raise ValueError('GOOGLE_SERVICE_ACCOUNT_JSON is not valid JSON')
-            return service_account.Credentials.from_service_account_info(info, scopes=scopes or None)
-
-        if key_file and os.path.isfile(key_file):
-            return service_account.Credentials.from_service_account_file(key_file, scopes=scopes or None)
+            credentials = service_account.Credentials.from_service_account_info(info, scopes=scopes or None)
+        else:
+            credentials = service_account.Credentials.from_service_account_file(key_file, scopes=scopes or None)
 
-        # Fallback to legacy bundled key.json
-        return service_account.Credentials.from_service_account_file(self.read_key(), scopes=scopes or None)
+        _credentials_cache[self._credentials_key] = credentials
+        return credentials
 
 class Directory(Initialize):
     """
     Class for interacting with Google Admin Directory API.
     """
 
-    def __init__(self):
+    MAX_RATE_LIMIT_RETRIES = 6
+    RATE_LIMIT_REASONS = frozenset({'rateLimitExceeded', 'userRateLimitExceeded', 'servingLimitExceeded', 'quotaExceeded'})
+
+    _local = threading.local()       # Per-thread instances for get_instance()
+
+    # Response caches shared by every instance in the process
+    _user_cache = TTLCache(maxsize=10000, ttl=30)       # get_user by (user_key, projection)
+    _search_cache = TTLCache(maxsize=512, ttl=60)       # search_users by (query, max_results, order_by, fields)
+    _domain_cache = TTLCache(maxsize=1, ttl=3600)       # get_domain_info
+    _users_with_ou_cache = TTLCache(maxsize=8, ttl=60)  # list_all_users_with_ou by batch_size
+
+    def __init__(self, prefetch: bool = False):
         """
         Initialize the Directory class with necessary credentials and services.
+
+        Args:
+            prefetch (bool): Warm the domain-info and admin-listing caches on a
+                             background thread. Off by default to spare API quota.
         """
         super().__init__()
         self.credentials = self.read_credentials()
         self.admin = self.load_admin()
         self.service = None  # Initialize as None
+        self._service_lock = threading.Lock()
         self.verify_configuration()  # Verify configuration before loading service
-        logging.getLogger('googleapiclient.discovery_cache').setLevel(logging.ERROR)
+        if not getattr(Directory, '_logging_configured', False):
+            logging.getLogger('googleapiclient.discovery_cache').setLevel(logging.ERROR)
+            Directory._logging_configured = True
+        if prefetch:
+            threading.Thread(target=self._warm_cache, daemon=True).start()
+
+    @staticmethod
+    def get_instance():
+        """
+        Return this thread's shared Directory instance, creating it on first use.
+
+        Like Devices.get_instance(), instances are per thread because the underlying
+        httplib2 connection is not thread-safe; within a thread, the instance and its
+        open connection are reused across calls.
+        """
+        instance = getattr(Directory._local, 'instance', None)
+        if instance is None:
+            instance = Directory._local.instance = Directory()
+        return instance
+
+    def _warm_cache(self, delay: float = 2.0) -> None:
+        """
+        Populate the shared caches with commonly requested listings.
+
+        Runs on its own Directory instance (and so its own HTTP connection),
+        since httplib2 connections must not be shared between threads.
+
+        Args:
+            delay (float): Seconds to wait first, so startup work goes out first.
+        """
+        time.sleep(delay)
+        try:
+            warmer = Directory()
+            warmer.get_domain_info()
+            warmer.list_admin_users(max_results=500)
+        except Exception as e:
+            logger.warning(f"Directory cache warm-up failed: {str(e)}")
 
     def load_admin(self):
         """
@@ -191,12 +291,28 @@ class Directory(Initialize):
             admin_email = self.config.get('Settings', 'ADMIN')
         if not admin_email:
             admin_email = os.environ.get('GOOGLE_ADMIN_EMAIL')
-        return self.credentials.with_subject(admin_email)
+
+        # Share one delegated credential (and its access token) across instances
+        cache_key = ('subject', self._credentials_key, admin_email)
+        admin = _credentials_cache.get(cache_key)
+        if admin is None:
+            admin = _credentials_cache[cache_key] = self.credentials.with_subject(admin_email)
+        return admin
 
     def verify_configuration(self):
         """
         Verify the configuration settings.
+
+        The verdict is memoized per process, keyed by a hash of the settings,
+        so repeated Directory() construction skips re-validation until the
+        configuration changes.
         """
+        settings = dict(self.config['Settings']) if self.config and self.config.has_section('Settings') else {}
+        fingerprint = json.dumps([settings, os.environ.get('GOOGLE_ADMIN_EMAIL')], sort_keys=True)
+        config_hash = hashlib.blake2b(fingerprint.encode(), digest_size=16).hexdigest()
+        if config_hash in _validated_config_hashes:
+            return
+
         # Ensure required settings are present either in env or config
         admin_email = None
         if self.config and self.config.has_section('Settings') and self.config.has_option('Settings', 'ADMIN'):
@@ -206,6 +322,8 @@ class Directory(Initialize):
         if not admin_email or '@' not in admin_email:
             raise ValueError(f"Invalid admin email: {admin_email}")
 
+        _validated_config_hashes.add(config_hash)
+
     def load_service(self):
         """
         Build and return the Google Admin Directory service.
@@ -214,13 +332,118 @@ class Directory(Initialize):
             googleapiclient.discovery.Resource: Google Admin Directory service object.
         """
         if self.service is None:
-            try:
-                self.service = build('admin', 'directory_v1', credentials=self.admin)
-            except RefreshError as e:
-                logger.error(f"Failed to refresh credentials: {str(e)}")
-                raise
+            with self._service_lock:
+                if self.service is None:
+                    try:
+                        # Use the discovery document bundled with the client; no fetch or file cache
+                        self.service = build('admin', 'directory_v1', credentials=self.admin,
+                                             cache_discovery=False, static_discovery=True)
+                    except RefreshError as e:
+                        logger.error(f"Failed to refresh credentials: {str(e)}")
+                        raise
         return self.service
 
+    def invalidate_user(self, user_key: str) -> None:
+        """
+        Drop cached responses that may include a user after it has been modified.
+
+        Args:
+            user_key (str): The user key (email or unique ID).
+        """
+        for projection in ('full', 'basic', 'custom'):
+            self._user_cache.pop((user_key, projection), None)
+        self._search_cache.clear()
+        self._users_with_ou_cache.clear()
+
+    def _run_batched(self, items: Iterable[Tuple[Any, Any]], chunk: int = 100) -> Iterator[Tuple[Any, Any, Optional[Exception]]]:
+        """
+        Execute API requests through the batch endpoint, `chunk` sub-requests per HTTP call.
+
+        Args:
+            items: Iterable of (key, http_request) pairs. Keys are echoed back unchanged.
+            chunk (int): Sub-requests per batch. Google recommends 100 or fewer (hard cap 1000).
+
+        Yields:
+            tuple: (key, response, exception) for every request, where exactly one
+                   of response/exception is meaningful.
+        """
+        service = self.load_service()
+        completed = []
+        keys = {}
+
+        def callback(request_id, response, exception):
+            completed.append((keys[request_id], response, exception))
+
+        items = iter(items)
+        while True:
+            pending = list(itertools.islice(items, chunk))
+            if not pending:
+                return
+
+            batch = service.new_batch_http_request(callback=callback)
+            keys.clear()
+            for n, (key, request) in enumerate(pending):
+                keys[str(n)] = key
+                batch.add(request, request_id=str(n))
+
+            try:
+                batch.execute()
+            except HttpError as e:
+                # The batch endpoint itself was rejected; send this chunk's requests individually
+                logger.warning(f"Batch request failed ({e.resp.status}); falling back to concurrent requests")
+                completed.clear()
+                completed.extend(self._run_concurrently(pending))
+            yield from completed
+            completed.clear()
+
+    def _run_concurrently(self, items: List[Tuple[Any, Any]], max_workers: int = 16) -> List[Tuple[Any, Any, Optional[Exception]]]:
+        """
+        Execute API requests individually on a thread pool.
+
+        httplib2 connections are not thread-safe, so every worker thread gets its
+        own authorized Http instance.
+
+        Args:
+            items: List of (key, http_request) pairs.
+            max_workers (int): Maximum number of requests in flight.
+
+        Returns:
+            list: (key, response, exception) for every request.
+        """
+        local = threading.local()
+
+        def run(item):
+            key, request = item
+            if not hasattr(local, 'http'):
+                local.http = google_auth_httplib2.AuthorizedHttp(self.admin, http=httplib2.Http())
+            try:
+                return key, request.execute(http=local.http), None
+            except Exception as e:
+                return key, None, e
+
+        if not items:
+            return []
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+            return list(executor.map(run, items))
+
+    @classmethod
+    def _is_rate_limited(cls, error: Exception) -> bool:
+        """
+        Return True if error is an Admin SDK rate-limit or quota response (429, or 403 with a rate-limit reason).
+        """
+        if not isinstance(error, HttpError):
+            return False
+        status = error.resp.status
+        if status == 429:
+            return True
+        if status != 403:
+            return False
+        try:
+            details = json.loads(error.content).get('error', {}).get('errors', [])
+        except (ValueError, AttributeError):
+            return False
+        return any(detail.get('reason') in cls.RATE_LIMIT_REASONS for detail in details)
+
     def _handle_error(self, e: Exception, operation: str) -> Dict[str, str]:
         """
         Handle and format errors consistently.
@@ -233,6 +456,7 @@ class Directory(Initialize):
             Dict containing error information
         """
         if isinstance(e, RefreshError):
+            self.service = None  # Rebuild with fresh credentials on the next call
             error_message = f"Failed to refresh credentials during {operation}: {str(e)}"
             logger.error(error_message)
             logger.error("Please check your ADMIN email in the configuration.")
@@ -288,35 +512,13 @@ class Directory(Initialize):
         dict: A dictionary with all user information.
         """
         try:
-            service = self.load_service()
             all_users = []
-            page_token = None
             total_requests = 0
 
-            while True:
+            pages = self._iter_user_pages(maxResults=batch_size, orderBy='email')
+            for users in self._prefetch_pages(pages):
                 total_requests += 1
-
-                # Build the request parameters
-                request_params = {
-                    'customer': 'my_customer',
-                    'maxResults': batch_size,
-                    'orderBy': 'email'
-                }
-
-                if page_token:
-                    request_params['pageToken'] = page_token
-
-                # Make the API call
-                results = service.users().list(**request_params).execute()
-                users = results.get('users', [])
-
-                if users:
-                    all_users.extend(users)
-
-                # Check if there are more pages
-                page_token = results.get('nextPageToken')
-                if not page_token:
-                    break
+                all_users.extend(users)
 
             if not all_users:
                 return {"message": "No users found in the domain.", "users": []}
@@ -331,6 +533,92 @@ class Directory(Initialize):
         except Exception as e:
             return self._handle_error(e, "list_all_users")
 
+    def _iter_user_pages(self, **request_params) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Yield users().list result pages as they arrive, following page tokens.
+
+        Page tokens chain, so requests are strictly sequential; a rate-limited page
+        is retried with exponential backoff instead of failing the whole listing.
+
+        Args:
+            **request_params: Extra users().list parameters (maxResults, fields, query, ...).
+
+        Yields:
+            list: The users contained in each page (may be empty).
+        """
+        service = self.load_service()
+        request_params.setdefault('customer', 'my_customer')
+        page_token = None
+
+        while True:
+            if page_token:
+                request_params['pageToken'] = page_token
+
+            rate_limited = 0
+            while True:
+                try:
+                    results = service.users().list(**request_params).execute()
+                    break
+                except HttpError as e:
+                    if not self._is_rate_limited(e) or rate_limited == self.MAX_RATE_LIMIT_RETRIES:
+                        raise
+                    retry_after = min(2 ** rate_limited, 32) + random.random()
+                    rate_limited += 1
+                    logger.warning(f"Rate limited listing users; retrying in {retry_after:.1f}s")
+                    time.sleep(retry_after)
+            yield results.get('users', [])
+
+            page_token = results.get('nextPageToken')
+            if not page_token:
+                break
+
+    @staticmethod
+    def _prefetch_pages(pages: Iterator[List[Dict[str, Any]]]) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Re-yield pages while the following page is fetched on a background thread.
+
+        Page tokens chain, so at most one request is in flight; the caller's work
+        on page N overlaps with the network round-trip for page N+1.
+
+        Args:
+            pages: Page iterator, typically from _iter_user_pages.
+
+        Yields:
+            list: The users contained in each page.
+        """
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            pending = executor.submit(next, pages, None)
+            while True:
+                users = pending.result()
+                if users is None:
+                    return
+                pending = executor.submit(next, pages, None)
+                yield users
+
+    async def iter_all_users_async(self, batch_size=500) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Asynchronously iterate over ALL users in the domain, one page at a time.
+
+        The blocking API client runs in a worker thread and the next page is
+        requested before the current one is handed to the caller, so page
+        processing overlaps with the following network round-trip.
+
+        Args:
+            batch_size (int): The number of users to retrieve per API call. Defaults to 500 (max allowed).
+
+        Yields:
+            list: The users contained in each page.
+        """
+        pages = self._iter_user_pages(maxResults=batch_size, orderBy='email')
+        pending = asyncio.ensure_future(asyncio.to_thread(next, pages, None))
+
+        while True:
+            users = await pending
+            if users is None:
+                break
+            pending = asyncio.ensure_future(asyncio.to_thread(next, pages, None))
+            yield users
+
     def get_user(self, user_key: str, projection: str = 'full') -> Dict[str, Any]:
         """
         Retrieve a specific user by user key.
@@ -342,13 +630,20 @@ class Directory(Initialize):
         Returns:
             dict: A dictionary with user information.
         """
+        cache_key = (user_key, projection)
+        cached = self._user_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         try:
             service = self.load_service()
             user = service.users().get(
                 userKey=user_key,
                 projection=projection
             ).execute()
-            return {"message": "User retrieved successfully.", "user": user}
+            result = {"message": "User retrieved successfully.", "user": user}
+            self._user_cache[cache_key] = result
+            return result
 
         except Exception as e:
             return self._handle_error(e, f"get_user for {user_key}")
@@ -379,6 +674,22 @@ class Directory(Initialize):
             service = self.load_service()
             logger.info(f" Searching for Student ID: {student_id}")
 
+            # Fast path: when student addresses are deterministic, a direct key
+            # lookup is much cheaper than a server-side query scan
+            template = ''
+            if self.config and self.config.has_section('Settings'):
+                template = self.config.get('Settings', 'STUDENT_EMAIL_TEMPLATE', raw=True, fallback='')
+            if template:
+                try:
+                    user = service.users().get(
+                        userKey=template.format(sid=student_id),
+                        projection='full'
+                    ).execute()
+                    return {"message": "User retrieved successfully.", "user": user}
+                except HttpError as e:
+                    if e.resp.status != 404:
+                        raise
+
             query = f"email:.{student_id}@"
 
             results = service.users().list(
@@ -421,23 +732,38 @@ class Directory(Initialize):
         try:
             service = self.load_service()
 
-            # Validate required fields
-            required_fields = ['primaryEmail', 'name', 'password']
-            for field in required_fields:
-                if field not in user_data:
-                    return {"error": f"Missing required field: {field}"}
-
-            # Validate name structure
-            if not isinstance(user_data['name'], dict) or 'givenName' not in user_data['name'] or 'familyName' not in user_data['name']:
-                return {"error": "name must be a dict with givenName and familyName"}
+            validation_error = self._validate_new_user(user_data)
+            if validation_error:
+                return {"error": validation_error}
 
             result = service.users().insert(body=user_data).execute()
+            self.invalidate_user(user_data['primaryEmail'])
             logger.info(f"Successfully created user: {user_data['primaryEmail']}")
             return {"message": "User created successfully.", "user": result}
 
         except Exception as e:
             return self._handle_error(e, f"create_user for {user_data.get('primaryEmail', 'unknown')}")
 
+    @staticmethod
+    def _validate_new_user(user_data: Dict[str, Any]) -> Optional[str]:
+        """
+        Check that user_data carries the fields users().insert requires.
+
+        Returns:
+            str or None: Error message, or None when the data is valid.
+        """
+        # Validate required fields
+        required_fields = ['primaryEmail', 'name', 'password']
+        for field in required_fields:
+            if field not in user_data:
+                return f"Missing required field: {field}"
+
+        # Validate name structure
+        if not isinstance(user_data['name'], dict) or 'givenName' not in user_data['name'] or 'familyName' not in user_data['name']:
+            return "name must be a dict with givenName and familyName"
+
+        return None
+
     def update_user(self, user_key: str, user_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Update an existing user account.
@@ -451,6 +777,7 @@ class Directory(Initialize):
         """
         try:
             service = self.load_service()
+            self.invalidate_user(user_key)
             result = service.users().update(
                 userKey=user_key,
                 body=user_data
@@ -474,6 +801,7 @@ class Directory(Initialize):
         """
         try:
             service = self.load_service()
+            self.invalidate_user(user_key)
             result = service.users().patch(
                 userKey=user_key,
                 body=user_data
@@ -496,6 +824,7 @@ class Directory(Initialize):
         """
         try:
             service = self.load_service()
+            self.invalidate_user(user_key)
             service.users().delete(userKey=user_key).execute()
             logger.info(f"Successfully deleted user: {user_key}")
             return {"message": f"User {user_key} deleted successfully."}
@@ -516,6 +845,7 @@ class Directory(Initialize):
         """
         try:
             service = self.load_service()
+            self.invalidate_user(user_key)
             result = service.users().undelete(
                 userKey=user_key,
                 body={'orgUnitPath': org_unit_path}
@@ -540,6 +870,7 @@ class Directory(Initialize):
         """
         try:
             service = self.load_service()
+            self.invalidate_user(user_key)
             service.users().makeAdmin(
                 userKey=user_key,
                 body={'status': True}
@@ -562,6 +893,7 @@ class Directory(Initialize):
         """
         try:
             service = self.load_service()
+            self.invalidate_user(user_key)
             service.users().makeAdmin(
                 userKey=user_key,
                 body={'status': False}
@@ -613,6 +945,7 @@ class Directory(Initialize):
         """
         try:
             service = self.load_service()
+            self.invalidate_user(user_key)
             service.users().signOut(userKey=user_key).execute()
             logger.info(f"Successfully signed out user: {user_key}")
             return {"message": f"User {user_key} signed out of all sessions."}
@@ -735,68 +1068,62 @@ class Directory(Initialize):
         Returns:
             dict: A dictionary with all user information including their organizational units.
         """
+        cached = self._users_with_ou_cache.get(batch_size)
+        if cached is not None:
+            return cached
+
         try:
-            service = self.load_service()
             all_users = []
-            page_token = None
+            users_by_ou = {}
             total_requests = 0
 
-            while True:
+            for users in self.iter_user_pages_with_ou(batch_size=batch_size):
                 total_requests += 1
-                # Build the request parameters
-                # request_params = {
-                #     'customer': 'my_customer',
-                #     'maxResults': batch_size,
-                #     'orderBy': 'email',
-                #     'projection': 'full',  # Get all user properties including orgUnitPath
-                #     'fields': 'users(id,primaryEmail,password,hashFunction,isAdmin,isDelegatedAdmin,agreedToTerms,suspended,changePasswordAtNextLogin,ipWhitelisted,name,kind,etag,emails,externalIds,relations,aliases,isMailboxSetup,customerId,addresses,organizations,lastLoginTime,phones,suspensionReason,thumbnailPhotoUrl,languages,posixAccounts,creationTime,nonEditableAliases,sshPublicKeys,notes,websites,locations,includeInGlobalAddressList,keywords,deletionTime,gender,thumbnailPhotoEtag,ims,customSchemas,isEnrolledIn2Sv,isEnforcedIn2Sv,archived,orgUnitPath,recoveryEmail,recoveryPhone),nextPageToken'  # All available fields
-                # }
-
-                request_params = {
-                    'customer': 'my_customer',
-                    'maxResults': batch_size,
-                    'orderBy': 'email',
-                    'projection': 'full',  # Get all user properties including orgUnitPath
-                    'fields': 'users(id,primaryEmail,name,orgUnitPath,isAdmin,suspended,creationTime,lastLoginTime),nextPageToken'
-                }
-
-                if page_token:
-                    request_params['pageToken'] = page_token
-
-                # Make the API call
-                results = service.users().list(**request_params).execute()
-                users = results.get('users', [])
-
-                if users:
-                    all_users.extend(users)
-
-                # Check if there are more pages
-                page_token = results.get('nextPageToken')
-                if not page_token:
-                    break
+                all_users.extend(users)
+                # Group users by organizational unit as pages arrive
+                for user in users:
+                    users_by_ou.setdefault(user.get('orgUnitPath', '/'), []).append(user)
 
             if not all_users:
                 return {"message": "No users found in the domain.", "users": []}
-            else:
-                # Group users by organizational unit
-                users_by_ou = {}
-                for user in all_users:
-                    ou_path = user.get('orgUnitPath', '/')
-                    if ou_path not in users_by_ou:
-                        users_by_ou[ou_path] = []
-                    users_by_ou[ou_path].append(user)
 
-                return {
-                    "message": f"{len(all_users)} users retrieved successfully in {total_requests} API calls.",
-                    "users": all_users,
-                    "users_by_ou": users_by_ou,
-                    "total_users": len(all_users),
-                    "api_calls": total_requests
-                }
+            result = {
+                "message": f"{len(all_users)} users retrieved successfully in {total_requests} API calls.",
+                "users": all_users,
+                "users_by_ou": users_by_ou,
+                "total_users": len(all_users),
+                "api_calls": total_requests
+            }
+            self._users_with_ou_cache[batch_size] = result
+            return result
 
         except Exception as e:
             return self._handle_error(e, "list_all_users_with_ou")
 
+    def iter_user_pages_with_ou(self, batch_size=500) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Yield ALL users in the domain with their organizational units, one API page at a time.
+
+        Unlike list_all_users_with_ou nothing is accumulated or cached, so callers
+        that process each page as it arrives keep memory bounded by the page size.
+        The next page is fetched on a background thread while the caller works on
+        the current one. API errors are raised rather than returned.
+
+        Args:
+            batch_size (int): The number of users to retrieve per API call. Defaults to 500 (max allowed).
+
+        Returns:
+            Iterator[list]: The users contained in each page (may be empty), fetched lazily.
+        """
+        # A single domain-wide scan: orgUnitPath queries match whole subtrees,
+        # so per-OU listings would overlap and still need a root scan.
+        return self._prefetch_pages(self._iter_user_pages(
+            maxResults=batch_size,
+            orderBy='email',
+            projection='full',  # Get all user properties including orgUnitPath
+            fields='users(id,primaryEmail,name,orgUnitPath,isAdmin,suspended,creationTime,lastLoginTime),nextPageToken'
+        ))
+
     def move_users_to_ou(self, user_emails, target_ou_path):
         """
         Move multiple users to a specified organizational unit.
@@ -819,24 +1146,26 @@ class Directory(Initialize):
             }
 
             for email in user_emails:
-                try:
-                    service.users().update(
-                        userKey=email,
-                        body={"orgUnitPath": target_ou_path}
-                    ).execute()
-
+                self.invalidate_user(email)
+
+            requests = (
+                (email, service.users().update(userKey=email, body={"orgUnitPath": target_ou_path}))
+                for email in user_emails
+            )
+            for email, _, exception in self._run_batched(requests):
+                if exception is None:
                     results["success"].append({
                         "email": email,
                         "newOrgUnit": target_ou_path
                     })
-                    logger.info(f"Moved user {email} to organizational unit {target_ou_path}")
-
-                except Exception as e:
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug(f"Moved user {email} to organizational unit {target_ou_path}")
+                else:
                     results["failure"].append({
                         "email": email,
-                        "reason": str(e)
+                        "reason": str(exception)
                     })
-                    logger.error(f"Failed to move user {email} to {target_ou_path}: {str(e)}")
+                    logger.error(f"Failed to move user {email} to {target_ou_path}: {str(exception)}")
 
             return results
 
@@ -947,6 +1276,7 @@ class Directory(Initialize):
         """
         try:
             service = self.load_service()
+            self.invalidate_user(user_key)
             result = service.users().photos().update(
                 userKey=user_key,
                 body={
@@ -972,6 +1302,7 @@ class Directory(Initialize):
         """
         try:
             service = self.load_service()
+            self.invalidate_user(user_key)
             service.users().photos().delete(userKey=user_key).execute()
             logger.info(f"Successfully deleted photo for user {user_key}")
             return {"message": f"Photo deleted successfully for user {user_key}."}
@@ -981,7 +1312,7 @@ class Directory(Initialize):
 
     # ===== ADVANCED SEARCH AND FILTERING =====
 
-    def search_users(self, query: str, max_results: int = 100, order_by: str = 'email') -> Dict[str, Any]:
+    def search_users(self, query: str, max_results: int = 100, order_by: str = 'email', fields: Optional[str] = None) -> Dict[str, Any]:
         """
         Search for users using a query string.
 
@@ -989,53 +1320,67 @@ class Directory(Initialize):
             query (str): Search query (e.g., "name:John", "email:*@example.com").
             max_results (int): Maximum number of results to return.
             order_by (str): Field to order results by.
+            fields (str): Optional partial-response mask, e.g. 'users(id,primaryEmail),nextPageToken'.
 
         Returns:
             dict: Search results.
         """
+        cache_key = (query, max_results, order_by, fields)
+        cached = self._search_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         try:
             service = self.load_service()
-            results = service.users().list(
-                customer='my_customer',
-                query=query,
-                maxResults=max_results,
-                orderBy=order_by,
-                projection='full'
-            ).execute()
+            request_params = {
+                'customer': 'my_customer',
+                'query': query,
+                'maxResults': max_results,
+                'orderBy': order_by,
+                'projection': 'full'
+            }
+            if fields:
+                request_params['fields'] = fields
+
+            results = service.users().list(**request_params).execute()
 
             users = results.get('users', [])
-            return {
+            result = {
                 "message": f"Found {len(users)} users matching query: {query}",
                 "users": users,
                 "query": query
             }
+            self._search_cache[cache_key] = result
+            return result
 
         except Exception as e:
             return self._handle_error(e, f"search_users with query: {query}")
 
-    def list_suspended_users(self, max_results: int = 100) -> Dict[str, Any]:
+    def list_suspended_users(self, max_results: int = 100, fields: Optional[str] = _LISTING_FIELDS) -> Dict[str, Any]:
         """
         List all suspended users in the domain.
 
         Args:
             max_results (int): Maximum number of results to return.
+            fields (str): Partial-response mask. Pass None for the full user resource.
 
         Returns:
             dict: List of suspended users.
         """
-        return self.search_users("isSuspended=true", max_results)
+        return self.search_users("isSuspended=true", max_results, fields=fields)
 
-    def list_admin_users(self, max_results: int = 100) -> Dict[str, Any]:
+    def list_admin_users(self, max_results: int = 100, fields: Optional[str] = _LISTING_FIELDS) -> Dict[str, Any]:
         """
         List all admin users in the domain.
 
         Args:
             max_results (int): Maximum number of results to return.
+            fields (str): Partial-response mask. Pass None for the full user resource.
 
         Returns:
             dict: List of admin users.
         """
-        return self.search_users("isAdmin=true", max_results)
+        return self.search_users("isAdmin=true", max_results, fields=fields)
 
     def list_users_by_creation_time(self, start_time: str, end_time: str = None, max_results: int = 100) -> Dict[str, Any]:
         """
@@ -1092,24 +1437,33 @@ class Directory(Initialize):
             "failure": []
         }
 
-        for user_data in users_data:
-            try:
-                result = self.create_user(user_data)
-                if "error" in result:
+        try:
+            service = self.load_service()
+            requests = []
+            for user_data in users_data:
+                validation_error = self._validate_new_user(user_data)
+                if validation_error:
+                    results["failure"].append({
+                        "user_data": user_data,
+                        "error": validation_error
+                    })
+                else:
+                    requests.append((user_data, service.users().insert(body=user_data)))
+
+            for user_data, response, exception in self._run_batched(requests):
+                if exception is not None:
                     results["failure"].append({
                         "user_data": user_data,
-                        "error": result["error"]
+                        "error": self._handle_error(exception, f"create_user for {user_data['primaryEmail']}")["error"]
                     })
                 else:
+                    self.invalidate_user(user_data['primaryEmail'])
                     results["success"].append({
                         "email": user_data.get('primaryEmail'),
-                        "user": result.get("user")
+                        "user": response
                     })
-            except Exception as e:
-                results["failure"].append({
-                    "user_data": user_data,
-                    "error": str(e)
-                })
+        except Exception as e:
+            return self._handle_error(e, "batch_create_users")
 
         return {
             "message": f"Batch operation completed. {len(results['success'])} successes, {len(results['failure'])} failures.",
@@ -1126,44 +1480,23 @@ class Directory(Initialize):
         Returns:
             dict: Results of batch user updates.
         """
-        results = {
-            "success": [],
-            "failure": []
-        }
+        failures = []
 
-        for update in updates:
-            user_key = update.get('user_key')
-            user_data = update.get('user_data')
+        def pairs():
+            for update in updates:
+                user_key = update.get('user_key')
+                user_data = update.get('user_data')
 
-            if not user_key or not user_data:
-                results["failure"].append({
-                    "update": update,
-                    "error": "Missing user_key or user_data"
-                })
-                continue
-
-            try:
-                result = self.update_user(user_key, user_data)
-                if "error" in result:
-                    results["failure"].append({
-                        "user_key": user_key,
-                        "error": result["error"]
-                    })
-                else:
-                    results["success"].append({
-                        "user_key": user_key,
-                        "user": result.get("user")
+                if not user_key or not user_data:
+                    failures.append({
+                        "update": update,
+                        "error": "Missing user_key or user_data"
                     })
-            except Exception as e:
-                results["failure"].append({
-                    "user_key": user_key,
-                    "error": str(e)
-                })
+                    continue
 
-        return {
-            "message": f"Batch operation completed. {len(results['success'])} successes, {len(results['failure'])} failures.",
-            "results": results
-        }
+                yield user_key, user_data
+
+        return self._batch_update(pairs(), failures)
 
     def batch_suspend_users(self, user_keys: List[str], reason: str = '') -> Dict[str, Any]:
         """
@@ -1176,17 +1509,11 @@ class Directory(Initialize):
         Returns:
             dict: Results of batch user suspension.
         """
-        updates = []
-        for user_key in user_keys:
-            body = {'suspended': True}
-            if reason:
-                body['suspensionReason'] = reason
-            updates.append({
-                'user_key': user_key,
-                'user_data': body
-            })
+        body = {'suspended': True}
+        if reason:
+            body['suspensionReason'] = reason
 
-        return self.batch_update_users(updates)
+        return self._batch_update((user_key, body) for user_key in user_keys)
 
     def batch_unsuspend_users(self, user_keys: List[str]) -> Dict[str, Any]:
         """
@@ -1198,14 +1525,51 @@ class Directory(Initialize):
         Returns:
             dict: Results of batch user unsuspension.
         """
-        updates = []
-        for user_key in user_keys:
-            updates.append({
-                'user_key': user_key,
-                'user_data': {'suspended': False}
-            })
+        body = {'suspended': False}
+        return self._batch_update((user_key, body) for user_key in user_keys)
+
+    def _batch_update(self, pairs: Iterable[Tuple[str, Dict[str, Any]]], failures: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """
+        Send users().update requests through the batch endpoint.
+
+        Args:
+            pairs: Iterable of (user_key, body) to apply.
+            failures (list): Pre-validation failures, filled while `pairs` is consumed.
+
+        Returns:
+            dict: Results of the batch user updates.
+        """
+        results = {
+            "success": [],
+            "failure": failures if failures is not None else []
+        }
+
+        try:
+            users = self.load_service().users()
+
+            def requests():
+                for user_key, body in pairs:
+                    self.invalidate_user(user_key)
+                    yield user_key, users.update(userKey=user_key, body=body)
+
+            for user_key, response, exception in self._run_batched(requests()):
+                if exception is not None:
+                    results["failure"].append({
+                        "user_key": user_key,
+                        "error": self._handle_error(exception, f"update_user for {user_key}")["error"]
+                    })
+                else:
+                    results["success"].append({
+                        "user_key": user_key,
+                        "user": response
+                    })
+        except Exception as e:
+            return self._handle_error(e, "batch_update_users")
 
-        return self.batch_update_users(updates)
+        return {
+            "message": f"Batch operation completed. {len(results['success'])} successes, {len(results['failure'])} failures.",
+            "results": results
+        }
 
     # ===== UTILITY AND HELPER METHODS =====
 
@@ -1248,40 +1612,13 @@ class Directory(Initialize):
             dict: User count information.
         """
         try:
-            service = self.load_service()
-
-            # Use a minimal field set to reduce data transfer
-            results = service.users().list(
-                customer='my_customer',
-                maxResults=1,
-                fields='users(id)'
-            ).execute()
-
             # The totalResults field isn't available, so we need to count manually
             # For efficiency, we'll do a quick count by fetching only IDs
-            all_users = []
-            page_token = None
-
-            while True:
-                request_params = {
-                    'customer': 'my_customer',
-                    'maxResults': 500,
-                    'fields': 'users(id),nextPageToken'
-                }
-
-                if page_token:
-                    request_params['pageToken'] = page_token
-
-                results = service.users().list(**request_params).execute()
-                users = results.get('users', [])
+            total_count = 0
+            pages = self._iter_user_pages(maxResults=500, fields='users(id),nextPageToken')
+            for users in self._prefetch_pages(pages):
+                total_count += len(users)
 
-                all_users.extend(users)
-
-                page_token = results.get('nextPageToken')
-                if not page_token:
-                    break
-
-            total_count = len(all_users)
             return {
                 "message": f"Total user count retrieved successfully.",
                 "total_users": total_count
@@ -1297,16 +1634,22 @@ class Directory(Initialize):
         Returns:
             dict: Domain information.
         """
+        cached = self._domain_cache.get('my_customer')
+        if cached is not None:
+            return cached
+
         try:
             service = self.load_service()
 
             # Get customer info which includes domain information
             result = service.customers().get(customerKey='my_customer').execute()
 
-            return {
+            response = {
                 "message": "Domain information retrieved successfully.",
                 "domain_info": result
             }
+            self._domain_cache['my_customer'] = response
+            return response
 
         except Exception as e:
             return self._handle_error(e, "get_domain_info")
@@ -1321,9 +1664,21 @@ class Directory(Initialize):
         Returns:
             bool: True if valid, False otherwise.
         """
-        import re
-        pattern = r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}"
-        return bool(re.match(pattern, email))
+        return _EMAIL_RE.match(email) is not None
+
+    def validate_email_format_many(self, emails: Iterable[str]) -> Iterator[bool]:
+        """
+        Validate many email addresses.
+
+        Args:
+            emails (iterable): Email addresses to validate.
+
+        Yields:
+            bool: True if the corresponding address is valid, False otherwise.
+        """
+        match = _EMAIL_RE.match
+        for email in emails:
+            yield match(email) is not None
 
     def generate_user_report(self, include_suspended: bool = True, include_admin: bool = True) -> Dict[str, Any]:
         """
@@ -1337,50 +1692,35 @@ class Directory(Initialize):
             dict: Comprehensive user report.
         """
         try:
-            # Get all users
-            all_users_result = self.list_all_users()
-            if "error" in all_users_result:
-                return all_users_result
-
-            users = all_users_result.get('users', [])
+            # Analyze user data in a single pass, page by page as it arrives
+            total_users = 0
+            suspended_users = 0
+            admin_users = 0
+            users_by_ou = Counter()
+            creation_stats = Counter()
+
+            pages = self._iter_user_pages(maxResults=500, orderBy='email')
+            for user in itertools.chain.from_iterable(self._prefetch_pages(pages)):
+                total_users += 1
+                suspended_users += bool(user.get('suspended', False))
+                admin_users += bool(user.get('isAdmin', False))
+                users_by_ou[user.get('orgUnitPath', '/')] += 1
+
+                # Creation year, e.g. '2021' from '2021-08-16T17:02:11.000Z'
+                creation_time = user.get('creationTime', '')
+                if creation_time:
+                    creation_stats[creation_time.split('T')[0].split('-')[0] or 'Unknown'] += 1
 
-            # Analyze user data
             report = {
-                "total_users": len(users),
-                "active_users": 0,
-                "suspended_users": 0,
-                "admin_users": 0,
-                "users_by_ou": {},
-                "creation_stats": {},
+                "total_users": total_users,
+                "active_users": total_users - suspended_users,
+                "suspended_users": suspended_users,
+                "admin_users": admin_users,
+                "users_by_ou": dict(users_by_ou),
+                "creation_stats": dict(creation_stats),
                 "last_login_stats": {}
             }
 
-            for user in users:
-                # Count active/suspended
-                if user.get('suspended', False):
-                    report["suspended_users"] += 1
-                else:
-                    report["active_users"] += 1
-
-                # Count admins
-                if user.get('isAdmin', False):
-                    report["admin_users"] += 1
-
-                # Group by OU
-                ou_path = user.get('orgUnitPath', '/')
-                if ou_path not in report["users_by_ou"]:
-                    report["users_by_ou"][ou_path] = 0
-                report["users_by_ou"][ou_path] += 1
-
-                # Creation time analysis
-                creation_time = user.get('creationTime', '')
-                if creation_time:
-                    creation_date = creation_time.split('T')[0]  # Get just the date part
-                    creation_year = creation_date.split('-')[0] if creation_date else 'Unknown'
-                    if creation_year not in report["creation_stats"]:
-                        report["creation_stats"][creation_year] = 0
-                    report["creation_stats"][creation_year] += 1
-
             return {
                 "message": "User report generated successfully.",
                 "report": report,
@@ -1397,8 +1737,8 @@ class Directory(Initialize):
         Returns:
             str: Current timestamp.
         """
-        from datetime import datetime
-        return datetime.utcnow().isoformat() + 'Z'
+        seconds, nanoseconds = divmod(time.time_ns(), 1_000_000_000)
+        return time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(seconds)) + f'.{nanoseconds // 1000:06d}Z'
 
     # ===== LEGACY METHOD ALIASES =====
     # Keep existing method names for backward compatibility
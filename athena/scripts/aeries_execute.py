@@ -19,13 +19,17 @@ import sys
 from datetime import datetime
 
 from athena.api.aeries_api.aeries_client import AeriesAPI
+from athena.utils.json_utils import write_json
 
+# Parameters that Aeries methods accept as datetime/date objects
+_DATETIME_KEYS = frozenset({'since', 'start_date', 'end_date'})
 
-def _to_json(obj):
+
+def _write_json(obj):
     try:
-        return json.dumps(obj, default=str)
+        write_json(obj)
     except Exception:
-        return json.dumps(str(obj))
+        write_json(str(obj))
 
 
 def main():
@@ -44,11 +48,11 @@ def main():
     try:
         client = AeriesAPI(endpoint=endpoint, api_key=api_key)
     except Exception as e:
-        print(json.dumps({
+        write_json({
             "success": False,
             "error": f"Failed to initialize AeriesAPI: {e}",
             "message": "Initialization error"
-        }))
+        })
         return 1
 
     # Resolve target object
@@ -66,19 +70,19 @@ def main():
     elif resource == "grades":
         target = client.grades
     else:
-        print(json.dumps({
+        write_json({
             "success": False,
             "error": f"Unknown resource: {resource}"
-        }))
+        })
         return 1
 
     # Resolve method
     method_name = args.method
     if not hasattr(target, method_name):
-        print(json.dumps({
+        write_json({
             "success": False,
             "error": f"Method '{method_name}' not found on resource '{resource}'"
-        }))
+        })
         return 1
 
     method = getattr(target, method_name)
@@ -91,20 +95,20 @@ def main():
             if not isinstance(kwargs, dict):
                 raise ValueError("params must be a JSON object")
         except Exception as e:
-            print(json.dumps({
+            write_json({
                 "success": False,
                 "error": f"Invalid params JSON: {e}"
-            }))
+            })
             return 1
 
     # Light normalization for known date/datetime-like keys
     # Allows UI to send ISO strings and we convert to datetime objects when needed
-    if isinstance(kwargs, dict):
-        # Convert 'since' to datetime if provided as ISO string
-        if 'since' in kwargs and isinstance(kwargs['since'], str) and kwargs['since'].strip():
+    for key in _DATETIME_KEYS & kwargs.keys():
+        value = kwargs[key]
+        if isinstance(value, str) and value.strip():
             try:
-                kwargs['since'] = datetime.fromisoformat(kwargs['since'])
-            except Exception:
+                kwargs[key] = datetime.fromisoformat(value)
+            except ValueError:
                 # leave as string if parsing fails; underlying method may handle or error
                 pass
 
@@ -124,15 +128,15 @@ def main():
             # For bare booleans or other returns (e.g., test_connection)
             output = {"success": True, "data": result}
 
-        print(_to_json(output))
+        _write_json(output)
         return 0
 
     except Exception as e:
-        print(json.dumps({
+        write_json({
             "success": False,
             "error": str(e),
             "message": "Execution error"
-        }))
+        })
         return 1
 
 
@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""
+Long-lived server that runs Athena script functions without a new interpreter per call.
+
+The Node backend normally spawns one Python process per request, paying for
+interpreter start-up, imports, credential loading and a fresh TLS connection to
+Google every time. This daemon keeps all of that warm: a fixed pool of worker
+threads each holds its own Google API clients (and their open HTTP connection)
+and reuses them for every request it serves.
+
+Scripts without an in-process handler are run by a fork server instead: a
+single-threaded child forked at start-up, before any worker threads exist, that
+forks once per request. The forked child already has every Athena module
+imported, points its stdout at the client connection and runs the script's
+__main__ block, so its output is exactly what a spawned process would print.
+
+Protocol (line-delimited JSON over a Unix socket, one request per connection):
+    -> {"script": "move_device", "args": ["<device_id>", "<org_unit>"], "input": "<optional stdin text>"}
+    <- the same JSON document the script would print to stdout
+
+Requests for anything that is not a script in this directory are answered with
+{"success": false, "daemon_unsupported": true, ...} so the client can fall back
+to spawning it.
+
+Usage:
+    python athena_daemon.py [socket_path]    # Defaults to $ATHENA_DAEMON_SOCKET or /tmp/athena.sock
+"""
+
+# Standard Imports
+import argparse
+import json
+import logging
+import os
+import runpy
+import signal
+import socket
+import socketserver
+import sys
+import tempfile
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+# Add the parent directory to the path so we can import from athena, unless PYTHONPATH already does
+_ATHENA_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
+if _ATHENA_ROOT not in sys.path:
+    sys.path.insert(0, _ATHENA_ROOT)
+
+# Configure logging before the script modules, some of which adjust the root logger on import
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger('athena_daemon')
+
+# Local Imports
+from athena.api.google_api.devices import Devices
+from athena.api.google_api.directory import Directory
+from athena.utils.db_utils import use_connection_pool
+from athena.utils.json_utils import dump_bytes
+from athena.scripts.get_all_chromebooks_by_ou import stream_all_chromebooks_by_ou
+from athena.scripts.get_org_units import get_org_units
+from athena.scripts.get_users import get_users
+from athena.scripts.move_device import move_device
+from athena.scripts.move_devices import move_devices
+from athena.scripts.reset_devices import reset_devices
+from athena.scripts.search_device_live import search_device
+from athena.scripts.search_student import search_student
+from athena.scripts.suspend_user import suspend_user
+from athena.scripts.sync_chromebooks import DEFAULT_DB_HOST, sync_chromebooks
+from athena.scripts.unsuspend_user import unsuspend_user
+from athena.scripts.update_device_notes import update_device_notes
+from athena.scripts.update_device_notes_batch import update_device_notes_batch
+
+logging.getLogger().setLevel(logging.INFO)
+
+DEFAULT_SOCKET_PATH = '/tmp/athena.sock'
+MAX_WORKERS = 8
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _usage(message):
+    return {"success": False, "error": message}
+
+
+def _move_device(args, out, stdin):
+    if len(args) != 2:
+        return _usage('Usage: move_device <device_id> <target_org_unit>')
+    return move_device(*args)
+
+
+def _search_device_live(args, out, stdin):
+    if len(args) not in (1, 2) or (len(args) == 2 and args[1] != '--no-full-scan'):
+        return {"success": False, "message": "Usage: search_device_live <search_query> [--no-full-scan]", "data": []}
+    return search_device(args[0], allow_full_scan=len(args) == 1)
+
+
+def _search_student(args, out, stdin):
+    if not args:
+        return {"success": False, "message": "Student ID is required", "data": None}
+    return search_student(args[0])
+
+
+def _get_users(args, out, stdin):
+    parser = argparse.ArgumentParser(prog='get_users', add_help=False, exit_on_error=False)
+    parser.add_argument("--all", action="store_true")
+    parser.add_argument("--max-results", type=int, default=100)
+    parser.add_argument("--batch-size", type=int, default=500)
+    try:
+        options, unknown = parser.parse_known_args(args)
+    except argparse.ArgumentError as e:
+        return {"success": False, "message": f"Error fetching users: {e}", "data": []}
+    if unknown:
+        return {"success": False, "message": f"Error fetching users: unrecognized arguments: {' '.join(unknown)}", "data": []}
+    return get_users(max_results=options.max_results, use_pagination=options.all, batch_size=options.batch_size)
+
+
+def _move_devices(args, out, stdin):
+    try:
+        moves = json.loads(stdin or '')
+    except ValueError as e:
+        return {'success': False, 'error': f'Invalid JSON on stdin: {e}'}
+    return move_devices(moves if isinstance(moves, list) else [moves])
+
+
+def _suspend_user(args, out, stdin):
+    if not args:
+        return {
+            "success": False,
+            "error": "Missing required argument: user_key",
+            "message": "Usage: python suspend_user.py <user_key> [reason]"
+        }
+    return suspend_user(args[0], args[1] if len(args) > 1 else "")
+
+
+def _unsuspend_user(args, out, stdin):
+    if not args:
+        return {
+            "success": False,
+            "error": "Missing required argument: user_key",
+            "message": "Usage: python unsuspend_user.py <user_key>"
+        }
+    return unsuspend_user(args[0])
+
+
+def _update_device_notes(args, out, stdin):
+    if len(args) != 2:
+        return _usage('Usage: python update_device_notes.py <asset_id> <notes_content>')
+    return update_device_notes(*args)
+
+
+def _update_device_notes_batch(args, out, stdin):
+    try:
+        updates = json.loads(stdin or '')
+    except ValueError as e:
+        return {'success': False, 'error': f'Invalid JSON on stdin: {e}'}
+    return update_device_notes_batch(updates if isinstance(updates, list) else [updates])
+
+
+def _get_all_chromebooks_by_ou(args, out, stdin):
+    stream_all_chromebooks_by_ou(args[0] if args else None, out)
+
+
+# Script name -> handler(args, out, stdin). A handler returns the result dict, or None
+# if it already wrote its JSON document to the binary stream `out`. `stdin` is the
+# request's "input" text, or None.
+HANDLERS = {
+    'get_all_chromebooks_by_ou': _get_all_chromebooks_by_ou,
+    'get_org_units': lambda args, out, stdin: get_org_units(),
+    'get_users': _get_users,
+    'move_device': _move_device,
+    'move_devices': _move_devices,
+    'reset_devices': lambda args, out, stdin: reset_devices(args) if args else _usage('No device identifiers provided'),
+    'search_device_live': _search_device_live,
+    'search_student': _search_student,
+    'suspend_user': _suspend_user,
+    'sync_chromebooks': lambda args, out, stdin: sync_chromebooks(),
+    'unsuspend_user': _unsuspend_user,
+    'update_device_notes': _update_device_notes,
+    'update_device_notes_batch': _update_device_notes_batch,
+}
+
+
+def _warm_worker():
+    """
+    Build this worker thread's Google API clients up front so the first request doesn't pay for them.
+    """
+    try:
+        Devices.get_instance().load_service()
+        Directory.get_instance().load_service()
+    except Exception as e:
+        logger.warning(f"Could not pre-load Google API client: {e}")
+
+
+def _script_path(script):
+    """
+    Return the path of a runnable script in this directory, or None.
+    """
+    path = os.path.join(SCRIPTS_DIR, f'{script}.py')
+    if script == 'athena_daemon' or not os.path.isfile(path):
+        return None
+    return path
+
+
+def _run_forked_script(conn_fd, stdin_fd, path, args):
+    """
+    Run a script's __main__ block with stdout on the client connection and stdin on stdin_fd. Never returns.
+    """
+    code = 0
+    try:
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+        os.dup2(conn_fd, 1)
+        os.close(conn_fd)
+        os.dup2(stdin_fd, 0)
+        os.close(stdin_fd)
+        sys.argv = [path] + args
+        runpy.run_path(path, run_name='__main__')
+    except SystemExit as e:
+        code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    except BaseException:
+        traceback.print_exc()
+        code = 1
+    finally:
+        try:
+            sys.stdout.flush()
+        except Exception:
+            pass
+        os._exit(code)
+
+
+def _serve_forks(control):
+    """
+    Fork server loop: receive (request, connection fd, stdin fd) messages and fork a child per request.
+    """
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)  # Let the kernel reap finished children
+    while True:
+        message, fds, _, _ = socket.recv_fds(control, 65536, 2)
+        if not message:
+            break  # The daemon closed its end
+        if len(fds) != 2:
+            for fd in fds:
+                os.close(fd)
+            continue
+        path, args = json.loads(message)
+        if os.fork() == 0:
+            control.close()
+            _run_forked_script(fds[0], fds[1], path, args)
+        for fd in fds:
+            os.close(fd)
+
+
+def _start_fork_server():
+    """
+    Fork the fork server while this process is still single-threaded and return the daemon's end of its control socket.
+    """
+    daemon_end, server_end = socket.socketpair(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+    if os.fork() == 0:
+        daemon_end.close()
+        try:
+            _serve_forks(server_end)
+        finally:
+            os._exit(0)
+    server_end.close()
+    return daemon_end
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    """
+    Serve one JSON request per connection.
+    """
+
+    delegated = False
+
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline())
+            script = os.path.splitext(os.path.basename(request['script']))[0]
+            args = list(request.get('args', []))
+            stdin = request.get('input')
+        except (ValueError, KeyError, TypeError) as e:
+            self._reply({"success": False, "error": f"Invalid request: {e}"})
+            return
+
+        handler = HANDLERS.get(script)
+        if handler is None and self.server.fork_control is not None and _script_path(script):
+            # Hand the connection to the fork server, which answers on it directly
+            message = json.dumps([_script_path(script), [str(arg) for arg in args]]).encode()
+            # Script input goes through a temporary file so it can be any size
+            with tempfile.TemporaryFile() if stdin is not None else open(os.devnull, 'rb') as source:
+                if stdin is not None:
+                    source.write(stdin.encode('utf-8'))
+                    source.seek(0)
+                socket.send_fds(self.server.fork_control, [message], [self.connection.fileno(), source.fileno()])
+            self.delegated = True
+            return
+
+        if handler is None:
+            self._reply({
+                "success": False,
+                "daemon_unsupported": True,
+                "error": f"Script not served by daemon: {script}"
+            })
+            return
+
+        try:
+            result = handler(args, self.wfile, stdin)
+        except Exception as e:
+            logger.exception(f"Unhandled error in {script}")
+            result = {"success": False, "error": str(e)}
+        if result is not None:
+            self._reply(result)
+
+    def _reply(self, result):
+        self.wfile.write(dump_bytes(result))
+        self.wfile.write(b'\n')
+
+
+class AthenaDaemon(socketserver.UnixStreamServer):
+    """
+    Unix socket server handing connections to a fixed pool of long-lived worker threads.
+    """
+
+    def __init__(self, socket_path, max_workers=MAX_WORKERS, fork_scripts=True):
+        # The fork server must be started before any thread exists in this process
+        self.fork_control = _start_fork_server() if fork_scripts else None
+
+        # Remove a stale socket left behind by a previous run
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        super().__init__(socket_path, RequestHandler)
+        os.chmod(socket_path, 0o660)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, initializer=_warm_worker)
+
+    def process_request(self, request, client_address):
+        self.executor.submit(self._process, request, client_address)
+
+    def finish_request(self, request, client_address):
+        return self.RequestHandlerClass(request, client_address, self)
+
+    def _process(self, request, client_address):
+        handler = None
+        try:
+            handler = self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            if handler is not None and handler.delegated:
+                # The forked child owns the connection now; shutting it down would cut it off
+                self.close_request(request)
+            else:
+                self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self.executor.shutdown(wait=False)
+        if self.fork_control is not None:
+            self.fork_control.close()
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+
+
+def main():
+    socket_path = sys.argv[1] if len(sys.argv) > 1 else os.environ.get('ATHENA_DAEMON_SOCKET', DEFAULT_SOCKET_PATH)
+
+    with AthenaDaemon(socket_path) as server:
+        # After the fork server has started, so it never inherits a database socket
+        use_connection_pool(maxconn=MAX_WORKERS, default_host=DEFAULT_DB_HOST)
+        logger.info(f"Athena daemon listening on {socket_path}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@
 """
 Debug script to test Google API connection and credentials.
 """
+import argparse
 import os
 import sys
 import json
@@ -13,7 +14,14 @@ current_dir = Path(__file__).resolve().parent
 parent_dir = current_dir.parent
 sys.path.append(str(parent_dir))
 
-def debug_environment():
+# Prefer the shared (orjson-backed) writer, but stay usable when the package itself is what's broken
+try:
+    from athena.utils.json_utils import write_json
+except ImportError:
+    def write_json(obj, indent=False):
+        print(json.dumps(obj, indent=2 if indent else None, default=str))
+
+def debug_environment(verbose=False):
     """Debug the Python environment and paths."""
     debug_info = {
         "environment": {
@@ -25,8 +33,7 @@ def debug_environment():
             "cwd": os.getcwd(),
             "env_vars": {
                 "PYTHONPATH": os.environ.get("PYTHONPATH", "Not set"),
-                "VIRTUAL_ENV": os.environ.get("VIRTUAL_ENV", "Not set"),
-                "PATH": os.environ.get("PATH", "Not set")
+                "VIRTUAL_ENV": os.environ.get("VIRTUAL_ENV", "Not set")
             }
         },
         "file_system": {
@@ -38,6 +45,9 @@ def debug_environment():
         }
     }
 
+    if verbose:
+        debug_info["environment"]["env_vars"]["PATH"] = os.environ.get("PATH", "Not set")
+
     # List files in the api/google_api directory if it exists
     google_api_dir = os.path.join(parent_dir, "api", "google_api")
     if os.path.exists(google_api_dir):
@@ -120,7 +130,8 @@ def test_google_auth():
 
                 # Try to build the service
                 try:
-                    service = build('admin', 'directory_v1', credentials=delegated_credentials)
+                    service = build('admin', 'directory_v1', credentials=delegated_credentials,
+                                    cache_discovery=False, static_discovery=True)
                     import_results["service"] = {
                         "status": "OK",
                         "message": "Successfully built the Admin SDK Directory service"
@@ -147,22 +158,26 @@ def test_google_auth():
 
 def main():
     """Main function to run the debug tests."""
+    parser = argparse.ArgumentParser(description="Debug Google API connection and credentials")
+    parser.add_argument("--verbose", action="store_true", help="Include the full PATH in the output")
+    args = parser.parse_args()
+
     try:
         # Collect all debug information
         debug_info = {
-            "environment": debug_environment(),
+            "environment": debug_environment(verbose=args.verbose),
             "google_api": test_google_auth()
         }
 
         # Print the debug information as JSON
-        print(json.dumps(debug_info, indent=2))
+        write_json(debug_info, indent=True)
     except Exception as e:
         error_info = {
             "status": "Error",
             "message": f"Debug script failed: {str(e)}",
             "traceback": traceback.format_exc()
         }
-        print(json.dumps(error_info, indent=2))
+        write_json(error_info, indent=True)
 
 if __name__ == "__main__":
     main()
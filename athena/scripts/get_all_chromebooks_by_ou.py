@@ -6,14 +6,16 @@ This script uses the new list_all_devices_by_ou method for better performance an
 
 import sys
 import os
-import json
 import logging
 
-# Add the parent directory to the path so we can import from athena
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+# Add the parent directory to the path so we can import from athena, unless PYTHONPATH already does
+_ATHENA_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
+if _ATHENA_ROOT not in sys.path:
+    sys.path.insert(0, _ATHENA_ROOT)
 
 # Import Athena modules
 from athena.api.google_api.devices import Devices
+from athena.utils.json_utils import buffered_stdout, dump_bytes
 
 def get_all_chromebooks_by_ou(organizational_unit_path=None):
     """
@@ -34,7 +36,7 @@ def get_all_chromebooks_by_ou(organizational_unit_path=None):
         # Fetch all devices using the new pagination method
         results = devices.list_all_devices_by_ou(
             organizational_unit_path=organizational_unit_path,
-            batch_size=100,  # Optimal batch size for performance
+            batch_size=Devices.MAX_DEVICE_PAGE_SIZE,  # Fewest round trips per fleet dump
             recent_users_limit=1,
             formatted=False,
             include_null=False
@@ -64,8 +66,7 @@ def get_all_chromebooks_by_ou(organizational_unit_path=None):
             "data": all_devices,
             "devices_by_ou": devices_by_ou,
             "total_devices": total_devices,
-            "api_calls": api_calls,
-            "organizational_units": list(devices_by_ou.keys()) if devices_by_ou else []
+            "api_calls": api_calls
         }
     except Exception as e:
         logging.exception("Error fetching Chromebooks from Google Admin API")
@@ -78,6 +79,70 @@ def get_all_chromebooks_by_ou(organizational_unit_path=None):
             "api_calls": 0
         }
 
+def stream_all_chromebooks_by_ou(organizational_unit_path=None, out=None):
+    """
+    Write the get_all_chromebooks_by_ou response to a binary stream as pages arrive.
+
+    Each device is encoded once and its dict dropped, so peak memory is the encoded
+    output rather than the device dicts plus their serialization. The closing keys
+    ("success", "message", ...) are written last; if the fetch fails part-way the
+    open arrays are closed and "success": false is reported, keeping the JSON valid.
+
+    Args:
+        organizational_unit_path (str, optional): Specific OU path to filter by.
+                                                If None, gets all devices from root.
+        out: Binary stream to write to. Defaults to sys.stdout.buffer.
+    """
+    if out is None:
+        out = sys.stdout.buffer
+
+    encoded_by_ou = {}
+    total_devices = 0
+    api_calls = 0
+    error = None
+
+    out.write(b'{"data":[')
+    try:
+        pages = Devices.get_instance().list_all_devices_by_ou(
+            organizational_unit_path=organizational_unit_path,
+            batch_size=Devices.MAX_DEVICE_PAGE_SIZE,  # Fewest round trips per fleet dump
+            recent_users_limit=1,
+            include_null=False,
+            stream=True
+        )
+        for devices in pages:
+            api_calls += 1
+            for device in devices:
+                encoded = dump_bytes(device)
+                out.write(b',' + encoded if total_devices else encoded)
+                total_devices += 1
+                encoded_by_ou.setdefault(device.get('orgUnitPath', '/'), []).append(encoded)
+    except Exception as e:
+        logging.exception("Error fetching Chromebooks from Google API")
+        error = e
+    out.write(b'],"devices_by_ou":{')
+
+    if error is None:
+        for i, (ou_path, encoded) in enumerate(encoded_by_ou.items()):
+            out.write(b'%s%s:[%s]' % (b',' if i else b'', dump_bytes(ou_path), b','.join(encoded)))
+        tail = {
+            "success": True,
+            "message": f"Successfully retrieved {total_devices} Chromebooks from Google Admin API in {api_calls} API calls",
+            "total_devices": total_devices,
+            "api_calls": api_calls
+        }
+    else:
+        tail = {
+            "success": False,
+            "message": f"Error from Google API: {str(error)}",
+            "total_devices": 0,
+            "api_calls": 0
+        }
+
+    # Splice the remaining keys onto the open object (drop the tail's own '{')
+    out.write(b'},' + dump_bytes(tail)[1:] + b'\n')
+    out.flush()
+
 if __name__ == "__main__":
     # Configure logging
     logging.basicConfig(level=logging.INFO)
@@ -86,10 +151,8 @@ if __name__ == "__main__":
     org_unit_path = None
     if len(sys.argv) > 1:
         org_unit_path = sys.argv[1]
-        logging.info(f"Filtering by organizational unit: {org_unit_path}")
-
-    # Get all Chromebooks
-    result = get_all_chromebooks_by_ou(org_unit_path)
+        logging.info("Filtering by organizational unit: %s", org_unit_path)
 
-    # Print the result as JSON
-    print(json.dumps(result))
+    # Stream all Chromebooks as JSON
+    with buffered_stdout() as out:
+        stream_all_chromebooks_by_ou(org_unit_path, out)
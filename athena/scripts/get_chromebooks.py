@@ -5,14 +5,16 @@ Script to fetch Chromebook devices from Google Admin API using Athena.
 
 import sys
 import os
-import json
 import logging
 
-# Add the parent directory to the path so we can import from athena
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+# Add the parent directory to the path so we can import from athena, unless PYTHONPATH already does
+_ATHENA_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
+if _ATHENA_ROOT not in sys.path:
+    sys.path.insert(0, _ATHENA_ROOT)
 
 # Import Athena modules
 from athena.api.google_api.devices import Devices
+from athena.utils.json_utils import write_json
 
 def get_chromebooks():
     """
@@ -50,4 +52,4 @@ if __name__ == "__main__":
     result = get_chromebooks()
 
     # Print the result as JSON
-    print(json.dumps(result))
+    write_json(result)
@@ -5,18 +5,20 @@ Script to fetch organizational units from Google Admin API using Athena.
 
 import sys
 import os
-import json
 import logging
 
 # Suppress all logging to stderr to avoid interfering with JSON output
 logging.basicConfig(level=logging.CRITICAL)
 logging.getLogger().setLevel(logging.CRITICAL)
 
-# Add the parent directory to the path so we can import from athena
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+# Add the parent directory to the path so we can import from athena, unless PYTHONPATH already does
+_ATHENA_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
+if _ATHENA_ROOT not in sys.path:
+    sys.path.insert(0, _ATHENA_ROOT)
 
 # Import Athena modules
 from athena.api.google_api.devices import Devices
+from athena.utils.json_utils import write_json
 
 def get_org_units():
     """
@@ -52,4 +54,4 @@ if __name__ == "__main__":
     result = get_org_units()
 
     # Print the result as JSON to stdout only
-    print(json.dumps(result, indent=None, separators=(',', ':')))
+    write_json(result)
@@ -3,39 +3,43 @@
 Script to fetch users from Google Admin API using Athena.
 """
 
+import argparse
 import sys
 import os
-import json
 import logging
 
 # Suppress all logging to stderr to avoid interfering with JSON output
 logging.basicConfig(level=logging.CRITICAL)
 logging.getLogger().setLevel(logging.CRITICAL)
 
-# Add the parent directory to the path so we can import from athena
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+# Add the parent directory to the path so we can import from athena, unless PYTHONPATH already does
+_ATHENA_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
+if _ATHENA_ROOT not in sys.path:
+    sys.path.insert(0, _ATHENA_ROOT)
 
 # Import Athena modules
 from athena.api.google_api.directory import Directory
+from athena.utils.json_utils import write_json
 
-def get_users(max_results=100, use_pagination=False):
+def get_users(max_results=100, use_pagination=False, batch_size=500):
     """
     Fetch users from Google Admin API with organizational units.
 
     Args:
         max_results (int): Maximum number of users to retrieve (ignored if use_pagination=True).
         use_pagination (bool): Whether to fetch all users using pagination.
+        batch_size (int): Users per API call when paginating (500 is the API maximum).
 
     Returns:
         dict: A dictionary containing the results or error message.
     """
     try:
         # Initialize the Directory class
-        directory = Directory()
+        directory = Directory.get_instance()
 
         # Fetch users with organizational units
         if use_pagination:
-            results = directory.list_all_users_with_ou(batch_size=500)
+            results = directory.list_all_users_with_ou(batch_size=batch_size)
         else:
             # For limited results, still use the regular method but with projection=full to get orgUnitPath
             results = directory.list_users(max_results=max_results)
@@ -56,8 +60,14 @@ def get_users(max_results=100, use_pagination=False):
         }
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fetch users from Google Admin API")
+    parser.add_argument("--all", action="store_true", help="Fetch every user using pagination")
+    parser.add_argument("--max-results", type=int, default=100, help="Users to fetch without --all")
+    parser.add_argument("--batch-size", type=int, default=500, help="Users per API call with --all (max 500)")
+    args = parser.parse_args()
+
     # Get users (default max_results=100)
-    result = get_users()
+    result = get_users(max_results=args.max_results, use_pagination=args.all, batch_size=args.batch_size)
 
     # Print the result as JSON to stdout only
-    print(json.dumps(result, indent=None, separators=(',', ':')))
+    write_json(result)
@@ -1,10 +1,15 @@
 #!/usr/bin/env python3
 """
 Move a Chrome device to a different organizational unit in Google Admin Console
+
+Usage:
+    python move_device.py <device_id> <target_org_unit>
+
+For many devices at once use move_devices.py, which batches the moves.
 """
 import sys
-import json
 from athena.api.google_api.devices import Devices
+from athena.utils.json_utils import write_json
 
 def move_device(device_id, target_org_unit):
     """
@@ -19,7 +24,7 @@ def move_device(device_id, target_org_unit):
     """
     try:
         # Initialize Google Devices API client
-        devices_client = Devices()
+        devices_client = Devices.get_instance()
 
         # Call the move_chrome_os_device method
         result = devices_client.move_chrome_os_device(device_id, target_org_unit)
@@ -48,17 +53,17 @@ def move_device(device_id, target_org_unit):
 def main():
     """Main function to handle command line arguments"""
     if len(sys.argv) != 3:
-        print(json.dumps({
+        write_json({
             'success': False,
             'error': 'Usage: python move_device.py <device_id> <target_org_unit>'
-        }))
+        })
         sys.exit(1)
 
     device_id = sys.argv[1]
     target_org_unit = sys.argv[2]
 
     result = move_device(device_id, target_org_unit)
-    print(json.dumps(result))
+    write_json(result)
 
 if __name__ == "__main__":
     main()
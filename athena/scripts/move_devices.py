@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Move many Chrome devices to organizational units in one run
+
+Devices are grouped by target OU and sent as batched moveDevicesToOu calls, so a
+whole migration costs one process start and a handful of HTTP requests.
+
+Usage:
+    python move_devices.py < moves.json    # [{"device_id": ..., "org_unit": ...}, ...]
+"""
+import json
+import sys
+from athena.api.google_api.devices import Devices
+from athena.utils.json_utils import write_json
+
+def move_devices(moves):
+    """
+    Move many devices in as few Admin SDK calls as possible
+
+    Args:
+        moves: List of {'device_id': ..., 'org_unit': ...} dicts ('target_ou' is accepted for 'org_unit')
+
+    Returns:
+        dict: Overall result with one entry per device under 'results'
+    """
+    try:
+        pairs = [(move['device_id'], move.get('org_unit') or move['target_ou']) for move in moves]
+    except (KeyError, TypeError, AttributeError):
+        return {
+            'success': False,
+            'error': 'Each move must be an object with "device_id" and "org_unit"'
+        }
+
+    try:
+        results = Devices.get_instance().move_devices_bulk(pairs)
+    except Exception as e:
+        return {
+            'success': False,
+            'error': str(e)
+        }
+
+    moved = sum(result['success'] for result in results)
+    return {
+        'success': moved == len(results),
+        'message': f'Moved {moved} of {len(results)} devices',
+        'moved': moved,
+        'failed': len(results) - moved,
+        'results': results
+    }
+
+def main():
+    """Read the moves from stdin and print the combined result"""
+    try:
+        moves = json.load(sys.stdin)
+    except ValueError as e:
+        write_json({
+            'success': False,
+            'error': f'Invalid JSON on stdin: {e}'
+        })
+        sys.exit(1)
+
+    result = move_devices(moves if isinstance(moves, list) else [moves])
+    write_json(result)
+
+if __name__ == "__main__":
+    main()
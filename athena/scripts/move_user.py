@@ -1,16 +1,61 @@
 #!/usr/bin/env python3
+"""
+Move Google Workspace users to organizational units
+
+Usage:
+    python move_user.py <user_key> <org_unit_path>
+    python move_user.py < moves.json    # [{"user_key": ..., "org_unit_path": ...}, ...]
+"""
 
-import sys
 import json
+import sys
 import logging
 from athena.api.google_api.directory import Directory
+from athena.utils.json_utils import write_json
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def move_users(moves):
+    """
+    Move many users, grouping them by target OU so each group is one batch request
+
+    Args:
+        moves: List of {'user_key': ..., 'org_unit_path': ...} dicts
+
+    Returns:
+        dict: Overall result with the per-user 'success' and 'failure' lists
+    """
+    by_ou = {}
+    for move in moves:
+        by_ou.setdefault(move['org_unit_path'], []).append(move['user_key'])
+
+    directory = Directory()
+    success, failure = [], []
+    for org_unit_path, user_keys in by_ou.items():
+        result = directory.move_users_to_ou(user_keys, org_unit_path)
+        if "error" in result:
+            failure.extend({"email": user_key, "reason": result["error"]} for user_key in user_keys)
+            continue
+        success.extend(result.get("success", []))
+        failure.extend(result.get("failure", []))
+
+    return {
+        "success": not failure,
+        "message": f"Moved {len(success)} of {len(success) + len(failure)} users",
+        "moved": success,
+        "failed": failure
+    }
+
 def main():
     try:
+        # A JSON array of moves on stdin replaces the positional arguments
+        if len(sys.argv) == 1 and not sys.stdin.isatty():
+            moves = json.load(sys.stdin)
+            write_json(move_users(moves if isinstance(moves, list) else [moves]))
+            return
+
         # Check if we have the required arguments
         if len(sys.argv) < 3:
             result = {
@@ -18,13 +63,13 @@ def main():
                 "error": "Missing required arguments: user_key and org_unit_path",
                 "message": "Usage: python move_user.py <user_key> <org_unit_path>"
             }
-            print(json.dumps(result))
+            write_json(result)
             sys.exit(1)
 
         user_key = sys.argv[1]
         org_unit_path = sys.argv[2]
 
-        logger.info(f"Moving user: {user_key} to organizational unit: {org_unit_path}")
+        logger.info("Moving user: %s to organizational unit: %s", user_key, org_unit_path)
 
         # Initialize the Directory API
         directory = Directory()
@@ -34,7 +79,7 @@ def main():
 
         if result.get("failure") and len(result["failure"]) > 0:
             error_info = result["failure"][0]
-            logger.error(f"Failed to move user {user_key}: {error_info.get('reason', 'Unknown error')}")
+            logger.error("Failed to move user %s: %s", user_key, error_info.get('reason', 'Unknown error'))
             output = {
                 "success": False,
                 "error": error_info.get('reason', 'Unknown error'),
@@ -42,7 +87,7 @@ def main():
             }
         elif result.get("success") and len(result["success"]) > 0:
             success_info = result["success"][0]
-            logger.info(f"Successfully moved user: {user_key} to {org_unit_path}")
+            logger.info("Successfully moved user: %s to %s", user_key, org_unit_path)
             output = {
                 "success": True,
                 "message": f"User {user_key} moved successfully to {org_unit_path}",
@@ -50,23 +95,23 @@ def main():
                 "new_org_unit": success_info.get("newOrgUnit", org_unit_path)
             }
         else:
-            logger.error(f"Unexpected result format when moving user {user_key}")
+            logger.error("Unexpected result format when moving user %s", user_key)
             output = {
                 "success": False,
                 "error": "Unexpected result format",
                 "message": f"Failed to move user {user_key} to {org_unit_path}"
             }
 
-        print(json.dumps(output))
+        write_json(output)
 
     except Exception as e:
-        logger.error(f"Error moving user: {str(e)}")
+        logger.error("Error moving user: %s", e)
         result = {
             "success": False,
             "error": str(e),
             "message": "An unexpected error occurred while moving the user"
         }
-        print(json.dumps(result))
+        write_json(result)
         sys.exit(1)
 
 if __name__ == "__main__":
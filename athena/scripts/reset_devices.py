@@ -1,7 +1,6 @@
 #!/usr/bin/env python3
 
 # Standard Imports
-import json
 import logging
 import sys
 
@@ -11,6 +10,7 @@ logger = logging.getLogger(__name__)
 
 # Google API Device imports
 from athena.api.google_api.devices import Devices
+from athena.utils.json_utils import write_json
 
 def reset_devices(device_identifiers):
     """
@@ -32,7 +32,7 @@ def reset_devices(device_identifiers):
         # Format the response
         response = {
             "success": True,
-            "message": f"Reset operation completed for {len(device_identifiers)} devices",
+            "message": f"Reset operation completed for {len(device_identifiers)} devices: {len(result['success'])} sent, {len(result['failure'])} failed",
             "results": result
         }
 
@@ -48,10 +48,10 @@ def reset_devices(device_identifiers):
 def main():
     """Main entry point for the script."""
     if len(sys.argv) < 2:
-        print(json.dumps({
+        write_json({
             "success": False,
             "error": "No device identifiers provided"
-        }))
+        })
         sys.exit(1)
 
     # Get device identifiers from command line arguments
@@ -61,7 +61,7 @@ def main():
     result = reset_devices(device_identifiers)
 
     # Output as JSON
-    print(json.dumps(result, indent=2))
+    write_json(result, indent=True)
 
     # Exit with appropriate code
     sys.exit(0 if result.get("success") else 1)
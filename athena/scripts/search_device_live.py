@@ -6,28 +6,64 @@ Supports search by asset tag, serial number, or model.
 
 import sys
 import os
-import json
 import logging
 import re
 
-# Add the parent directory to the path so we can import from athena
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+# Add the parent directory to the path so we can import from athena, unless PYTHONPATH already does
+_ATHENA_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
+if _ATHENA_ROOT not in sys.path:
+    sys.path.insert(0, _ATHENA_ROOT)
 
 # Import Athena modules
 from athena.api.google_api.devices import Devices
+from athena.utils.json_utils import write_json
+
+# Query shapes that can be looked up directly, compiled once per process
+_ASSET_TAG_RE = re.compile(r'^[a-zA-Z0-9-]+$')
+_SERIAL_RE = re.compile(r'^[a-zA-Z0-9]+$')
+
+# (response key, Admin SDK device field) for every field returned to the frontend
+_FIELD_MAP = (
+    ('device_id', 'deviceId'),
+    ('serial_number', 'serialNumber'),
+    ('annotated_asset_id', 'annotatedAssetId'),
+    ('model', 'model'),
+    ('status', 'status'),
+    ('org_unit_path', 'orgUnitPath'),
+    ('annotated_user', 'annotatedUser'),
+    ('annotated_location', 'annotatedLocation'),
+    ('notes', 'notes'),
+    ('last_sync', 'lastSync'),
+    ('os_version', 'osVersion'),
+    ('platform_version', 'platformVersion'),
+)
+_DEVICE_FIELDS = tuple(field for _, field in _FIELD_MAP)
+
+# Device fields matched by the full-scan substring search
+_SEARCH_FIELDS = ('model', 'annotatedAssetId', 'serialNumber', 'annotatedLocation', 'annotatedUser')
+
+
+def _format_device(device):
+    """
+    Convert an Admin SDK device into the shape the frontend expects.
+    """
+    return {key: device.get(field, '') for key, field in _FIELD_MAP}
+
 
-def search_device(query):
+def search_device(query, allow_full_scan=True):
     """
     Search for Chromebook devices from Google Admin API.
 
     Args:
         query (str): Search query (asset tag, serial number, or model)
+        allow_full_scan (bool): When Google's own search finds nothing, fall back to
+                                scanning every device for a substring match.
 
     Returns:
         dict: A dictionary containing the results or error message.
     """
     try:
-        logging.info(f"🔍 Searching for device: {query}")
+        logging.info("🔍 Searching for device: %s", query)
 
         # Initialize the Devices class
         devices = Devices.get_instance()
@@ -38,112 +74,57 @@ def search_device(query):
         query_lower = query.lower().strip()
 
         # Try exact asset tag search first (most specific)
-        if re.match(r'^[a-zA-Z0-9-]+$', query_lower):
-            logging.info(f"🏷️ Trying asset tag search for: {query}")
-            device_result = devices.find_device(
-                query,
-                'annotatedAssetId',
-                'deviceId', 'serialNumber', 'annotatedAssetId', 'model',
-                'status', 'orgUnitPath', 'annotatedUser', 'annotatedLocation',
-                'notes', 'lastSync', 'osVersion', 'platformVersion'
-            )
+        if _ASSET_TAG_RE.match(query_lower):
+            logging.info("🏷️ Trying asset tag search for: %s", query)
+            device_result = devices.find_device(query, 'annotatedAssetId', *_DEVICE_FIELDS)
             if device_result:
-                # Convert single device result to expected format
-                formatted_device = {
-                    'device_id': device_result['deviceId'],
-                    'serial_number': device_result['serialNumber'],
-                    'annotated_asset_id': device_result.get('annotatedAssetId', ''),
-                    'model': device_result.get('model', ''),
-                    'status': device_result.get('status', ''),
-                    'org_unit_path': device_result.get('orgUnitPath', ''),
-                    'annotated_user': device_result.get('annotatedUser', ''),
-                    'annotated_location': device_result.get('annotatedLocation', ''),
-                    'notes': device_result.get('notes', ''),
-                    'last_sync': device_result.get('lastSync', ''),
-                    'os_version': device_result.get('osVersion', ''),
-                    'platform_version': device_result.get('platformVersion', '')
-                }
-                results.append(formatted_device)
-                logging.info(f"✅ Found device by asset tag: {device_result.get('annotatedAssetId')}")
+                results.append(_format_device(device_result))
+                logging.info("✅ Found device by asset tag: %s", device_result.get('annotatedAssetId'))
 
         # Try serial number search if asset tag didn't work
-        if not results and re.match(r'^[a-zA-Z0-9]+$', query_lower):
-            logging.info(f"🔢 Trying serial number search for: {query}")
-            device_result = devices.find_device(
-                query,
-                'serialNumber',
-                'deviceId', 'serialNumber', 'annotatedAssetId', 'model',
-                'status', 'orgUnitPath', 'annotatedUser', 'annotatedLocation',
-                'notes', 'lastSync', 'osVersion', 'platformVersion'
-            )
+        if not results and _SERIAL_RE.match(query_lower):
+            logging.info("🔢 Trying serial number search for: %s", query)
+            device_result = devices.find_device(query, 'serialNumber', *_DEVICE_FIELDS)
             if device_result:
-                # Convert single device result to expected format
-                formatted_device = {
-                    'device_id': device_result['deviceId'],
-                    'serial_number': device_result['serialNumber'],
-                    'annotated_asset_id': device_result.get('annotatedAssetId', ''),
-                    'model': device_result.get('model', ''),
-                    'status': device_result.get('status', ''),
-                    'org_unit_path': device_result.get('orgUnitPath', ''),
-                    'annotated_user': device_result.get('annotatedUser', ''),
-                    'annotated_location': device_result.get('annotatedLocation', ''),
-                    'notes': device_result.get('notes', ''),
-                    'last_sync': device_result.get('lastSync', ''),
-                    'os_version': device_result.get('osVersion', ''),
-                    'platform_version': device_result.get('platformVersion', '')
-                }
-                results.append(formatted_device)
-                logging.info(f"✅ Found device by serial number: {device_result.get('serialNumber')}")
-
-        # If still no results and query looks like a model search, get all devices and filter
+                results.append(_format_device(device_result))
+                logging.info("✅ Found device by serial number: %s", device_result.get('serialNumber'))
+
+        # If still no results, let Google search its device index with the free-text query
         if not results and len(query) >= 3:
-            logging.info(f"📱 Trying model/broad search for: {query}")
-
-            # Get all devices and filter by model or other fields
-            all_devices_result = devices.list_all_devices(
-                batch_size=100,
-                recent_users_limit=1,
-                formatted=False,
-                include_null=False
-            )
-
-            if all_devices_result.get('devices'):
-                for device in all_devices_result['devices']:
-                    # Search in model, asset tag, serial number, location, or user
-                    model = device.get('model', '').lower()
-                    asset_tag = device.get('annotatedAssetId', '').lower()
-                    serial = device.get('serialNumber', '').lower()
-                    location = device.get('annotatedLocation', '').lower()
-                    user = device.get('annotatedUser', '').lower()
-
-                    if (query_lower in model or
-                        query_lower in asset_tag or
-                        query_lower in serial or
-                        query_lower in location or
-                        query_lower in user):
-
-                        formatted_device = {
-                            'device_id': device['deviceId'],
-                            'serial_number': device['serialNumber'],
-                            'annotated_asset_id': device.get('annotatedAssetId', ''),
-                            'model': device.get('model', ''),
-                            'status': device.get('status', ''),
-                            'org_unit_path': device.get('orgUnitPath', ''),
-                            'annotated_user': device.get('annotatedUser', ''),
-                            'annotated_location': device.get('annotatedLocation', ''),
-                            'notes': device.get('notes', ''),
-                            'last_sync': device.get('lastSync', ''),
-                            'os_version': device.get('osVersion', ''),
-                            'platform_version': device.get('platformVersion', '')
-                        }
-                        results.append(formatted_device)
-
-                        # Limit results to avoid overwhelming response
-                        if len(results) >= 10:
+            logging.info("📱 Trying model/broad search for: %s", query)
+
+            search_text = query.strip().replace('"', '')
+            matches = devices.search_devices(f'"{search_text}"' if ' ' in search_text else search_text, *_DEVICE_FIELDS, max_results=10)
+
+            # Last resort: page through all devices and filter by substring on model or other fields,
+            # stopping as soon as enough matches have been found
+            if not matches and allow_full_scan:
+                logging.info("📱 No indexed matches, scanning all devices for: %s", query)
+                matches = []
+                for device in devices.list_all_devices_iter(
+                    batch_size=Devices.MAX_DEVICE_PAGE_SIZE,
+                    recent_users_limit=1,
+                    include_null=False,
+                    fields=_DEVICE_FIELDS,  # Only what _format_device returns
+                    raw=True  # Non-matches are discarded, so skip copying every device
+                ):
+                    # Search in model, asset tag, serial number, location, or user with one
+                    # lowercase pass; the NUL separator keeps matches from spanning fields
+                    searchable = '\0'.join([device.get(field, '') for field in _SEARCH_FIELDS]).lower()
+                    if query_lower in searchable:
+                        matches.append(device)
+                        if len(matches) >= 10:
                             break
 
-                if results:
-                    logging.info(f"✅ Found {len(results)} devices by broad search")
+            for device in matches:
+                results.append(_format_device(device))
+
+                # Limit results to avoid overwhelming response
+                if len(results) >= 10:
+                    break
+
+            if results:
+                logging.info("✅ Found %d devices by broad search", len(results))
 
         # Return the results
         if results:
@@ -171,19 +152,19 @@ if __name__ == "__main__":
     # Configure logging
     logging.basicConfig(level=logging.INFO)
 
-    # Get search query from command line argument
-    if len(sys.argv) != 2:
-        print(json.dumps({
+    # Get search query (and optional --no-full-scan flag) from command line arguments
+    if len(sys.argv) not in (2, 3) or (len(sys.argv) == 3 and sys.argv[2] != '--no-full-scan'):
+        write_json({
             "success": False,
-            "message": "Usage: python search_device_live.py <search_query>",
+            "message": "Usage: python search_device_live.py <search_query> [--no-full-scan]",
             "data": []
-        }))
+        })
         sys.exit(1)
 
     search_query = sys.argv[1]
 
     # Search for devices
-    result = search_device(search_query)
+    result = search_device(search_query, allow_full_scan=len(sys.argv) == 2)
 
     # Print the result as JSON
-    print(json.dumps(result))
+    write_json(result)
@@ -5,14 +5,16 @@ Script to search for a student by ID in Google Admin API using Athena.
 
 import sys
 import os
-import json
 import logging
 
-# Add the parent directory to the path so we can import from athena
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+# Add the parent directory to the path so we can import from athena, unless PYTHONPATH already does
+_ATHENA_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
+if _ATHENA_ROOT not in sys.path:
+    sys.path.insert(0, _ATHENA_ROOT)
 
 # Import Athena modules
 from athena.api.google_api.directory import Directory
+from athena.utils.json_utils import write_json
 
 def search_student(student_id):
     """
@@ -26,7 +28,7 @@ def search_student(student_id):
     """
     try:
         # Initialize the Directory class
-        directory = Directory()
+        directory = Directory.get_instance()
 
         # Search for student by ID
         results = directory.search_student_id(student_id)
@@ -58,11 +60,11 @@ if __name__ == "__main__":
 
     # Get student ID from command line arguments
     if len(sys.argv) < 2:
-        print(json.dumps({
+        write_json({
             "success": False,
             "message": "Student ID is required",
             "data": None
-        }))
+        })
         sys.exit(1)
 
     student_id = sys.argv[1]
@@ -71,4 +73,4 @@ if __name__ == "__main__":
     result = search_student(student_id)
 
     # Print the result as JSON
-    print(json.dumps(result))
+    write_json(result)
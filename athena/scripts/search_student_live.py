@@ -6,15 +6,21 @@ This script searches for individual students and returns standardized data forma
 
 import sys
 import os
-import json
 import logging
 import re
 
-# Add the parent directory to the path so we can import from athena
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+# Add the parent directory to the path so we can import from athena, unless PYTHONPATH already does
+_ATHENA_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
+if _ATHENA_ROOT not in sys.path:
+    sys.path.insert(0, _ATHENA_ROOT)
 
 # Import Athena modules
 from athena.api.google_api.directory import Directory
+from athena.utils.json_utils import write_json
+
+# Query shapes, compiled once per process (\Z so a trailing newline never matches)
+_SIX_DIGIT_RE = re.compile(r'^\d{6}\Z')
+_ALL_DIGIT_RE = re.compile(r'^\d+\Z')
 
 def extract_student_id_from_email(email):
     """
@@ -29,9 +35,12 @@ def extract_student_id_from_email(email):
     if not email:
         return None
 
-    # Match pattern: anything.digits@domain
-    match = re.match(r'^[^.]+\.(\d+)@', email)
-    return match.group(1) if match else None
+    # Split 'firstname.studentid@domain' with string methods rather than a regex
+    local, at, _ = email.partition('@')
+    name, dot, student_id = local.partition('.')
+    if at and name and dot and student_id.isdecimal():
+        return student_id
+    return None
 
 def search_student_live(query, search_type='auto'):
     """
@@ -51,9 +60,9 @@ def search_student_live(query, search_type='auto'):
         # Determine search type if auto
         if search_type == 'auto':
             # Check if query looks like a student ID (exactly 6 digits)
-            if re.match(r'^\d{6}$', query):
+            if _SIX_DIGIT_RE.match(query):
                 search_type = 'student_id'
-            elif len(query.strip()) >= 3 and not re.match(r'^\d+$', query):
+            elif len(query.strip()) >= 3 and not _ALL_DIGIT_RE.match(query):
                 search_type = 'name'
             else:
                 return {
@@ -129,31 +138,35 @@ def format_student_data(user):
         dict: Formatted student data or None if not a valid student
     """
     try:
-        primary_email = user.get('primaryEmail')
+        user_get = user.get
+        primary_email = user_get('primaryEmail')
         if not primary_email:
             return None
 
-        # Extract student ID from email
+        # Extract student ID from email before building anything; staff accounts stop here
         student_id = extract_student_id_from_email(primary_email)
         if not student_id:
             return None  # Only return users with valid student IDs
 
-        first_name = user.get('name', {}).get('givenName', '')
-        last_name = user.get('name', {}).get('familyName', '')
-        full_name = user.get('name', {}).get('fullName', f"{first_name} {last_name}".strip())
+        name = user_get('name') or {}
+        first_name = name.get('givenName', '')
+        last_name = name.get('familyName', '')
+        full_name = name.get('fullName')
+        if full_name is None:
+            full_name = f"{first_name} {last_name}".strip()
 
         return {
-            "google_id": user.get('id'),
+            "google_id": user_get('id'),
             "primary_email": primary_email,
             "first_name": first_name,
             "last_name": last_name,
             "full_name": full_name,
             "student_id": student_id,
-            "org_unit_path": user.get('orgUnitPath', '/'),
-            "is_admin": user.get('isAdmin', False),
-            "is_suspended": user.get('suspended', False),
-            "creation_time": user.get('creationTime'),
-            "last_login_time": user.get('lastLoginTime')
+            "org_unit_path": user_get('orgUnitPath', '/'),
+            "is_admin": user_get('isAdmin', False),
+            "is_suspended": user_get('suspended', False),
+            "creation_time": user_get('creationTime'),
+            "last_login_time": user_get('lastLoginTime')
         }
 
     except Exception as e:
@@ -166,11 +179,11 @@ if __name__ == "__main__":
 
     # Get search query from command line arguments
     if len(sys.argv) < 2:
-        print(json.dumps({
+        write_json({
             "success": False,
             "message": "Search query is required",
             "data": []
-        }))
+        })
         sys.exit(1)
 
     query = sys.argv[1].strip()
@@ -178,15 +191,15 @@ if __name__ == "__main__":
 
     # Validate query
     if not query:
-        print(json.dumps({
+        write_json({
             "success": False,
             "message": "Search query cannot be empty",
             "data": []
-        }))
+        })
         sys.exit(1)
 
     # Search for students
     result = search_student_live(query, search_type)
 
     # Print the result as JSON
-    print(json.dumps(result))
+    write_json(result)
@@ -1,14 +1,48 @@
 #!/usr/bin/env python3
 
 import sys
-import json
 import logging
 from athena.api.google_api.directory import Directory
+from athena.utils.json_utils import write_json
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def suspend_user(user_key, reason=""):
+    """
+    Suspend a user and shape the result for the caller.
+
+    Args:
+        user_key (str): The user's email or unique ID.
+        reason (str): Optional suspension reason.
+
+    Returns:
+        dict: The result, with "success" and a "message".
+    """
+    # Initialize the Directory API
+    directory = Directory.get_instance()
+
+    # Suspend the user
+    result = directory.suspend_user(user_key, reason)
+
+    if "error" in result:
+        logger.error(f"Failed to suspend user {user_key}: {result['error']}")
+        return {
+            "success": False,
+            "error": result["error"],
+            "message": f"Failed to suspend user {user_key}"
+        }
+
+    logger.info(f"Successfully suspended user: {user_key}")
+    return {
+        "success": True,
+        "message": result.get("message", f"User {user_key} suspended successfully"),
+        "user": result.get("user"),
+        "user_key": user_key,
+        "reason": reason
+    }
+
 def main():
     try:
         # Check if we have the required arguments
@@ -18,7 +52,7 @@ def main():
                 "error": "Missing required argument: user_key",
                 "message": "Usage: python suspend_user.py <user_key> [reason]"
             }
-            print(json.dumps(result))
+            write_json(result)
             sys.exit(1)
 
         user_key = sys.argv[1]
@@ -28,30 +62,7 @@ def main():
         if reason:
             logger.info(f"Suspension reason: {reason}")
 
-        # Initialize the Directory API
-        directory = Directory()
-
-        # Suspend the user
-        result = directory.suspend_user(user_key, reason)
-
-        if "error" in result:
-            logger.error(f"Failed to suspend user {user_key}: {result['error']}")
-            output = {
-                "success": False,
-                "error": result["error"],
-                "message": f"Failed to suspend user {user_key}"
-            }
-        else:
-            logger.info(f"Successfully suspended user: {user_key}")
-            output = {
-                "success": True,
-                "message": result.get("message", f"User {user_key} suspended successfully"),
-                "user": result.get("user"),
-                "user_key": user_key,
-                "reason": reason
-            }
-
-        print(json.dumps(output))
+        write_json(suspend_user(user_key, reason))
 
     except Exception as e:
         logger.error(f"Error suspending user: {str(e)}")
@@ -60,7 +71,7 @@ def main():
             "error": str(e),
             "message": "An unexpected error occurred while suspending the user"
         }
-        print(json.dumps(result))
+        write_json(result)
         sys.exit(1)
 
 if __name__ == "__main__":
@@ -5,107 +5,445 @@ Script to sync Chromebook devices from Google Admin API to the database using At
 
 import sys
 import os
-import json
 import logging
-import psycopg2
-from psycopg2.extras import RealDictCursor
+import queue
+import threading
+from psycopg2.extras import Json
 from datetime import datetime
-import hashlib
 import time
 
-# Add the parent directory to the path so we can import from athena
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+# Add the parent directory to the path so we can import from athena, unless PYTHONPATH already does
+_ATHENA_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
+if _ATHENA_ROOT not in sys.path:
+    sys.path.insert(0, _ATHENA_ROOT)
 
 # Import Athena modules
 from athena.api.google_api.devices import Devices
+from athena.utils.copy_utils import copy_buffer
+from athena.utils.db_utils import get_db_connection, release_db_connection
+from athena.utils.json_utils import dumps, write_json
+
+# Database host used when DB_HOST is not set
+DEFAULT_DB_HOST = 'localhost'
+
+# Rows written per statement batch and transaction
+WRITE_BATCH_SIZE = 500
+
+# Columns written by the sync, in the order of device_data in sync_chromebooks
+SYNC_COLUMNS = (
+    'asset_tag', 'serial_number', 'model', 'org_unit', 'status', 'is_insured', 'assigned_location',
+    'device_id', 'last_sync', 'platform_version', 'os_version', 'firmware_version', 'mac_address',
+    'last_known_network', 'last_known_user', 'annotated_user', 'annotated_asset_id', 'recent_users',
+    'org_unit_path', 'notes', 'boot_mode', 'last_enrollment_time', 'support_end_date', 'order_number',
+    'will_auto_renew', 'meid', 'etag', 'active_time_ranges', 'cpu_status_reports', 'disk_volume_reports',
+    'system_ram_total', 'system_ram_free_reports'
+)
+
+# Columns preloaded for existing devices, read back as plain tuples
+EXISTING_COLUMNS = ('id', 'current_user_id', 'status_source') + SYNC_COLUMNS
+EXISTING_INDEX = {column: index for index, column in enumerate(EXISTING_COLUMNS)}
+_SERIAL_NUMBER = EXISTING_INDEX['serial_number']
+_ASSET_TAG = EXISTING_INDEX['asset_tag']
+_STATUS = EXISTING_INDEX['status']
+_STATUS_SOURCE = EXISTING_INDEX['status_source']
+
+# Google device status -> database status; anything else maps to 'available'
+STATUS_MAP = {
+    'ACTIVE': 'available',
+    'DEPROVISIONED': 'deprovisioned',
+    'DISABLED': 'disabled',
+    'UNKNOWN': 'available'
+}
+
+# Protected statuses that should never have their status overwritten by Google sync
+PROTECTED_STATUSES = frozenset(('checked_out', 'pending_signature'))
+
+# Columns preserved on update, by kind of existing device
+EXCLUDED_COLUMNS = {
+    'google': (),
+    'protected': ('status', 'current_user_id', 'checked_out_date', 'status_source', 'status_override_date'),
+    'local': ('status', 'status_source', 'status_override_date', 'is_insured')
+}
+
+# Columns each kind of existing device takes from Google
+UPDATE_FIELDS = {
+    kind: [column for column in SYNC_COLUMNS if column not in excluded]
+    for kind, excluded in EXCLUDED_COLUMNS.items()
+}
+
+# Rows are staged with COPY in a per-transaction temp table, then merged in one statement
+CREATE_STAGE_QUERY = f"""
+    CREATE TEMP TABLE chromebooks_sync_stage ON COMMIT DROP AS
+    SELECT {', '.join(SYNC_COLUMNS)} FROM chromebooks WITH NO DATA
+"""
+COPY_STAGE_QUERY = f"COPY chromebooks_sync_stage ({', '.join(SYNC_COLUMNS)}) FROM STDIN"
+
+# The EXCLUDED_COLUMNS rules, applied against the row as it is when the merge runs
+_PROTECTED_LIST = ', '.join(f"'{status}'" for status in sorted(PROTECTED_STATUSES))
+_MERGE_RULES = {
+    'asset_tag': "chromebooks.asset_tag",  # Keep existing asset tag for updates
+    'status': f"""CASE WHEN chromebooks.status IN ({_PROTECTED_LIST}) OR chromebooks.status_source = 'local'
+                  THEN chromebooks.status ELSE EXCLUDED.status END""",
+    'is_insured': f"""CASE WHEN chromebooks.status_source = 'local' AND chromebooks.status NOT IN ({_PROTECTED_LIST})
+                      THEN chromebooks.is_insured ELSE EXCLUDED.is_insured END"""
+}
+_MERGE_SET = ', '.join(
+    f"{column} = {_MERGE_RULES.get(column, f'EXCLUDED.{column}')}"
+    for column in SYNC_COLUMNS if column != 'serial_number'
+)
+MERGE_STAGE_QUERY = f"""
+    INSERT INTO chromebooks ({', '.join(SYNC_COLUMNS)})
+    SELECT {', '.join(SYNC_COLUMNS)} FROM chromebooks_sync_stage
+    ON CONFLICT (serial_number) DO UPDATE
+    SET {_MERGE_SET}, updated_at = CURRENT_TIMESTAMP
+"""
 
-def get_db_connection():
+def upsert_rows(cursor, rows):
     """
-    Get a connection to the PostgreSQL database.
+    Insert or update chromebooks rows with a single COPY and merge.
 
-    Returns:
-        connection: A PostgreSQL database connection.
+    Args:
+        cursor: Database cursor, inside an open transaction
+        rows: List of value tuples in SYNC_COLUMNS order
     """
-    # Get database connection parameters from environment variables
-    db_host = os.environ.get('DB_HOST', 'localhost')
-    db_port = os.environ.get('DB_PORT', '5432')
-    db_name = os.environ.get('DB_NAME', 'chromebook_library')
-    db_user = os.environ.get('DB_USER', 'postgres')
-    db_password = os.environ.get('DB_PASSWORD', 'password')
-
-    # Connect to the database
-    conn = psycopg2.connect(
-        host=db_host,
-        port=db_port,
-        dbname=db_name,
-        user=db_user,
-        password=db_password
-    )
+    cursor.execute(CREATE_STAGE_QUERY)
+    cursor.copy_expert(COPY_STAGE_QUERY, copy_buffer(rows))
+    cursor.execute(MERGE_STAGE_QUERY)
+    cursor.execute("DROP TABLE chromebooks_sync_stage")  # Free the name for the next call in this transaction
+
+def _json_value(value):
+    return value.adapted
+
+def _parse_timestamp(value):
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+# How a synced value reads back from the database, for columns that are not stored as given
+COLUMN_READERS = {
+    'last_sync': lambda value: _parse_timestamp(value).replace(tzinfo=None),  # TIMESTAMP drops the offset
+    'last_enrollment_time': _parse_timestamp,
+    'support_end_date': lambda value: _parse_timestamp(value).date(),
+    'system_ram_total': int,
+    'last_known_network': _json_value,
+    'recent_users': _json_value,
+    'active_time_ranges': _json_value,
+    'cpu_status_reports': _json_value,
+    'disk_volume_reports': _json_value,
+    'system_ram_free_reports': _json_value
+}
+
+def is_unchanged(existing_device, device_data, fields):
+    """
+    Check whether writing device_data would leave the stored row as it is.
 
-    return conn
+    Args:
+        existing_device: The row loaded from the database, in EXISTING_COLUMNS order
+        device_data: The values the sync would write
+        fields: The columns the update writes
 
-def generate_unique_asset_tag(device, cursor):
+    Returns:
+        bool: True if every written column already holds the synced value
+    """
+    try:
+        for key in fields:
+            value = device_data[key]
+            if value is not None and key in COLUMN_READERS:
+                value = COLUMN_READERS[key](value)
+            if existing_device[EXISTING_INDEX[key]] != value:
+                return False
+    except (ValueError, TypeError, KeyError, AttributeError):
+        # Anything we cannot compare is written as before
+        return False
+    return True
+
+def generate_unique_asset_tag(device, existing_asset_tags):
     """
     Generate a unique asset tag for a device.
 
     Args:
         device: The device data from Google API
-        cursor: Database cursor to check for existing tags
+        existing_asset_tags: Set of asset tags already in the database; the chosen tag is added to it
 
     Returns:
         str: A unique asset tag
     """
-    # First try the annotated asset ID from Google
-    if device.get('annotatedAssetId'):
-        asset_tag = device['annotatedAssetId']
-        cursor.execute("SELECT id FROM chromebooks WHERE asset_tag = %s", (asset_tag,))
-        if not cursor.fetchone():
-            return asset_tag
-
-    # If that doesn't work, try serial number based tag
     serial_number = device.get('serialNumber', '')
-    if serial_number:
-        asset_tag = serial_number
-        cursor.execute("SELECT id FROM chromebooks WHERE asset_tag = %s", (asset_tag,))
-        if not cursor.fetchone():
-            return asset_tag
-
-    # If still not unique, use device ID
     device_id = device.get('deviceId', '')
-    if device_id:
-        asset_tag = device_id[-8:]
-        cursor.execute("SELECT id FROM chromebooks WHERE asset_tag = %s", (asset_tag,))
-        if not cursor.fetchone():
-            return asset_tag
 
-    # Last resort: use a hash of the serial number + device ID
-    unique_string = f"{serial_number}-{device_id}"
-    hash_suffix = hashlib.md5(unique_string.encode()).hexdigest()[:8]
-    asset_tag = f"CB-{hash_suffix}"
+    # Try the annotated asset ID from Google, then the serial number, then the device ID
+    for asset_tag in (device.get('annotatedAssetId'), serial_number, device_id[-8:]):
+        if asset_tag and asset_tag not in existing_asset_tags:
+            existing_asset_tags.add(asset_tag)
+            return asset_tag
 
-    # Check if this hash-based tag is unique, if not add a counter
+    # Last resort: a CB- tag from the device ID or serial number, with a counter until unique
+    base_tag = f"CB-{device_id[-8:] or serial_number[-8:] or 'X'}"
+    asset_tag = base_tag
     counter = 1
-    original_tag = asset_tag
-    while True:
-        cursor.execute("SELECT id FROM chromebooks WHERE asset_tag = %s", (asset_tag,))
-        if not cursor.fetchone():
-            return asset_tag
-        asset_tag = f"{original_tag}-{counter}"
+    while asset_tag in existing_asset_tags:
+        asset_tag = f"{base_tag}-{counter}"
         counter += 1
-        if counter > 1000:  # Safety break
-            break
 
+    existing_asset_tags.add(asset_tag)
     return asset_tag
 
+def write_in_batches(conn, cursor, rows, write, label):
+    """
+    Write rows in committed batches, retrying a failed batch one row at a time.
+
+    Args:
+        conn: Database connection (not in autocommit mode)
+        cursor: Cursor on conn, used for savepoints
+        rows: List of (serial_number, values) tuples
+        write: Callable taking a list of values tuples and executing them
+        label: Verb used in progress logs, e.g. 'Created'
+
+    Returns:
+        tuple: (number of rows written, number of rows that failed)
+    """
+    written = 0
+    errors = 0
+    write_start = time.monotonic()
+
+    for start in range(0, len(rows), WRITE_BATCH_SIZE):
+        batch = rows[start:start + WRITE_BATCH_SIZE]
+        try:
+            # Don't wait for the WAL flush at each batch commit; after a crash the next sync rewrites the rows from Google
+            cursor.execute("SET LOCAL synchronous_commit = OFF")
+            write([values for _, values in batch])
+            conn.commit()
+            written += len(batch)
+        except Exception as e:
+            conn.rollback()
+            logging.warning(f"Batch of {len(batch)} devices failed ({str(e)}), retrying one at a time")
+
+            # Isolate the failing rows with savepoints so the rest of the batch is still written in one commit
+            cursor.execute("SET LOCAL synchronous_commit = OFF")
+            for serial_number, values in batch:
+                cursor.execute("SAVEPOINT sync_row")
+                try:
+                    write([values])
+                    cursor.execute("RELEASE SAVEPOINT sync_row")
+                    written += 1
+                except Exception as e:
+                    cursor.execute("ROLLBACK TO SAVEPOINT sync_row")
+                    logging.error(f"Error processing device {serial_number}: {str(e)}")
+                    errors += 1
+            conn.commit()
+
+        elapsed_time = time.monotonic() - write_start
+        rate = round(written / elapsed_time, 1) if elapsed_time > 0 else 0
+        logging.info(f"{label} {written}/{len(rows)} devices... ({rate} devices/sec)")
+
+    return written, errors
+
+def prefetch(iterable, depth=4):
+    """
+    Iterate over iterable in a background thread, keeping up to depth items ready.
+
+    Lets the Google API fetch of the next pages overlap with writing the current
+    one. Exceptions raised by iterable are re-raised in the caller. If the caller
+    stops early (or closes this generator), the producer thread is told to stop,
+    closes iterable and exits instead of blocking on a full queue forever.
+
+    Args:
+        iterable: The iterable to consume, e.g. a page generator
+        depth: Maximum number of items fetched ahead of the caller
+
+    Yields:
+        The items of iterable, in order
+    """
+    buffer = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    done = object()
+
+    def put(entry):
+        # Wait for room, giving up once the consumer has gone away
+        while not stop.is_set():
+            try:
+                buffer.put(entry, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put((item, None)):
+                    return
+            put((done, None))
+        except Exception as e:
+            put((None, e))
+        finally:
+            # Closed here, in the thread that runs it; a generator can't be closed from another thread mid-step
+            close = getattr(iterable, 'close', None)
+            if close is not None:
+                close()
+
+    threading.Thread(target=produce, daemon=True).start()
+    try:
+        while True:
+            item, error = buffer.get()
+            if error is not None:
+                raise error
+            if item is done:
+                return
+            yield item
+    finally:
+        stop.set()
+        # Drop anything already fetched so the pages can be freed
+        while True:
+            try:
+                buffer.get_nowait()
+            except queue.Empty:
+                break
+
+def sort_devices(google_devices, existing_by_serial, existing_asset_tags, new_asset_tags, stats):
+    """
+    Map a page of Google devices to chromebooks rows, without touching the database.
+
+    Args:
+        google_devices: Devices from the Google Admin API
+        existing_by_serial: Existing chromebooks rows keyed by serial number
+        existing_asset_tags: Set of asset tags in use; new tags are added to it
+        new_asset_tags: Asset tags given to devices created earlier in this sync, by serial number
+        stats: Sync statistics, updated in place
+
+    Returns:
+        tuple: (rows to insert, rows to update), each keyed by serial number
+    """
+    to_insert = {}
+    to_update = {}
+    protected_serials = []
+    status_for = STATUS_MAP.get  # map_status without the call overhead
+    for device in google_devices:
+        device_serial = device.get('serialNumber', 'Unknown')
+
+        try:
+            # Check if the device already exists in the database
+            existing_device = existing_by_serial.get(device_serial)
+
+            # Map Google device data to database fields with safe defaults
+            serial_number = device_serial if device_serial != 'Unknown' else f"UNKNOWN-{device.get('deviceId', 'NO-ID')}"
+            seen_before = serial_number in new_asset_tags
+
+            # Generate unique asset tag
+            if existing_device:
+                # Keep existing asset tag for updates
+                asset_tag = existing_device[_ASSET_TAG]
+            elif seen_before:
+                # Same serial seen earlier in this sync: keep its tag and take the newer data
+                asset_tag = new_asset_tags[serial_number]
+            else:
+                # Generate new unique asset tag for new devices
+                asset_tag = new_asset_tags[serial_number] = generate_unique_asset_tag(device, existing_asset_tags)
+
+            # Determine status - respect status_source priority
+            if existing_device and existing_device[_STATUS_SOURCE] == 'local':
+                # Preserve local status (checked-out, maintenance set locally)
+                final_status = existing_device[_STATUS]
+            else:
+                # Use Google status for devices with 'google' status_source or new devices
+                final_status = status_for(device.get('status'), 'available')
+
+            org_unit_path = device.get('orgUnitPath')
+            ou_path = org_unit_path or '/'
+
+            device_data = {
+                'asset_tag': asset_tag,
+                'serial_number': serial_number,
+                'model': device.get('model') or 'Unknown',
+                'org_unit': ou_path,
+                'status': final_status,
+                'is_insured': False,  # Default to False, do not override local values
+                'assigned_location': ou_path.rpartition('/')[2] or 'Unknown',
+                # Google Admin specific fields
+                'device_id': device.get('deviceId'),
+                'last_sync': device.get('lastSync'),
+                'platform_version': device.get('platformVersion'),
+                'os_version': device.get('osVersion'),
+                'firmware_version': device.get('firmwareVersion'),
+                'mac_address': device.get('macAddress'),
+                'last_known_network': Json(device.get('lastKnownNetwork'), dumps=dumps) if device.get('lastKnownNetwork') else None,
+                'last_known_user': device.get('annotatedUser'),
+                # New Google API fields
+                'annotated_user': device.get('annotatedUser'),
+                'annotated_asset_id': device.get('annotatedAssetId'),
+                'recent_users': Json(device.get('recentUsers'), dumps=dumps) if device.get('recentUsers') else None,
+                'org_unit_path': org_unit_path,
+                # Additional Google API fields from migration
+                'notes': device.get('notes'),
+                'boot_mode': device.get('bootMode'),
+                'last_enrollment_time': device.get('lastEnrollmentTime'),
+                'support_end_date': device.get('supportEndDate'),
+                'order_number': device.get('orderNumber'),
+                'will_auto_renew': device.get('willAutoRenew'),
+                'meid': device.get('meid'),
+                'etag': device.get('etag'),
+                'active_time_ranges': Json(device.get('activeTimeRanges'), dumps=dumps) if device.get('activeTimeRanges') else None,
+                'cpu_status_reports': Json(device.get('cpuStatusReports'), dumps=dumps) if device.get('cpuStatusReports') else None,
+                'disk_volume_reports': Json(device.get('diskVolumeReports'), dumps=dumps) if device.get('diskVolumeReports') else None,
+                'system_ram_total': device.get('systemRamTotal'),
+                'system_ram_free_reports': Json(device.get('systemRamFreeReports'), dumps=dumps) if device.get('systemRamFreeReports') else None
+            }
+
+            if existing_device:
+                # Always protect status field for checked-out/pending devices regardless of status_source
+                if existing_device[_STATUS] in PROTECTED_STATUSES:
+                    kind = 'protected'
+                    stats["protected"] += 1
+                    protected_serials.append(device_serial)
+
+                # Additional protection for devices with local status source (legacy protection)
+                elif existing_device[_STATUS_SOURCE] == 'local':
+                    kind = 'local'
+
+                else:
+                    kind = 'google'
+
+                # Skip devices whose stored row already matches Google
+                if is_unchanged(existing_device, device_data, UPDATE_FIELDS[kind]):
+                    stats["unchanged"] += 1
+                    continue
+
+                if serial_number in to_update:
+                    stats["updated"] += 1
+                to_update[serial_number] = device_data
+            elif not seen_before:
+                to_insert[serial_number] = device_data
+            elif serial_number in to_insert:
+                # Duplicate in this page: the newer data replaces the queued insert
+                stats["updated"] += 1
+                to_insert[serial_number] = device_data
+            else:
+                # Duplicate of a device created from an earlier page
+                to_update[serial_number] = device_data
+
+        except Exception as e:
+            error_msg = f"Error processing device {device_serial}: {str(e)}"
+            logging.error(error_msg)
+            stats["errors"] += 1
+
+    if protected_serials:
+        logging.info(
+            "🔒 Protecting checkout status for %d devices: %s%s",
+            len(protected_serials), ', '.join(protected_serials[:20]), ', ...' if len(protected_serials) > 20 else ''
+        )
+
+    return to_insert, to_update
+
 def sync_chromebooks():
     """
     Sync Chromebook devices from Google Admin API to the database.
 
+    Devices are fetched one API page at a time and each page is written before
+    the next is requested, so memory stays bounded by the page size.
+
     Returns:
         dict: A dictionary containing the results or error message.
     """
     # Performance tracking
-    start_time = time.time()
+    start_time = time.monotonic()
     perf_stats = {
         'start_time': datetime.now().isoformat(),
         'google_api_fetch_time': 0,
@@ -115,60 +453,39 @@ def sync_chromebooks():
         'devices_per_second': 0
     }
 
+    conn = None
+    pages = None
     try:
         logging.info("Starting Chromebook sync process...")
 
-        # Track Google API fetch time
-        api_start = time.time()
-        logging.info("Fetching devices from Google Admin API...")
-
-        # Initialize the Devices class
-        devices = Devices.get_instance()
-
-        # Fetch all devices using the new list_all_devices method
-        # Increase recent_users_limit to get all recent users
-        results = devices.list_all_devices(
-            batch_size=500,
-            recent_users_limit=100,  # Get up to 100 recent users per device
-            formatted=False,
-            include_null=False
-        )
-
-        api_end = time.time()
-        perf_stats['google_api_fetch_time'] = round(api_end - api_start, 2)
-        logging.info(f"Google API fetch completed in {perf_stats['google_api_fetch_time']} seconds")
-
-        # Check if there was an error in the results
-        if 'error' in results:
-            return {
-                "success": False,
-                "message": f"Error from Google API: {results['error']}",
-                "data": {},
-                "performance": perf_stats
-            }
-
-        # Extract the devices from the results
-        google_devices = results.get('devices', [])
-        logging.info(f"Retrieved {len(google_devices)} devices from Google Admin API")
-
         # Track database connection time
-        db_start = time.time()
+        db_start = time.monotonic()
         logging.info("Connecting to database...")
 
         # Connect to the database
-        conn = get_db_connection()
+        conn = get_db_connection(DEFAULT_DB_HOST)
 
-        # Set autocommit to handle individual transactions
-        conn.autocommit = True
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
+        # Writes are committed explicitly, once per batch
+        conn.autocommit = False
+        cursor = conn.cursor()
 
-        db_end = time.time()
+        db_end = time.monotonic()
         perf_stats['db_connection_time'] = round(db_end - db_start, 2)
         logging.info(f"Database connection established in {perf_stats['db_connection_time']} seconds")
 
+        # Load every existing device once instead of querying per device
+        # Every synced column is loaded so unchanged devices can be skipped
+        cursor.execute(
+            f"SELECT {', '.join(EXISTING_COLUMNS)} FROM chromebooks"
+        )
+        existing_by_serial = {row[_SERIAL_NUMBER]: row for row in cursor.fetchall()}
+        existing_asset_tags = {row[_ASSET_TAG] for row in existing_by_serial.values()}
+        conn.commit()  # End the read transaction
+        new_asset_tags = {}
+
         # Statistics
         stats = {
-            "total": len(google_devices),
+            "total": 0,
             "created": 0,
             "updated": 0,
             "unchanged": 0,
@@ -176,199 +493,77 @@ def sync_chromebooks():
             "protected": 0
         }
 
-        # Track processing time
-        processing_start = time.time()
-        logging.info(f"Processing {len(google_devices)} devices...")
+        logging.info("Fetching devices from Google Admin API...")
 
-        # Process each device with individual transaction handling
-        device_count = 0
-        for device in google_devices:
-            device_start = time.time()
-            device_count += 1
-            device_serial = device.get('serialNumber', 'Unknown')
-            device_model = device.get('model', 'Unknown')
-            device_status = device.get('status', 'Unknown')
+        # Initialize the Devices class
+        devices = Devices.get_instance()
 
+        # Every device under /Chromebooks, with up to 100 recent users each, as the API returns them.
+        # Pages are fetched in a background thread while earlier ones are written.
+        pages = prefetch(devices.iter_device_pages_by_ou(
+            '/Chromebooks',
+            batch_size=500,
+            recent_users_limit=100,
+            include_children=True,
+            raw=True
+        ))
+
+        google_api_fetch_time = 0
+        processing_time = 0
+        while True:
+            # Track time spent waiting on the Google API
+            api_start = time.monotonic()
             try:
-                # Start a new transaction for this device
-                conn.autocommit = False
-
-                # Check if the device already exists in the database
-                cursor.execute(
-                    "SELECT id, asset_tag, status, current_user_id, status_source FROM chromebooks WHERE serial_number = %s",
-                    (device_serial,)
-                )
-                existing_device = cursor.fetchone()
-
-                # Map Google device data to database fields with safe defaults
-                serial_number = device_serial if device_serial != 'Unknown' else f"UNKNOWN-{device.get('deviceId', 'NO-ID')}"
-
-                # Generate unique asset tag
-                if existing_device:
-                    # Keep existing asset tag for updates
-                    asset_tag = existing_device['asset_tag']
-                    action = "update"
-                else:
-                    # Generate new unique asset tag for new devices
-                    asset_tag = generate_unique_asset_tag(device, cursor)
-                    action = "create"
-
-                # Determine status - respect status_source priority
-                if existing_device and existing_device.get('status_source') == 'local':
-                    # Preserve local status (checked-out, maintenance set locally)
-                    final_status = existing_device['status']
-                else:
-                    # Use Google status for devices with 'google' status_source or new devices
-                    final_status = map_status(device.get('status'))
-
-                device_data = {
-                    'asset_tag': asset_tag,
-                    'serial_number': serial_number,
-                    'model': device.get('model') or 'Unknown',
-                    'org_unit': device.get('orgUnitPath') or '/',
-                    'status': final_status,
-                    'is_insured': False,  # Default to False, do not override local values
-                    'assigned_location': (device.get('orgUnitPath') or '/').split('/')[-1] or 'Unknown',
-                    # Google Admin specific fields
-                    'device_id': device.get('deviceId'),
-                    'last_sync': device.get('lastSync'),
-                    'platform_version': device.get('platformVersion'),
-                    'os_version': device.get('osVersion'),
-                    'firmware_version': device.get('firmwareVersion'),
-                    'mac_address': device.get('macAddress'),
-                    'last_known_network': json.dumps(device.get('lastKnownNetwork')) if device.get('lastKnownNetwork') else None,
-                    'last_known_user': device.get('annotatedUser'),
-                    # New Google API fields
-                    'annotated_user': device.get('annotatedUser'),
-                    'annotated_asset_id': device.get('annotatedAssetId'),
-                    'recent_users': json.dumps(device.get('recentUsers')) if device.get('recentUsers') else None,
-                    'org_unit_path': device.get('orgUnitPath'),
-                    # Additional Google API fields from migration
-                    'notes': device.get('notes'),
-                    'boot_mode': device.get('bootMode'),
-                    'last_enrollment_time': device.get('lastEnrollmentTime'),
-                    'support_end_date': device.get('supportEndDate'),
-                    'order_number': device.get('orderNumber'),
-                    'will_auto_renew': device.get('willAutoRenew'),
-                    'meid': device.get('meid'),
-                    'etag': device.get('etag'),
-                    'active_time_ranges': json.dumps(device.get('activeTimeRanges')) if device.get('activeTimeRanges') else None,
-                    'cpu_status_reports': json.dumps(device.get('cpuStatusReports')) if device.get('cpuStatusReports') else None,
-                    'disk_volume_reports': json.dumps(device.get('diskVolumeReports')) if device.get('diskVolumeReports') else None,
-                    'system_ram_total': device.get('systemRamTotal'),
-                    'system_ram_free_reports': json.dumps(device.get('systemRamFreeReports')) if device.get('systemRamFreeReports') else None
+                google_devices = next(pages, None)
+            except Exception as e:
+                perf_stats['google_api_fetch_time'] = round(google_api_fetch_time + time.monotonic() - api_start, 2)
+                logging.exception("Error fetching devices from Google Admin API")
+                return {
+                    "success": False,
+                    "message": f"Error from Google API: {str(e)}",
+                    "data": stats,
+                    "performance": perf_stats
                 }
+            google_api_fetch_time += time.monotonic() - api_start
+
+            if google_devices is None:
+                break
+            stats["total"] += len(google_devices)
+
+            # Track processing time
+            processing_start = time.monotonic()
+            logging.info(f"Processing {len(google_devices)} devices ({stats['total']} so far)...")
+
+            to_insert, to_update = sort_devices(google_devices, existing_by_serial, existing_asset_tags, new_asset_tags, stats)
+
+            # Write the page in a few large batches instead of one statement and commit per device
+            for label, pending, stat in (('Created', to_insert, "created"), ('Updated', to_update, "updated")):
+                written, errors = write_in_batches(
+                    conn,
+                    cursor,
+                    [(serial_number, tuple(data[key] for key in SYNC_COLUMNS)) for serial_number, data in pending.items()],
+                    lambda rows: upsert_rows(cursor, rows),
+                    label
+                )
+                stats[stat] += written
+                stats["errors"] += errors
 
-                if existing_device:
-                    # For existing devices, exclude fields that should be preserved locally
-                    excluded_fields = []
-
-                    # Protected statuses that should never have their status overwritten by Google sync
-                    PROTECTED_STATUSES = ['checked_out', 'pending_signature']
-
-                    # Always protect status field for checked-out/pending devices regardless of status_source
-                    if existing_device['status'] in PROTECTED_STATUSES:
-                        excluded_fields.extend(['status', 'current_user_id', 'checked_out_date', 'status_source', 'status_override_date'])
-                        stats["protected"] += 1
-                        logging.info(f"🔒 Protecting checkout status for device {device_serial} (status: {existing_device['status']})")
-
-                    # Additional protection for devices with local status source (legacy protection)
-                    elif existing_device.get('status_source') == 'local':
-                        excluded_fields.extend(['status', 'status_source', 'status_override_date', 'is_insured'])
-
-                        # If device is checked out or pending, also preserve checkout-related fields
-                        if existing_device['status'] in ('checked_out', 'pending_signature'):
-                            excluded_fields.extend(['current_user_id', 'checked_out_date'])
-
-                    # Update existing device
-                    update_fields = []
-                    update_values = []
-
-                    for key, value in device_data.items():
-                        if key not in excluded_fields:
-                            update_fields.append(f"{key} = %s")
-                            update_values.append(value)
-
-                    # Add the device ID to the values
-                    update_values.append(existing_device['id'])
-
-                    # Build and execute the update query
-                    update_query = f"""
-                        UPDATE chromebooks
-                        SET {', '.join(update_fields)}, updated_at = CURRENT_TIMESTAMP
-                        WHERE id = %s
-                        RETURNING id
-                    """
-
-                    cursor.execute(update_query, update_values)
-                    updated_device = cursor.fetchone()
-
-                    if updated_device:
-                        stats["updated"] += 1
-                        result = "updated"
-                    else:
-                        stats["unchanged"] += 1
-                        result = "unchanged"
-                else:
-                    # Create new device
-                    insert_fields = list(device_data.keys())
-                    placeholders = ["%s"] * len(insert_fields)
-
-                    # Build and execute the insert query
-                    insert_query = f"""
-                        INSERT INTO chromebooks ({', '.join(insert_fields)})
-                        VALUES ({', '.join(placeholders)})
-                        RETURNING id
-                    """
-
-                    cursor.execute(insert_query, list(device_data.values()))
-                    new_device = cursor.fetchone()
-
-                    if new_device:
-                        stats["created"] += 1
-                        result = "created"
-                    else:
-                        stats["errors"] += 1
-                        result = "error"
-
-                # Commit this device's transaction
-                conn.commit()
-
-                # Track device processing time for performance metrics
-                device_end = time.time()
-                device_processing_time = round(device_end - device_start, 3)
-
-                # Log progress every 100 devices
-                if device_count % 100 == 0:
-                    elapsed_time = round(time.time() - processing_start, 1)
-                    rate = round(device_count / elapsed_time, 1) if elapsed_time > 0 else 0
-                    logging.info(f"Processed {device_count}/{len(google_devices)} devices... ({rate} devices/sec)")
-
-            except Exception as e:
-                # Rollback the failed transaction
-                conn.rollback()
-                error_msg = f"Error processing device {device_serial}: {str(e)}"
-                logging.error(error_msg)
-                stats["errors"] += 1
+            processing_time += time.monotonic() - processing_start
 
-            finally:
-                # Reset to autocommit for the next device
-                conn.autocommit = True
+        perf_stats['google_api_fetch_time'] = round(google_api_fetch_time, 2)
+        logging.info(f"Retrieved {stats['total']} devices from Google Admin API in {perf_stats['google_api_fetch_time']} seconds")
 
         # Calculate processing performance
-        processing_end = time.time()
-        perf_stats['processing_time'] = round(processing_end - processing_start, 2)
+        perf_stats['processing_time'] = round(processing_time, 2)
 
-        if len(google_devices) > 0:
-            perf_stats['avg_device_processing_time'] = round(perf_stats['processing_time'] / len(google_devices), 3)
-            perf_stats['devices_per_second'] = round(len(google_devices) / perf_stats['processing_time'], 2)
+        if stats["total"] > 0 and perf_stats['processing_time'] > 0:
+            perf_stats['avg_device_processing_time'] = round(perf_stats['processing_time'] / stats["total"], 3)
+            perf_stats['devices_per_second'] = round(stats["total"] / perf_stats['processing_time'], 2)
 
-        # Close the database connection
         cursor.close()
-        conn.close()
 
         # Calculate total time
-        total_time = time.time() - start_time
+        total_time = time.monotonic() - start_time
         perf_stats['total_time'] = round(total_time, 2)
         perf_stats['end_time'] = datetime.now().isoformat()
 
@@ -385,7 +580,7 @@ def sync_chromebooks():
             "performance": perf_stats
         }
     except Exception as e:
-        total_time = time.time() - start_time
+        total_time = time.monotonic() - start_time
         perf_stats['total_time'] = round(total_time, 2)
         perf_stats['end_time'] = datetime.now().isoformat()
 
@@ -396,6 +591,13 @@ def sync_chromebooks():
             "data": {},
             "performance": perf_stats
         }
+    finally:
+        # Stop the page prefetcher if the sync ended before reading every page
+        if pages is not None:
+            pages.close()
+        # Close the database connection, or hand it back to the pool
+        if conn is not None:
+            release_db_connection(conn)
 
 def map_status(google_status):
     """
@@ -407,14 +609,7 @@ def map_status(google_status):
     Returns:
         str: The corresponding status for the database.
     """
-    status_map = {
-        'ACTIVE': 'available',
-        'DEPROVISIONED': 'deprovisioned',
-        'DISABLED': 'disabled',
-        'UNKNOWN': 'available'
-    }
-
-    return status_map.get(google_status, 'available')
+    return STATUS_MAP.get(google_status, 'available')
 
 if __name__ == "__main__":
     # Configure logging with more detailed format
@@ -428,4 +623,4 @@ if __name__ == "__main__":
     result = sync_chromebooks()
 
     # Print the result as JSON
-    print(json.dumps(result, indent=2))
+    write_json(result, indent=True)
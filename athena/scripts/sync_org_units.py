@@ -5,36 +5,19 @@ Script to sync organizational units from Google Admin API to the database.
 
 import sys
 import os
-import json
 import logging
-import psycopg2
 from psycopg2.extras import execute_values
 
-# Add the parent directory to the path so we can import from athena
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+# Add the parent directory to the path so we can import from athena, unless PYTHONPATH already does
+_ATHENA_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
+if _ATHENA_ROOT not in sys.path:
+    sys.path.insert(0, _ATHENA_ROOT)
 
 # Import Athena modules
 from athena.api.google_api.devices import Devices
-
-def get_db_connection():
-    """
-    Get a connection to the PostgreSQL database.
-
-    Returns:
-        psycopg2.connection: A connection to the PostgreSQL database.
-    """
-    try:
-        conn = psycopg2.connect(
-            host=os.environ.get('DB_HOST', 'postgres'),
-            port=os.environ.get('DB_PORT', '5432'),
-            dbname=os.environ.get('DB_NAME', 'chromebook_library'),
-            user=os.environ.get('DB_USER', 'postgres'),
-            password=os.environ.get('DB_PASSWORD', 'password')
-        )
-        return conn
-    except Exception as e:
-        logging.error(f"Error connecting to database: {str(e)}")
-        raise
+from athena.utils.db_utils import get_db_connection, release_db_connection
+from athena.utils.json_utils import write_json
+from athena.utils.schema_utils import ensure_sync_schema
 
 def sync_org_units():
     """
@@ -43,6 +26,7 @@ def sync_org_units():
     Returns:
         dict: A dictionary containing the results or error message.
     """
+    conn = None
     try:
         # Initialize the Devices class
         devices = Devices.get_instance()
@@ -64,98 +48,41 @@ def sync_org_units():
 
         # Connect to the database
         conn = get_db_connection()
+
+        # Create the org_units table and its trigger on installations that predate them
+        ensure_sync_schema(conn, ('org_units',))
         cursor = conn.cursor()
 
-        # Create the org_units table if it doesn't exist
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS org_units (
-                id SERIAL PRIMARY KEY,
-                name VARCHAR(255) NOT NULL,
-                org_unit_path VARCHAR(255) NOT NULL UNIQUE,
-                parent_org_unit_path VARCHAR(255),
-                created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-
-        # Create a trigger to update the updated_at column
-        cursor.execute("""
-            CREATE OR REPLACE FUNCTION update_updated_at_column()
-            RETURNS TRIGGER AS $$
-            BEGIN
-                NEW.updated_at = CURRENT_TIMESTAMP;
-                RETURN NEW;
-            END;
-            $$ LANGUAGE plpgsql;
-        """)
-
-        # Create the trigger if it doesn't exist
-        cursor.execute("""
-            DO $$
-            BEGIN
-                IF NOT EXISTS (
-                    SELECT 1
-                    FROM pg_trigger
-                    WHERE tgname = 'update_org_units_updated_at'
-                ) THEN
-                    CREATE TRIGGER update_org_units_updated_at
-                    BEFORE UPDATE ON org_units
-                    FOR EACH ROW
-                    EXECUTE FUNCTION update_updated_at_column();
-                END IF;
-            END;
-            $$;
-        """)
-
-        # Prepare data for insertion/update
-        org_units_data = []
-        for ou in org_units:
-            org_units_data.append((
-                ou['name'],
-                ou['orgUnitPath'],
-                ou['parentOrgUnitPath']
-            ))
-
-        # Insert or update org_units
-        inserted_count = 0
-        updated_count = 0
-
-        for name, org_unit_path, parent_org_unit_path in org_units_data:
-            # Check if the org_unit already exists
-            cursor.execute(
-                "SELECT id FROM org_units WHERE org_unit_path = %s",
-                (org_unit_path,)
-            )
-            result = cursor.fetchone()
-
-            if result:
-                # Update existing org_unit
-                cursor.execute(
-                    """
-                    UPDATE org_units
-                    SET name = %s, parent_org_unit_path = %s, updated_at = CURRENT_TIMESTAMP
-                    WHERE org_unit_path = %s
-                    """,
-                    (name, parent_org_unit_path, org_unit_path)
-                )
-                updated_count += 1
-            else:
-                # Insert new org_unit
-                cursor.execute(
-                    """
-                    INSERT INTO org_units (name, org_unit_path, parent_org_unit_path)
-                    VALUES (%s, %s, %s)
-                    """,
-                    (name, org_unit_path, parent_org_unit_path)
-                )
-                inserted_count += 1
+        # Don't wait for the WAL flush at commit; after a crash the next sync simply rewrites the rows from Google
+        cursor.execute("SET LOCAL synchronous_commit = OFF")
+
+        # Prepare data for insertion/update, one row per path
+        org_units_data = list({
+            ou['orgUnitPath']: (ou['name'], ou['orgUnitPath'], ou['parentOrgUnitPath'])
+            for ou in org_units
+        }.values())
+
+        # Insert or update every org_unit in one statement; xmax = 0 marks rows that were inserted
+        results = execute_values(
+            cursor,
+            """
+            INSERT INTO org_units (name, org_unit_path, parent_org_unit_path)
+            VALUES %s
+            ON CONFLICT (org_unit_path) DO UPDATE
+            SET name = EXCLUDED.name, parent_org_unit_path = EXCLUDED.parent_org_unit_path, updated_at = CURRENT_TIMESTAMP
+            RETURNING (xmax = 0) AS inserted
+            """,
+            org_units_data,
+            page_size=1000,
+            fetch=True
+        )
+        inserted_count = sum(1 for (inserted,) in results if inserted)
+        updated_count = len(results) - inserted_count
 
         # Commit the transaction
         conn.commit()
 
-        # Close the cursor and connection
         cursor.close()
-        conn.close()
 
         return {
             "success": True,
@@ -177,6 +104,10 @@ def sync_org_units():
                 "updated_count": 0
             }
         }
+    finally:
+        # Close the database connection, or hand it back to the pool
+        if conn is not None:
+            release_db_connection(conn)
 
 if __name__ == "__main__":
     # Configure logging
@@ -186,4 +117,4 @@ if __name__ == "__main__":
     result = sync_org_units()
 
     # Print the result as JSON
-    print(json.dumps(result))
+    write_json(result)
@@ -5,54 +5,46 @@ Script to sync users from Google Admin API to the database.
 
 import sys
 import os
-import json
 import logging
-import psycopg2
-import re
 from psycopg2.extras import execute_values
 
-# Add the parent directory to the path so we can import from athena
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+# Add the parent directory to the path so we can import from athena, unless PYTHONPATH already does
+_ATHENA_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
+if _ATHENA_ROOT not in sys.path:
+    sys.path.insert(0, _ATHENA_ROOT)
 
 # Import Athena modules
 from athena.api.google_api.directory import Directory
-
-def extract_student_id_from_email(email):
-    """
-    Extract student ID from email address in format: firstname.studentid@domain
-
-    Args:
-        email (str): Email address like 'adam.156798@njesd.net'
-
-    Returns:
-        str: Student ID (e.g., '156798') or None if not found
+from athena.utils.copy_utils import CopyStream
+from athena.utils.db_utils import get_db_connection, release_db_connection
+from athena.utils.json_utils import dumps, write_json
+from athena.utils.schema_utils import ensure_sync_schema
+
+# google_users columns written by the sync, as named in the staging table
+USER_COLUMNS = (
+    'google_id', 'primary_email', 'first_name', 'last_name', 'full_name', 'org_unit_path',
+    'is_admin', 'is_suspended', 'student_id', 'creation_time', 'last_login_time'
+)
+
+def iter_user_documents(pages, counts):
     """
-    if not email:
-        return None
+    Serialize Google users to JSON documents for google_users_sync_raw as their pages arrive.
 
-    # Match pattern: anything.digits@domain
-    match = re.match(r'^[^.]+\.(\d+)@', email)
-    return match.group(1) if match else None
+    Field extraction happens in SQL once the documents are loaded, so each user
+    costs one JSON dump here rather than a dozen dict lookups.
 
-def get_db_connection():
-    """
-    Get a connection to the PostgreSQL database.
+    Args:
+        pages: Iterable of user pages from the Directory API.
+        counts (dict): Updated in place with the 'users' and 'api_calls' seen so far.
 
-    Returns:
-        psycopg2.connection: A connection to the PostgreSQL database.
+    Yields:
+        tuple: One single-column row per user.
     """
-    try:
-        conn = psycopg2.connect(
-            host=os.environ.get('DB_HOST', 'postgres'),
-            port=os.environ.get('DB_PORT', '5432'),
-            dbname=os.environ.get('DB_NAME', 'chromebook_library'),
-            user=os.environ.get('DB_USER', 'postgres'),
-            password=os.environ.get('DB_PASSWORD', 'password')
-        )
-        return conn
-    except Exception as e:
-        logging.error(f"Error connecting to database: {str(e)}")
-        raise
+    for users in pages:
+        counts['api_calls'] += 1
+        counts['users'] += len(users)
+        for user in users:
+            yield (dumps(user),)
 
 def sync_users(use_pagination=True, batch_size=500):
     """
@@ -65,23 +57,45 @@ def sync_users(use_pagination=True, batch_size=500):
     Returns:
         dict: A dictionary containing the results or error message.
     """
+    conn = None
     try:
         # Initialize the Directory class
         directory = Directory()
 
-        # Fetch users from Google Admin API with organizational units
+        # Fetch users from Google Admin API with organizational units; pages are fetched as the COPY reads them
         if use_pagination:
             logging.info("🔄 Fetching ALL users with organizational units using pagination...")
-            results = directory.list_all_users_with_ou(batch_size=batch_size)
+            pages = directory.iter_user_pages_with_ou(batch_size=batch_size)
         else:
             logging.info(f"🔄 Fetching up to {batch_size} users with organizational units (no pagination)...")
-            results = directory.list_users(max_results=batch_size)
+            pages = [directory.list_users(max_results=batch_size).get('users', [])]
+
+        # Connect to the database
+        conn = get_db_connection()
+
+        # Create the synced tables, student_id column/index and trigger on installations that predate them
+        ensure_sync_schema(conn, ('google_users', 'students'))
+        cursor = conn.cursor()
+
+        # Don't wait for the WAL flush at commit; after a crash the next sync simply rewrites the rows from Google
+        cursor.execute("SET LOCAL synchronous_commit = OFF")
 
-        users = results.get('users', [])
-        api_calls = results.get('api_calls', 1)
-        total_users = results.get('total_users', len(users))
+        logging.info("💾 Streaming users into the database...")
 
-        if not users:
+        # Load every user's JSON into a temp table with one COPY, then sync with set-based statements
+        cursor.execute("CREATE TEMP TABLE google_users_sync_raw (doc JSONB) ON COMMIT DROP")
+        # The COPY lasts as long as the Google fetch, so it is exempt from the statement timeout
+        cursor.execute("SET LOCAL statement_timeout = 0")
+        counts = {'users': 0, 'api_calls': 0}
+        cursor.copy_expert(
+            "COPY google_users_sync_raw (doc) FROM STDIN",
+            CopyStream(iter_user_documents(pages, counts))
+        )
+        cursor.execute("RESET statement_timeout")
+        users_count = counts['users']
+        api_calls = counts['api_calls']
+
+        if not users_count:
             return {
                 "success": False,
                 "message": "No users found in Google Admin API",
@@ -93,203 +107,95 @@ def sync_users(use_pagination=True, batch_size=500):
                 }
             }
 
-        logging.info(f"📊 Retrieved {total_users} users in {api_calls} API calls")
-
-        # Connect to the database
-        conn = get_db_connection()
-        cursor = conn.cursor()
+        logging.info(f"📊 Retrieved {users_count} users in {api_calls} API calls")
 
-        # Create the users table if it doesn't exist
+        # Extract the synced fields in one pass, skipping users without an id or primary email.
+        # The student ID comes from 'firstname.studentid@domain' addresses. A later duplicate of a
+        # google_id replaces the earlier one; ctid follows COPY order in a fresh table.
         cursor.execute("""
-            CREATE TABLE IF NOT EXISTS google_users (
-                id SERIAL PRIMARY KEY,
-                google_id VARCHAR(255) NOT NULL UNIQUE,
-                primary_email VARCHAR(255) NOT NULL UNIQUE,
-                first_name VARCHAR(255),
-                last_name VARCHAR(255),
-                full_name VARCHAR(255),
-                org_unit_path VARCHAR(255),
-                is_admin BOOLEAN DEFAULT FALSE,
-                is_suspended BOOLEAN DEFAULT FALSE,
-                student_id VARCHAR(50),
-                creation_time TIMESTAMP WITH TIME ZONE,
-                last_login_time TIMESTAMP WITH TIME ZONE,
-                created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
-            )
+            CREATE TEMP TABLE google_users_sync_stage ON COMMIT DROP AS
+            SELECT DISTINCT ON (doc->>'id')
+                doc->>'id' AS google_id,
+                doc->>'primaryEmail' AS primary_email,
+                doc->'name'->>'givenName' AS first_name,
+                doc->'name'->>'familyName' AS last_name,
+                doc->'name'->>'fullName' AS full_name,
+                doc->>'orgUnitPath' AS org_unit_path,
+                COALESCE((doc->>'isAdmin')::boolean, FALSE) AS is_admin,
+                COALESCE((doc->>'suspended')::boolean, FALSE) AS is_suspended,
+                substring(doc->>'primaryEmail' from '^[^.@]+\\.([0-9]+)@') AS student_id,
+                (doc->>'creationTime')::timestamptz AS creation_time,
+                (doc->>'lastLoginTime')::timestamptz AS last_login_time
+            FROM google_users_sync_raw
+            WHERE doc->>'id' <> '' AND doc->>'primaryEmail' <> ''
+            ORDER BY doc->>'id', ctid DESC
         """)
 
-        # Add student_id column if it doesn't exist (for existing installations)
+        # Auto-create student records for student IDs that have none; existing students are left as they are
         cursor.execute("""
-            ALTER TABLE google_users ADD COLUMN IF NOT EXISTS student_id VARCHAR(50)
+            INSERT INTO students (student_id, first_name, last_name, email)
+            SELECT DISTINCT ON (student_id) student_id, first_name, last_name, primary_email
+            FROM google_users_sync_stage
+            WHERE student_id IS NOT NULL AND first_name <> '' AND last_name <> ''
+            ORDER BY student_id
+            ON CONFLICT (student_id) DO NOTHING
+            RETURNING student_id, first_name, last_name
         """)
-
-        # Create index for student_id if it doesn't exist
+        created_students = cursor.fetchall()
+        students_created = len(created_students)
+        if created_students:
+            # One summary line; the per-student detail is only formatted when debug logging is on
+            logging.info(f"📚 Created {students_created} student records")
+            if logging.getLogger().isEnabledFor(logging.DEBUG):
+                for student_id, first_name, last_name in created_students:
+                    logging.debug(f"📚 Created student record for {first_name} {last_name} (ID: {student_id})")
+
+        # Always use Google's suspension status as the source of truth
+        # Log if there's a difference between local and Google status
         cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_google_users_student_id ON google_users(student_id)
+            SELECT stage.primary_email, existing.is_suspended, stage.is_suspended
+            FROM google_users_sync_stage stage
+            JOIN google_users existing ON existing.google_id = stage.google_id
+            WHERE existing.is_suspended IS DISTINCT FROM stage.is_suspended
         """)
-
-        # Ensure students table exists for auto-creation
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS students (
-                id SERIAL PRIMARY KEY,
-                student_id VARCHAR(50) UNIQUE NOT NULL,
-                first_name VARCHAR(255) NOT NULL,
-                last_name VARCHAR(255) NOT NULL,
-                email VARCHAR(255),
-                grade_level INTEGER,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
+        status_changes = cursor.fetchall()
+        if status_changes:
+            logging.info(f"🔄 Updating suspension status for {len(status_changes)} users (Google is source of truth)")
+            if logging.getLogger().isEnabledFor(logging.DEBUG):
+                for primary_email, current_suspended, is_suspended in status_changes:
+                    logging.debug(f"🔄 Updating suspension status for {primary_email}: {current_suspended} -> {is_suspended}")
+
+        # Insert new users and update existing ones with Google's current data; xmax = 0 marks inserted rows
+        columns = ', '.join(USER_COLUMNS)
+        updates = ', '.join(f"{column} = EXCLUDED.{column}" for column in USER_COLUMNS if column != 'google_id')
+        cursor.execute(f"""
+            INSERT INTO google_users ({columns})
+            SELECT {columns} FROM google_users_sync_stage
+            ON CONFLICT (google_id) DO UPDATE
+            SET {updates}, updated_at = CURRENT_TIMESTAMP
+            RETURNING (xmax = 0) AS inserted
         """)
-
-        # Create a trigger to update the updated_at column
-        cursor.execute("""
-            CREATE OR REPLACE FUNCTION update_updated_at_column()
-            RETURNS TRIGGER AS $$
-            BEGIN
-                NEW.updated_at = CURRENT_TIMESTAMP;
-                RETURN NEW;
-            END;
-            $$ LANGUAGE plpgsql;
-        """)
-
-        # Create the trigger if it doesn't exist
-        cursor.execute("""
-            DO $$
-            BEGIN
-                IF NOT EXISTS (
-                    SELECT 1
-                    FROM pg_trigger
-                    WHERE tgname = 'update_google_users_updated_at'
-                ) THEN
-                    CREATE TRIGGER update_google_users_updated_at
-                    BEFORE UPDATE ON google_users
-                    FOR EACH ROW
-                    EXECUTE FUNCTION update_updated_at_column();
-                END IF;
-            END;
-            $$;
-        """)
-
-        # Insert or update users
-        inserted_count = 0
-        updated_count = 0
-        students_created = 0
-        processed_count = 0
-
-        logging.info("💾 Processing users for database insertion/update...")
-
-        for user in users:
-            processed_count += 1
-
-            # Extract user data
-            google_id = user.get('id')
-            primary_email = user.get('primaryEmail')
-
-            # Skip if missing required fields
-            if not google_id or not primary_email:
-                continue
-
-            first_name = user.get('name', {}).get('givenName')
-            last_name = user.get('name', {}).get('familyName')
-            full_name = user.get('name', {}).get('fullName')
-            org_unit_path = user.get('orgUnitPath')
-            is_admin = user.get('isAdmin', False)
-            is_suspended = user.get('suspended', False)
-            creation_time = user.get('creationTime')
-            last_login_time = user.get('lastLoginTime')
-
-            # Extract student ID from email
-            student_id = extract_student_id_from_email(primary_email)
-
-            # Auto-create student record if student ID is found
-            if student_id and first_name and last_name:
-                try:
-                    # Check if student record already exists
-                    cursor.execute(
-                        "SELECT id FROM students WHERE student_id = %s",
-                        (student_id,)
-                    )
-                    if not cursor.fetchone():
-                        # Create new student record
-                        cursor.execute(
-                            """
-                            INSERT INTO students (student_id, first_name, last_name, email)
-                            VALUES (%s, %s, %s, %s)
-                            ON CONFLICT (student_id) DO UPDATE SET
-                                first_name = EXCLUDED.first_name,
-                                last_name = EXCLUDED.last_name,
-                                email = EXCLUDED.email,
-                                updated_at = CURRENT_TIMESTAMP
-                            """,
-                            (student_id, first_name, last_name, primary_email)
-                        )
-                        students_created += 1
-                        logging.info(f"📚 Created student record for {first_name} {last_name} (ID: {student_id})")
-                except Exception as e:
-                    logging.warning(f"⚠️ Failed to create student record for {primary_email}: {str(e)}")
-
-            # Check if the user already exists
-            cursor.execute(
-                "SELECT id, is_suspended FROM google_users WHERE google_id = %s",
-                (google_id,)
-            )
-            result = cursor.fetchone()
-
-            if result:
-                current_user_id, current_suspended = result
-
-                # Always use Google's suspension status as the source of truth
-                # Log if there's a difference between local and Google status
-                if current_suspended != is_suspended:
-                    logging.info(f"🔄 Updating suspension status for {primary_email}: {current_suspended} -> {is_suspended} (Google is source of truth)")
-
-                # Update existing user with Google's current status including student_id
-                cursor.execute(
-                    """
-                    UPDATE google_users
-                    SET primary_email = %s, first_name = %s, last_name = %s, full_name = %s,
-                        org_unit_path = %s, is_admin = %s, is_suspended = %s, student_id = %s,
-                        creation_time = %s, last_login_time = %s, updated_at = CURRENT_TIMESTAMP
-                    WHERE google_id = %s
-                    """,
-                    (primary_email, first_name, last_name, full_name, org_unit_path,
-                     is_admin, is_suspended, student_id, creation_time, last_login_time, google_id)
-                )
-                updated_count += 1
-            else:
-                # Insert new user including student_id
-                cursor.execute(
-                    """
-                    INSERT INTO google_users (google_id, primary_email, first_name, last_name, full_name,
-                                            org_unit_path, is_admin, is_suspended, student_id, creation_time, last_login_time)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    """,
-                    (google_id, primary_email, first_name, last_name, full_name,
-                     org_unit_path, is_admin, is_suspended, student_id, creation_time, last_login_time)
-                )
-                inserted_count += 1
+        upserted = cursor.fetchall()
+        inserted_count = sum(1 for (inserted,) in upserted if inserted)
+        updated_count = len(upserted) - inserted_count
 
         # Commit the transaction
         conn.commit()
 
-        # Close the cursor and connection
         cursor.close()
-        conn.close()
 
         logging.info(f"✅ Sync completed! Inserted: {inserted_count}, Updated: {updated_count}, Students Created: {students_created}")
 
         return {
             "success": True,
-            "message": f"Successfully synced {len(users)} users from Google Admin API. Created {students_created} student records.",
+            "message": f"Successfully synced {users_count} users from Google Admin API. Created {students_created} student records.",
             "data": {
-                "users_count": len(users),
+                "users_count": users_count,
                 "inserted_count": inserted_count,
                 "updated_count": updated_count,
                 "students_created": students_created,
                 "api_calls": api_calls,
-                "total_users": total_users
+                "total_users": users_count
             }
         }
     except Exception as e:
@@ -304,6 +210,10 @@ def sync_users(use_pagination=True, batch_size=500):
                 "api_calls": 0
             }
         }
+    finally:
+        # Close the database connection, or hand it back to the pool
+        if conn is not None:
+            release_db_connection(conn)
 
 if __name__ == "__main__":
     # Configure logging
@@ -328,4 +238,4 @@ if __name__ == "__main__":
     result = sync_users(use_pagination=use_pagination, batch_size=batch_size)
 
     # Print the result as JSON
-    print(json.dumps(result))
+    write_json(result)
@@ -50,46 +50,34 @@ def test_database_connection():
 
         # Check if required tables exist
         tables_to_check = ['chromebooks', 'google_users', 'org_units', 'users']
-        existing_tables = {}
-
-        for table in tables_to_check:
-            cursor.execute("""
-                SELECT EXISTS (
-                    SELECT FROM information_schema.tables
-                    WHERE table_schema = 'public'
-                    AND table_name = %s
-                );
-            """, (table,))
-            exists = cursor.fetchone()['exists']
-            existing_tables[table] = exists
+        cursor.execute("""
+            SELECT table_name
+            FROM information_schema.tables
+            WHERE table_schema = 'public'
+            AND table_name = ANY(%s);
+        """, (tables_to_check,))
+        found = {row['table_name'] for row in cursor.fetchall()}
+        existing_tables = {table: table in found for table in tables_to_check}
+        for table, exists in existing_tables.items():
             print(f"Table '{table}' exists: {exists}")
 
-        # Test insert capability (if chromebooks table exists)
-        if existing_tables.get('chromebooks'):
-            try:
-                cursor.execute("SELECT COUNT(*) as count FROM chromebooks;")
-                count = cursor.fetchone()['count']
-                print(f"Current chromebooks count: {count}")
-            except Exception as e:
-                print(f"Error querying chromebooks table: {e}")
-
-        # Test google_users table if it exists
-        if existing_tables.get('google_users'):
-            try:
-                cursor.execute("SELECT COUNT(*) as count FROM google_users;")
-                count = cursor.fetchone()['count']
-                print(f"Current google_users count: {count}")
-            except Exception as e:
-                print(f"Error querying google_users table: {e}")
-
-        # Test org_units table if it exists
-        if existing_tables.get('org_units'):
+        # Row counts for the synced tables, estimated from planner statistics in one catalog
+        # lookup rather than a COUNT(*) scan per table
+        count_tables = [table for table in ('chromebooks', 'google_users', 'org_units') if existing_tables.get(table)]
+        if count_tables:
             try:
-                cursor.execute("SELECT COUNT(*) as count FROM org_units;")
-                count = cursor.fetchone()['count']
-                print(f"Current org_units count: {count}")
+                cursor.execute("""
+                    SELECT relname, reltuples::bigint AS count
+                    FROM pg_class
+                    WHERE relname = ANY(%s) AND relkind = 'r' AND pg_table_is_visible(oid);
+                """, (count_tables,))
+                counts = {row['relname']: row['count'] for row in cursor.fetchall()}
+                for table in count_tables:
+                    # reltuples is -1 until the table is first vacuumed or analyzed
+                    count = counts.get(table, -1)
+                    print(f"Current {table} count (estimate): {count if count >= 0 else 'unknown, not yet analyzed'}")
             except Exception as e:
-                print(f"Error querying org_units table: {e}")
+                print(f"Error querying table counts: {e}")
 
         cursor.close()
         conn.close()
@@ -5,136 +5,183 @@ Script to test the Google API connection and credentials.
 
 import sys
 import os
-import json
+import re
+import functools
+import importlib
 import logging
 from pathlib import Path
 
-# Add the parent directory to the path so we can import from athena
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+# Add the parent directory to the path so we can import from athena, unless PYTHONPATH already does
+_ATHENA_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
+if _ATHENA_ROOT not in sys.path:
+    sys.path.insert(0, _ATHENA_ROOT)
+
+from athena.utils.json_utils import write_json
+
+# Google API key and config files, resolved once
+_API_DIR = os.path.join(_ATHENA_ROOT, 'athena', 'api', 'google_api')
+_REQUIRED_FILES = ('key.json', 'auth.ini', 'config.ini')
+
+# Google libraries the connection test needs
+_GOOGLE_MODULES = ('google.auth', 'google.oauth2.service_account', 'googleapiclient.discovery')
+
+# The [Settings] section of config.ini, and the ADMIN option within it
+_SETTINGS_SECTION_RE = re.compile(r'^\[Settings\][ \t]*$(.*?)(?=^\[|\Z)', re.MULTILINE | re.DOTALL)
+_ADMIN_OPTION_RE = re.compile(r'^ADMIN[ \t]*[=:][ \t]*(.*?)[ \t]*$', re.MULTILINE | re.IGNORECASE)
+
+def _read_admin_email(config_path):
+    """
+    Read Settings.ADMIN from config.ini with one regex scan instead of a full ConfigParser parse.
+
+    Args:
+        config_path (str): Path to config.ini.
+
+    Returns:
+        str: The admin email, or None if the file, section or option is missing or empty.
+    """
+    try:
+        with open(config_path, 'r') as f:
+            section = _SETTINGS_SECTION_RE.search(f.read())
+    except OSError:
+        return None
+    match = section and _ADMIN_OPTION_RE.search(section.group(1))
+    return (match.group(1) or None) if match else None
+
+@functools.lru_cache(maxsize=4)
+def _load_credentials(key_path, admin_email):
+    """
+    Load the service account key and delegate it to admin_email, once per process.
+
+    Args:
+        key_path (str): Path to the service account key.json.
+        admin_email (str): Admin user to impersonate.
+
+    Returns:
+        google.oauth2.service_account.Credentials: The delegated credentials.
+    """
+    from google.oauth2 import service_account
+    credentials = service_account.Credentials.from_service_account_file(
+        key_path,
+        scopes=['https://www.googleapis.com/auth/admin.directory.device.chromeos']
+    )
+    return credentials.with_subject(admin_email)
+
+@functools.lru_cache(maxsize=4)
+def _build_service(key_path, admin_email):
+    """
+    Build the Admin SDK Directory service, once per process.
+
+    Uses the discovery document bundled with googleapiclient instead of fetching
+    it, and the cached service keeps its authorized HTTP connection for reuse.
+
+    Args:
+        key_path (str): Path to the service account key.json.
+        admin_email (str): Admin user to impersonate.
+
+    Returns:
+        Resource: The Directory API service.
+    """
+    from googleapiclient.discovery import build
+    return build('admin', 'directory_v1', credentials=_load_credentials(key_path, admin_email),
+                 cache_discovery=False, static_discovery=True)
 
 def test_google_api_connection():
     """
     Test the Google API connection and credentials.
 
+    Progress lines are collected and written to stdout in one go when the test finishes.
+
     Returns:
         dict: A dictionary containing the results or error message.
     """
+    lines = []
     try:
-        # Print environment information
-        print(f"Python version: {sys.version}")
-        print(f"Current working directory: {os.getcwd()}")
-        print(f"PYTHONPATH: {os.environ.get('PYTHONPATH', 'Not set')}")
-        print(f"GOOGLE_APPLICATION_CREDENTIALS: {os.environ.get('GOOGLE_APPLICATION_CREDENTIALS', 'Not set')}")
-
-        # Check if key.json exists
-        key_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'api', 'google_api', 'key.json')
-        print(f"Checking if key.json exists at: {key_path}")
-        if os.path.exists(key_path):
-            print(f"✅ key.json exists at {key_path}")
-        else:
-            print(f"❌ key.json does not exist at {key_path}")
-            return {
-                "success": False,
-                "message": f"key.json not found at {key_path}",
-                "data": {}
-            }
+        return _check_connection(lines.append)
+    finally:
+        if lines:
+            sys.stdout.write('\n'.join(lines) + '\n')
 
-        # Check if auth.ini exists
-        auth_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'api', 'google_api', 'auth.ini')
-        print(f"Checking if auth.ini exists at: {auth_path}")
-        if os.path.exists(auth_path):
-            print(f"✅ auth.ini exists at {auth_path}")
-        else:
-            print(f"❌ auth.ini does not exist at {auth_path}")
-            return {
-                "success": False,
-                "message": f"auth.ini not found at {auth_path}",
-                "data": {}
-            }
+def _check_connection(say):
+    """
+    Run the connection checks for test_google_api_connection.
 
-        # Check if config.ini exists
-        config_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'api', 'google_api', 'config.ini')
-        print(f"Checking if config.ini exists at: {config_path}")
-        if os.path.exists(config_path):
-            print(f"✅ config.ini exists at {config_path}")
-        else:
-            print(f"❌ config.ini does not exist at {config_path}")
-            return {
-                "success": False,
-                "message": f"config.ini not found at {config_path}",
-                "data": {}
-            }
+    Args:
+        say (callable): Receives each progress line.
 
-        # Try to import Google API libraries
-        try:
-            import google.auth
-            print("✅ Successfully imported google.auth")
-        except ImportError as e:
-            print(f"❌ Failed to import google.auth: {str(e)}")
-            return {
-                "success": False,
-                "message": f"Failed to import google.auth: {str(e)}",
-                "data": {}
-            }
+    Returns:
+        dict: A dictionary containing the results or error message.
+    """
+    try:
+        # Print environment information
+        say(f"Python version: {sys.version}")
+        say(f"Current working directory: {os.getcwd()}")
+        say(f"PYTHONPATH: {os.environ.get('PYTHONPATH', 'Not set')}")
+        say(f"GOOGLE_APPLICATION_CREDENTIALS: {os.environ.get('GOOGLE_APPLICATION_CREDENTIALS', 'Not set')}")
 
+        # Check the key and config files with one directory listing instead of a stat per file
         try:
-            from google.oauth2 import service_account
-            print("✅ Successfully imported google.oauth2.service_account")
-        except ImportError as e:
-            print(f"❌ Failed to import google.oauth2.service_account: {str(e)}")
-            return {
-                "success": False,
-                "message": f"Failed to import google.oauth2.service_account: {str(e)}",
-                "data": {}
-            }
+            with os.scandir(_API_DIR) as entries:
+                present = {entry.name for entry in entries}
+        except OSError:
+            present = set()
+
+        key_path = os.path.join(_API_DIR, 'key.json')
+        config_path = os.path.join(_API_DIR, 'config.ini')
+        for name in _REQUIRED_FILES:
+            path = os.path.join(_API_DIR, name)
+            say(f"Checking if {name} exists at: {path}")
+            if name in present:
+                say(f"✅ {name} exists at {path}")
+            else:
+                say(f"❌ {name} does not exist at {path}")
+                return {
+                    "success": False,
+                    "message": f"{name} not found at {path}",
+                    "data": {}
+                }
 
-        try:
-            from googleapiclient.discovery import build
-            print("✅ Successfully imported googleapiclient.discovery")
-        except ImportError as e:
-            print(f"❌ Failed to import googleapiclient.discovery: {str(e)}")
+        # Read the admin email before importing the Google libraries, which take most of the start-up time
+        admin_email = _read_admin_email(config_path)
+
+        if not admin_email:
+            say("❌ Admin email not found in config.ini")
             return {
                 "success": False,
-                "message": f"Failed to import googleapiclient.discovery: {str(e)}",
+                "message": "Admin email not found in config.ini",
                 "data": {}
             }
 
-        # Try to authenticate with Google API
-        try:
-            # Load the service account key file
-            credentials = service_account.Credentials.from_service_account_file(
-                key_path,
-                scopes=['https://www.googleapis.com/auth/admin.directory.device.chromeos']
-            )
-            print("✅ Successfully loaded service account credentials")
-
-            # Create a delegated credentials object
-            import configparser
-            config = configparser.ConfigParser()
-            config.read(config_path)
-            admin_email = config.get('Settings', 'ADMIN', fallback=None)
-
-            if admin_email:
-                delegated_credentials = credentials.with_subject(admin_email)
-                print(f"✅ Successfully created delegated credentials for {admin_email}")
-            else:
-                print("❌ Admin email not found in config.ini")
+        # Try to import Google API libraries, one at a time: they import each other,
+        # and imports are serialized by the import lock anyway
+        for name in _GOOGLE_MODULES:
+            try:
+                importlib.import_module(name)
+                say(f"✅ Successfully imported {name}")
+            except ImportError as e:
+                say(f"❌ Failed to import {name}: {str(e)}")
                 return {
                     "success": False,
-                    "message": "Admin email not found in config.ini",
+                    "message": f"Failed to import {name}: {str(e)}",
                     "data": {}
                 }
 
+        # Try to authenticate with Google API
+        try:
+            # Load the service account key file and create a delegated credentials object
+            _load_credentials(key_path, admin_email)
+            say("✅ Successfully loaded service account credentials")
+            say(f"✅ Successfully created delegated credentials for {admin_email}")
+
             # Try to build the service
-            service = build('admin', 'directory_v1', credentials=delegated_credentials)
-            print("✅ Successfully built the Admin SDK Directory service")
+            service = _build_service(key_path, admin_email)
+            say("✅ Successfully built the Admin SDK Directory service")
 
             # Try to list users
             results = service.users().list(customer='my_customer', maxResults=1).execute()
             users = results.get('users', [])
 
             if users:
-                print(f"✅ Successfully retrieved {len(users)} users from Google Admin API")
+                say(f"✅ Successfully retrieved {len(users)} users from Google Admin API")
                 return {
                     "success": True,
                     "message": "Successfully connected to Google Admin API",
@@ -143,7 +190,7 @@ def test_google_api_connection():
                     }
                 }
             else:
-                print("❌ No users found in Google Admin API")
+                say("❌ No users found in Google Admin API")
                 return {
                     "success": True,
                     "message": "Successfully connected to Google Admin API, but no users found",
@@ -152,7 +199,7 @@ def test_google_api_connection():
                     }
                 }
         except Exception as e:
-            print(f"❌ Failed to authenticate with Google API: {str(e)}")
+            say(f"❌ Failed to authenticate with Google API: {str(e)}")
             import traceback
             traceback.print_exc()
             return {
@@ -161,7 +208,7 @@ def test_google_api_connection():
                 "data": {}
             }
     except Exception as e:
-        print(f"❌ An error occurred: {str(e)}")
+        say(f"❌ An error occurred: {str(e)}")
         import traceback
         traceback.print_exc()
         return {
@@ -178,4 +225,4 @@ if __name__ == "__main__":
     result = test_google_api_connection()
 
     # Print the result as JSON
-    print(json.dumps(result, indent=2))
+    write_json(result, indent=True)
@@ -1,14 +1,46 @@
 #!/usr/bin/env python3
 
 import sys
-import json
 import logging
 from athena.api.google_api.directory import Directory
+from athena.utils.json_utils import write_json
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def unsuspend_user(user_key):
+    """
+    Unsuspend a user and shape the result for the caller.
+
+    Args:
+        user_key (str): The user's email or unique ID.
+
+    Returns:
+        dict: The result, with "success" and a "message".
+    """
+    # Initialize the Directory API
+    directory = Directory.get_instance()
+
+    # Unsuspend the user
+    result = directory.unsuspend_user(user_key)
+
+    if "error" in result:
+        logger.error(f"Failed to unsuspend user {user_key}: {result['error']}")
+        return {
+            "success": False,
+            "error": result["error"],
+            "message": f"Failed to unsuspend user {user_key}"
+        }
+
+    logger.info(f"Successfully unsuspended user: {user_key}")
+    return {
+        "success": True,
+        "message": result.get("message", f"User {user_key} unsuspended successfully"),
+        "user": result.get("user"),
+        "user_key": user_key
+    }
+
 def main():
     try:
         # Check if we have the required arguments
@@ -18,36 +50,14 @@ def main():
                 "error": "Missing required argument: user_key",
                 "message": "Usage: python unsuspend_user.py <user_key>"
             }
-            print(json.dumps(result))
+            write_json(result)
             sys.exit(1)
 
         user_key = sys.argv[1]
 
         logger.info(f"Unsuspending user: {user_key}")
 
-        # Initialize the Directory API
-        directory = Directory()
-
-        # Unsuspend the user
-        result = directory.unsuspend_user(user_key)
-
-        if "error" in result:
-            logger.error(f"Failed to unsuspend user {user_key}: {result['error']}")
-            output = {
-                "success": False,
-                "error": result["error"],
-                "message": f"Failed to unsuspend user {user_key}"
-            }
-        else:
-            logger.info(f"Successfully unsuspended user: {user_key}")
-            output = {
-                "success": True,
-                "message": result.get("message", f"User {user_key} unsuspended successfully"),
-                "user": result.get("user"),
-                "user_key": user_key
-            }
-
-        print(json.dumps(output))
+        write_json(unsuspend_user(user_key))
 
     except Exception as e:
         logger.error(f"Error unsuspending user: {str(e)}")
@@ -56,7 +66,7 @@ def main():
             "error": str(e),
             "message": "An unexpected error occurred while unsuspending the user"
         }
-        print(json.dumps(result))
+        write_json(result)
         sys.exit(1)
 
 if __name__ == "__main__":
@@ -1,13 +1,34 @@
 #!/usr/bin/env python3
 
 import sys
-import json
 import logging
+from athena.utils.json_utils import write_json
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def update_device_notes(asset_id, notes_content):
+    """
+    Update a device's notes, reusing this thread's Devices client.
+
+    Args:
+        asset_id (str): The device's annotated asset ID.
+        notes_content (str): The new notes content.
+
+    Returns:
+        dict: The result from Devices.update_device_notes.
+    """
+    # Import the Devices class from athena
+    from athena.api.google_api.devices import Devices
+
+    # Update the device notes using the existing method
+    return Devices.get_instance().update_device_notes(
+        identifier=asset_id,
+        notes_content=notes_content,
+        identifier_type='annotatedAssetId'
+    )
+
 def main():
     """
     Update device notes in Google Admin Console using the athena Devices class.
@@ -20,7 +41,7 @@ def main():
                 "success": False,
                 "error": "Usage: python update_device_notes.py <asset_id> <notes_content>"
             }
-            print(json.dumps(result))
+            write_json(result)
             sys.exit(1)
 
         asset_id = sys.argv[1]
@@ -29,21 +50,10 @@ def main():
         logger.info(f"🔄 [Script] Starting notes update for asset: {asset_id}")
         logger.info(f"📝 [Script] Notes content: {notes_content}")
 
-        # Import the Devices class from athena
-        from athena.api.google_api.devices import Devices
-
-        # Initialize the Devices class
-        devices = Devices()
-
-        # Update the device notes using the existing method
-        result = devices.update_device_notes(
-            identifier=asset_id,
-            notes_content=notes_content,
-            identifier_type='annotatedAssetId'
-        )
+        result = update_device_notes(asset_id, notes_content)
 
         # Output the result as JSON
-        print(json.dumps(result))
+        write_json(result)
 
         if result.get('success'):
             logger.info(f"✅ [Script] Notes updated successfully for asset: {asset_id}")
@@ -59,7 +69,7 @@ def main():
             "identifier": sys.argv[1] if len(sys.argv) > 1 else "unknown"
         }
         logger.error(f"❌ [Script] Import error: {str(e)}")
-        print(json.dumps(error_result))
+        write_json(error_result)
         sys.exit(1)
 
     except Exception as e:
@@ -69,7 +79,7 @@ def main():
             "identifier": sys.argv[1] if len(sys.argv) > 1 else "unknown"
         }
         logger.error(f"❌ [Script] Exception occurred: {str(e)}")
-        print(json.dumps(error_result))
+        write_json(error_result)
         sys.exit(1)
 
 if __name__ == "__main__":
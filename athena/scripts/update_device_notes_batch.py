@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Update the notes of many Chrome devices in one run
+
+Device lookups and notes updates are sent through the Admin SDK batch endpoint,
+so a bulk edit costs one process start and a handful of HTTP requests.
+
+Usage:
+    python update_device_notes_batch.py < updates.json    # [{"asset_id": ..., "notes": ...}, ...]
+"""
+import json
+import sys
+from athena.api.google_api.devices import Devices
+from athena.utils.json_utils import write_json
+
+def update_device_notes_batch(updates):
+    """
+    Update the notes of many devices in as few Admin SDK calls as possible
+
+    Args:
+        updates: List of {'asset_id': ..., 'notes': ...} dicts
+
+    Returns:
+        dict: Overall result with one entry per device under 'results'
+    """
+    try:
+        pairs = [(update['asset_id'], update['notes']) for update in updates]
+    except (KeyError, TypeError):
+        return {
+            'success': False,
+            'error': 'Each update must be an object with "asset_id" and "notes"'
+        }
+
+    try:
+        results = Devices.get_instance().update_device_notes_bulk(pairs)
+    except Exception as e:
+        return {
+            'success': False,
+            'error': str(e)
+        }
+
+    updated = sum(result['success'] for result in results)
+    return {
+        'success': updated == len(results),
+        'message': f'Updated notes on {updated} of {len(results)} devices',
+        'updated': updated,
+        'failed': len(results) - updated,
+        'results': results
+    }
+
+def main():
+    """Read the updates from stdin and print the combined result"""
+    try:
+        updates = json.load(sys.stdin)
+    except ValueError as e:
+        write_json({
+            'success': False,
+            'error': f'Invalid JSON on stdin: {e}'
+        })
+        sys.exit(1)
+
+    result = update_device_notes_batch(updates if isinstance(updates, list) else [updates])
+    write_json(result)
+
+if __name__ == "__main__":
+    main()
@@ -2,20 +2,20 @@
 
 # Standard Imports
 import os
+import re
 
 # Local Imports
 from . import operator
 
+# Monthly attendance summary exports
+_SUMMARY_FILE_RE = re.compile(r'PrintMonthlyAttendanceSummary.*\.xlsx', re.DOTALL)
+
 def _process_summary(file_path):
     print(operator.Date.from_filename(file_path))
 
 # Returns the file of the latest report
 def _get_latest_file(files):
-    latest_file = None
-    for file in files:
-        if latest_file is None or file > latest_file:
-            latest_file = file
-    return latest_file
+    return max(files, default=None)
 
 # Goes through all the summary files and performs various operations
 def _parse_summary_files(files):
@@ -24,13 +24,15 @@ def _parse_summary_files(files):
 
 # Loads all the reports in a directory
 def _load_files(directory):
-    # monthly_attendance_summaries = []
-    # for file in os.listdir(directory):
-    #     if file.startswith("PrintMonthlyAttendanceSummary") and file.endswith(".xlsx"):
-    #         monthly_attendance_summaries.append(file)
+    try:
+        names = os.listdir(directory)
+    except OSError as e:
+        print(f"Could not read {directory}: {e}")
+        return
 
-    # _parse_summary_files(monthly_attendance_summaries)
-    pass
+    # One compiled match per name, with the loop itself running in C
+    monthly_attendance_summaries = list(filter(_SUMMARY_FILE_RE.fullmatch, names))
+    _parse_summary_files(monthly_attendance_summaries)
 
 def run(dir_path):
-    operator.Parse(dir_path)
\ No newline at end of file
+    _load_files(dir_path)
\ No newline at end of file
@@ -1,16 +1,17 @@
 # athena/utils/aeries/reports/operator.py
 
+# Standard Imports
+import functools
+
 # Local Imports
 from athena.utils import global_operator
 
 class Date(global_operator.Date):
     @classmethod
+    @functools.lru_cache(maxsize=4096)  # Report directories are re-scanned; the same names come back
     def from_filename(cls, file_path):
-        date_str = file_path.split("_")[1]
-        year = date_str[:4]
-        month = date_str[4:6]
-        day = date_str[6:]
-        return cls(year, month, day)
+        date_str = file_path.split("_", 2)[1]
+        return cls(date_str[:4], date_str[4:6], date_str[6:8])
 
 class Parse(global_operator.Parse):
     pass
\ No newline at end of file
@@ -0,0 +1,56 @@
+# athena/utils/cache_utils/__init__.py
+
+# Standard Imports
+import threading                                        # For thread-safe access
+import time                                             # For expiry timestamps
+from collections import OrderedDict                     # For insertion-ordered eviction
+
+
+class TTLCache:
+    """
+    Small thread-safe mapping whose entries expire after a fixed time-to-live.
+
+    When full, the oldest entry is evicted to make room for a new one.
+    """
+
+    def __init__(self, maxsize=1024, ttl=60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            expires_at, value = item
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            return value
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._data.pop(key, None)
+            while len(self._data) >= self.maxsize:
+                self._data.popitem(last=False)
+            self._data[key] = (time.monotonic() + self.ttl, value)
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def pop(self, key, default=None):
+        with self._lock:
+            item = self._data.pop(key, None)
+        return default if item is None else item[1]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+_MISSING = object()
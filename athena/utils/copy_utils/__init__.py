@@ -0,0 +1,90 @@
+# athena/utils/copy_utils/__init__.py
+
+# Standard Imports
+import io                                               # For the in-memory COPY buffer
+
+# External Imports
+from psycopg2.extras import Json                        # JSON values bound for JSON/JSONB columns
+
+
+# Characters that must be backslash-escaped in COPY's text format
+_COPY_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+
+def format_copy_value(value):
+    """
+    Format one value for PostgreSQL COPY's text format.
+
+    Args:
+        value: None (written as NULL), a psycopg2 Json wrapper, or anything whose
+               str() PostgreSQL accepts for the target column.
+
+    Returns:
+        str: The escaped field.
+    """
+    if value is None:
+        return '\\N'
+    if isinstance(value, Json):
+        value = value.dumps(value.adapted)
+    return str(value).translate(_COPY_ESCAPES)
+
+
+def format_copy_row(values):
+    """
+    Format one row as a line of COPY's text format.
+
+    Args:
+        values: Tuple of values, in the column order of the COPY statement.
+
+    Returns:
+        str: The tab-separated, newline-terminated line.
+    """
+    return '\t'.join(map(format_copy_value, values)) + '\n'
+
+
+def copy_buffer(rows):
+    """
+    Build an in-memory file of rows in COPY's text format, for cursor.copy_expert.
+
+    Args:
+        rows: Iterable of value tuples, in the column order of the COPY statement.
+
+    Returns:
+        io.StringIO: The buffer, positioned at the start.
+    """
+    buffer = io.StringIO()
+    buffer.writelines(map(format_copy_row, rows))
+    buffer.seek(0)
+    return buffer
+
+
+class CopyStream:
+    """
+    File-like COPY source that formats rows only as cursor.copy_expert reads them.
+
+    Unlike copy_buffer nothing is built up front: rows are pulled from the
+    iterable on demand, so a generator over API pages can feed one COPY while
+    only the page being read is held in memory.
+    """
+
+    def __init__(self, rows):
+        self._lines = map(format_copy_row, rows)
+        self._pending = ''
+
+    def read(self, size=-1):
+        """
+        Return up to size characters of COPY data, or all that is left if size is negative.
+        """
+        chunks = [self._pending]
+        length = len(self._pending)
+        for line in self._lines:
+            chunks.append(line)
+            length += len(line)
+            if 0 <= size <= length:
+                break
+        data = ''.join(chunks)
+        if 0 <= size < len(data):
+            data, self._pending = data[:size], data[size:]
+        else:
+            self._pending = ''
+        return data
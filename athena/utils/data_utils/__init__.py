@@ -5,7 +5,10 @@ class DataUtilities:
     def expand_dot_notation(fields):
         expanded = set()
         for field in fields:
-            parts = field.split('.')
-            for i in range(1, len(parts) + 1):
-                expanded.add('.'.join(parts[:i]))
+            # Every prefix ending before a dot, then the field itself
+            dot = field.find('.')
+            while dot >= 0:
+                expanded.add(field[:dot])
+                dot = field.find('.', dot + 1)
+            expanded.add(field)
         return list(expanded)
\ No newline at end of file
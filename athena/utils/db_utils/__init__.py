@@ -0,0 +1,102 @@
+# athena/utils/db_utils/__init__.py
+
+# Standard Imports
+import functools                                        # For reading the environment once
+import logging                                          # For connection errors
+import os                                               # For the DB_* environment variables
+import threading                                        # For waiting on a free pooled connection
+
+# External Imports
+import psycopg2                                         # PostgreSQL driver
+from psycopg2.pool import ThreadedConnectionPool        # Connection reuse in long-lived processes
+
+
+# Set by use_connection_pool() in long-lived processes; otherwise every connection is opened fresh
+_connection_pool = None
+# One slot per pooled connection, so callers wait for a free one instead of getting a PoolError
+_connection_slots = None
+
+
+@functools.lru_cache(maxsize=None)
+def get_connection_params(default_host='postgres'):
+    """
+    Get the PostgreSQL connection parameters from environment variables.
+
+    The environment is read once per default_host; the same dict is returned on
+    every later call, so callers must not modify it.
+
+    Args:
+        default_host (str): Host to use when DB_HOST is not set.
+
+    Returns:
+        dict: Keyword arguments for psycopg2.connect.
+    """
+    return {
+        'host': os.environ.get('DB_HOST', default_host),
+        'port': os.environ.get('DB_PORT', '5432'),
+        'dbname': os.environ.get('DB_NAME', 'chromebook_library'),
+        'user': os.environ.get('DB_USER', 'postgres'),
+        'password': os.environ.get('DB_PASSWORD', 'password'),
+        # Fail a hung statement instead of blocking a sync forever
+        'options': f"-c statement_timeout={os.environ.get('DB_STATEMENT_TIMEOUT_MS', '60000')}"
+    }
+
+
+def use_connection_pool(maxconn=4, default_host='postgres'):
+    """
+    Keep database connections open between calls in this process.
+
+    Meant for long-lived processes such as athena_daemon.py; connections are
+    opened on first use, so calling this opens nothing by itself. When all
+    maxconn connections are in use, get_db_connection blocks until one is
+    released, so size maxconn to the number of threads that use the database.
+
+    Args:
+        maxconn (int): Maximum number of pooled connections.
+        default_host (str): Host to use when DB_HOST is not set.
+    """
+    global _connection_pool, _connection_slots
+    if _connection_pool is None:
+        _connection_slots = threading.BoundedSemaphore(maxconn)
+        _connection_pool = ThreadedConnectionPool(0, maxconn, **get_connection_params(default_host))
+
+
+def get_db_connection(default_host='postgres'):
+    """
+    Get a connection to the PostgreSQL database.
+
+    Args:
+        default_host (str): Host to use when DB_HOST is not set and no pool is in use.
+
+    Returns:
+        connection: A PostgreSQL database connection, pooled if use_connection_pool() was called.
+            Hand it back with release_db_connection.
+    """
+    try:
+        if _connection_pool is not None:
+            _connection_slots.acquire()
+            try:
+                return _connection_pool.getconn()
+            except Exception:
+                _connection_slots.release()
+                raise
+        return psycopg2.connect(**get_connection_params(default_host))
+    except Exception as e:
+        logging.error(f"Error connecting to database: {str(e)}")
+        raise
+
+
+def release_db_connection(conn):
+    """
+    Return a connection from get_db_connection to the pool, or close it if there is no pool.
+
+    Args:
+        conn: The connection to release.
+    """
+    if _connection_pool is not None:
+        try:
+            _connection_pool.putconn(conn)  # Rolls back anything left open
+        finally:
+            _connection_slots.release()
+    else:
+        conn.close()
@@ -1,13 +1,18 @@
 # athena/utils/global_operator.py
 
 # Standard Imports
+import functools
 import os
+import stat
 
+@functools.total_ordering
 class Date:
     def __init__(self, year, month, day):
         self.year = year
         self.month = month
         self.day = day
+        # Compared as one tuple; from_filename keeps the fields zero-padded, so lexical order is chronological
+        self._key = (year, month, day)
 
     def __str__(self):
         return f"{self.year}-{self.month}-{self.day}"
@@ -16,34 +21,22 @@ class Date:
         return f"{self.year}-{self.month}-{self.day}"
 
     def __eq__(self, other):
-        return self.year == other.year and self.month == other.month and self.day == other.day
-
-    def __ne__(self, other):
-        return not self.__eq__(other)
+        return self._key == other._key
 
     def __lt__(self, other):
-        if self.year < other.year:
-            return True
-        elif self.year == other.year:
-            if self.month < other.month:
-                return True
-            elif self.month == other.month:
-                if self.day < other.day:
-                    return True
-        return False
-
-    def __le__(self, other):
-        return self.__lt__(other) or self.__eq__(other)
-
-    def __gt__(self, other):
-        return not self.__le__(other)
+        return self._key < other._key
 
-    def __ge__(self, other):
-        return not self.__lt__(other)
+    def __hash__(self):
+        return hash(self._key)
 
 class Parse:
     def __init__(self, parse_path):
-        if os.path.isdir(parse_path):
+        # Stat once and keep the result so subclasses don't stat the path again
+        try:
+            self._stat = os.stat(parse_path)
+        except OSError:
+            self._stat = None
+        if self._stat is not None and stat.S_ISDIR(self._stat.st_mode):
             self.directory(parse_path)
         else:
             self.file(parse_path)
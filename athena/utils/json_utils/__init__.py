@@ -0,0 +1,105 @@
+# athena/utils/json_utils/__init__.py
+
+# Standard Imports
+import io                                               # For buffered stdout
+import json                                             # Fallback serializer
+import re                                               # For escaping non-ASCII output
+import sys                                              # For stdout access
+from contextlib import contextmanager                   # For the stdout writer
+
+# Optional Imports
+try:
+    import orjson                                       # Fast serializer, when installed
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    # Leave datetimes and dataclasses to `default` so output matches json.dumps(default=str)
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+
+
+# Any non-ASCII character; orjson only emits these inside string literals
+_NON_ASCII_RE = re.compile('[^\x00-\x7f]')
+
+
+def _escape_non_ascii(match):
+    code = ord(match.group())
+    if code < 0x10000:
+        return '\\u%04x' % code
+    code -= 0x10000
+    return '\\u%04x\\u%04x' % (0xd800 | (code >> 10), 0xdc00 | (code & 0x3ff))
+
+
+def dump_bytes(obj, indent=False, default=str):
+    """
+    Serialize obj to JSON bytes, using orjson when it is available.
+
+    Output is pure ASCII, like json.dumps' default ensure_ascii=True, so readers
+    that decode stdout chunk by chunk never split a multi-byte character.
+
+    Args:
+        obj: Object to serialize.
+        indent (bool): Pretty-print with two-space indentation.
+        default (callable): Fallback for values JSON cannot represent.
+
+    Returns:
+        bytes: Encoded JSON document.
+    """
+    if orjson is not None:
+        options = _ORJSON_OPTIONS | orjson.OPT_INDENT_2 if indent else _ORJSON_OPTIONS
+        try:
+            data = orjson.dumps(obj, default=default, option=options)
+        except TypeError:
+            pass  # e.g. integers wider than 64 bits; let the stdlib handle it
+        else:
+            if data.isascii():
+                return data
+            return _NON_ASCII_RE.sub(_escape_non_ascii, data.decode('utf-8')).encode('ascii')
+    return json.dumps(obj, default=default, indent=2 if indent else None).encode('utf-8')
+
+
+def dumps(obj, indent=False, default=str):
+    """
+    Serialize obj to a JSON string. See dump_bytes.
+    """
+    return dump_bytes(obj, indent=indent, default=default).decode('utf-8')
+
+
+def write_json(obj, indent=False, default=str, stream=None):
+    """
+    Write obj as one line of JSON to stdout, skipping the text-encoding layer.
+
+    Args:
+        obj: Object to serialize.
+        indent (bool): Pretty-print with two-space indentation.
+        default (callable): Fallback for values JSON cannot represent.
+        stream: Binary stream to write to. Defaults to sys.stdout.buffer.
+    """
+    if stream is None:
+        sys.stdout.flush()  # Keep ordering with anything already print()ed
+        stream = sys.stdout.buffer
+    stream.write(dump_bytes(obj, indent=indent, default=default))
+    stream.write(b'\n')
+    stream.flush()
+
+
+@contextmanager
+def buffered_stdout(buffer_size=1 << 20):
+    """
+    Yield a large binary buffer over stdout for output built from many small writes.
+
+    Writes are collected into `buffer_size` chunks, so streaming encoders cost
+    roughly one syscall per chunk. The buffer is flushed and detached on exit,
+    leaving sys.stdout usable.
+
+    Args:
+        buffer_size (int): Buffer size in bytes. Defaults to 1 MiB.
+    """
+    sys.stdout.flush()  # Keep ordering with anything already print()ed
+    out = io.BufferedWriter(sys.stdout.buffer, buffer_size=buffer_size)
+    try:
+        yield out
+    finally:
+        out.flush()
+        out.detach()
+        sys.stdout.buffer.flush()
@@ -0,0 +1,36 @@
+# athena/utils/rate_utils/__init__.py
+
+# Standard Imports
+import threading                                        # For thread-safe access
+import time                                             # For refill timestamps
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket limiting calls to `rate` per second.
+
+    Up to `capacity` calls may go through at once after an idle period;
+    after that callers block in acquire() until a token is available.
+    """
+
+    def __init__(self, rate=20, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Take one token, sleeping until one is available.
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
@@ -0,0 +1,145 @@
+# athena/utils/schema_utils/__init__.py
+
+# Standard Imports
+import logging                                          # For reporting schema repairs
+import threading                                        # For the once-per-process guard
+
+
+# Tables the sync scripts write to, created if an installation predates them
+SYNC_TABLES = {
+    'org_units': """
+        CREATE TABLE IF NOT EXISTS org_units (
+            id SERIAL PRIMARY KEY,
+            name VARCHAR(255) NOT NULL,
+            org_unit_path VARCHAR(255) NOT NULL UNIQUE,
+            parent_org_unit_path VARCHAR(255),
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+        )
+    """,
+    'google_users': """
+        CREATE TABLE IF NOT EXISTS google_users (
+            id SERIAL PRIMARY KEY,
+            google_id VARCHAR(255) NOT NULL UNIQUE,
+            primary_email VARCHAR(255) NOT NULL UNIQUE,
+            first_name VARCHAR(255),
+            last_name VARCHAR(255),
+            full_name VARCHAR(255),
+            org_unit_path VARCHAR(255),
+            is_admin BOOLEAN DEFAULT FALSE,
+            is_suspended BOOLEAN DEFAULT FALSE,
+            student_id VARCHAR(50),
+            creation_time TIMESTAMP WITH TIME ZONE,
+            last_login_time TIMESTAMP WITH TIME ZONE,
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+        )
+    """,
+    'students': """
+        CREATE TABLE IF NOT EXISTS students (
+            id SERIAL PRIMARY KEY,
+            student_id VARCHAR(50) UNIQUE NOT NULL,
+            first_name VARCHAR(255) NOT NULL,
+            last_name VARCHAR(255) NOT NULL,
+            email VARCHAR(255),
+            grade_level INTEGER,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """,
+}
+
+# Columns added after a table was first released: table -> {column: DDL}
+SYNC_COLUMNS = {
+    'google_users': {
+        'student_id': "ALTER TABLE google_users ADD COLUMN IF NOT EXISTS student_id VARCHAR(50)",
+    },
+}
+
+# Indexes the sync queries rely on: table -> {index: DDL}
+SYNC_INDEXES = {
+    'google_users': {
+        'idx_google_users_student_id': "CREATE INDEX IF NOT EXISTS idx_google_users_student_id ON google_users(student_id)",
+    },
+}
+
+# updated_at triggers for the synced tables, keyed by table
+SYNC_TRIGGERS = {
+    'org_units': 'update_org_units_updated_at',
+    'google_users': 'update_google_users_updated_at',
+}
+
+UPDATED_AT_FUNCTION = """
+    CREATE OR REPLACE FUNCTION update_updated_at_column()
+    RETURNS TRIGGER AS $$
+    BEGIN
+        NEW.updated_at = CURRENT_TIMESTAMP;
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql;
+"""
+
+# Tables already verified by this process
+_verified = set()
+_lock = threading.Lock()
+
+
+def ensure_sync_schema(conn, tables):
+    """
+    Make sure the given sync tables, their later columns, indexes and updated_at triggers exist.
+
+    The first call for a table costs one catalog query, and DDL only runs for
+    objects that are actually missing. After that the table is remembered for
+    the life of the process, so repeated syncs run no schema statements at all.
+
+    Args:
+        conn: An open psycopg2 connection; committed if anything had to be created.
+        tables: Names of keys in SYNC_TABLES the caller writes to.
+    """
+    with _lock:
+        pending = [table for table in tables if table not in _verified]
+        if not pending:
+            return
+
+        columns = {f'{table}.{column}': ddl for table in pending for column, ddl in SYNC_COLUMNS.get(table, {}).items()}
+        indexes = {index: ddl for table in pending for index, ddl in SYNC_INDEXES.get(table, {}).items()}
+        triggers = [SYNC_TRIGGERS[table] for table in pending if table in SYNC_TRIGGERS]
+        with conn.cursor() as cursor:
+            cursor.execute("""
+                SELECT relname FROM pg_class
+                WHERE relname = ANY(%s) AND relkind IN ('r', 'i') AND pg_table_is_visible(oid)
+                UNION ALL
+                SELECT tgname FROM pg_trigger WHERE tgname = ANY(%s)
+                UNION ALL
+                SELECT table_name || '.' || column_name FROM information_schema.columns
+                WHERE table_schema = current_schema() AND table_name || '.' || column_name = ANY(%s)
+            """, (pending + list(indexes), triggers, list(columns)))
+            present = {name for (name,) in cursor.fetchall()}
+
+            created = []
+            for table in pending:
+                if table not in present:
+                    cursor.execute(SYNC_TABLES[table])
+                    created.append(table)
+
+            # A freshly created table already has every column; the IF NOT EXISTS makes that a no-op
+            for name, ddl in [*columns.items(), *indexes.items()]:
+                if name not in present:
+                    cursor.execute(ddl)
+                    created.append(name)
+
+            missing_triggers = [(table, SYNC_TRIGGERS[table]) for table in pending
+                                if table in SYNC_TRIGGERS and SYNC_TRIGGERS[table] not in present]
+            if missing_triggers:
+                cursor.execute(UPDATED_AT_FUNCTION)
+                for table, trigger in missing_triggers:
+                    cursor.execute(
+                        f"CREATE TRIGGER {trigger} BEFORE UPDATE ON {table} "
+                        "FOR EACH ROW EXECUTE FUNCTION update_updated_at_column()"
+                    )
+                    created.append(trigger)
+
+        conn.commit()
+        if created:
+            logging.info(f"Created missing sync schema objects: {', '.join(created)}")
+        _verified.update(pending)
@@ -449,6 +449,8 @@ CREATE TRIGGER update_checkout_sessions_updated_at BEFORE UPDATE ON checkout_ses
 CREATE TRIGGER update_checkout_step_tracking_updated_at BEFORE UPDATE ON checkout_step_tracking FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 CREATE TRIGGER update_checkout_outbox_updated_at BEFORE UPDATE ON checkout_outbox FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 CREATE TRIGGER update_insurance_overrides_updated_at BEFORE UPDATE ON insurance_overrides FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+CREATE TRIGGER update_google_users_updated_at BEFORE UPDATE ON google_users FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+CREATE TRIGGER update_org_units_updated_at BEFORE UPDATE ON org_units FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 
 -- Aeries granular permissions per user
 -- Allows super admins to enable/disable specific Aeries access per user
@@ -0,0 +1,8 @@
+-- Ensure the unique indexes the Chromebook sync relies on
+-- The sync upserts with ON CONFLICT (serial_number), which needs a unique index on serial_number,
+-- and looks devices up by serial_number and asset_tag. init.sql creates both through UNIQUE
+-- constraints, whose indexes use these names, so on an up-to-date database this is a no-op.
+-- Not CONCURRENTLY: migrations run inside a transaction.
+
+CREATE UNIQUE INDEX IF NOT EXISTS chromebooks_serial_number_key ON chromebooks(serial_number);
+CREATE UNIQUE INDEX IF NOT EXISTS chromebooks_asset_tag_key ON chromebooks(asset_tag);
@@ -0,0 +1,14 @@
+-- Add the updated_at triggers for the Google-synced tables
+-- sync_users.py and sync_org_units.py used to create these on every run; they now only
+-- create them when missing, so fresh databases get them here and from init.sql instead.
+
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = 'update_google_users_updated_at') THEN
+        CREATE TRIGGER update_google_users_updated_at BEFORE UPDATE ON google_users FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+    END IF;
+    IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = 'update_org_units_updated_at') THEN
+        CREATE TRIGGER update_org_units_updated_at BEFORE UPDATE ON org_units FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+    END IF;
+END;
+$$;
@@ -260,6 +260,12 @@ fi
 echo "🐍 [DEBUG] Aeries: AERIES_ENDPOINT=${AERIES_ENDPOINT}"
 if [ -n "$AERIES_API_KEY" ]; then echo "🐍 [DEBUG] Aeries: API key loaded"; else echo "⚠️ Aeries API key not set"; fi
 
+# Optionally start the long-lived Athena daemon so Google API scripts skip per-call Python start-up
+if [ -n "$ATHENA_DAEMON_SOCKET" ]; then
+    echo "🐍 [DEBUG] Starting Athena daemon on $ATHENA_DAEMON_SOCKET"
+    PYTHONPATH=/app python3 /app/athena/scripts/athena_daemon.py "$ATHENA_DAEMON_SOCKET" &
+fi
+
 # Start the application
 echo "🐍 [DEBUG] Starting the application..."
 exec "$@"
@@ -4,6 +4,7 @@ import { body, param, validationResult } from 'express-validator';
 import { authenticateToken, requireSuperAdmin } from '../middleware/auth';
 import { query } from '../database';
 import path from 'path';
+import net from 'net';
 
 const router = express.Router();
 
@@ -11,8 +12,80 @@ const router = express.Router();
 console.log('🔧 [DEBUG] Google API routes module loaded');
 console.log('🔧 [DEBUG] Router created:', typeof router);
 
-// Helper function to run Python scripts
-const runPythonScript = (scriptPath: string, args: string[] = []): Promise<any> => {
+// Longest the daemon connection may sit idle (no reply data) before the request is abandoned.
+// Generous because a full sync only answers once it is done; override with ATHENA_DAEMON_TIMEOUT_MS.
+const DAEMON_IDLE_TIMEOUT_MS = parseInt(process.env.ATHENA_DAEMON_TIMEOUT_MS || '', 10) || 15 * 60 * 1000;
+
+// Ask the long-lived Athena daemon (athena/scripts/athena_daemon.py) to run a script.
+// Resolves to null when the daemon is not running or does not serve the script,
+// so the caller can fall back to spawning a Python process.
+const runViaDaemon = (socketPath: string, scriptPath: string, args: string[], input?: string): Promise<any | null> => {
+    return new Promise((resolve, reject) => {
+        let dataString = '';
+        let connected = false;
+        const socket = net.createConnection(socketPath, () => {
+            connected = true;
+            socket.write(JSON.stringify({ script: path.basename(scriptPath), args, input }) + '\n');
+        });
+
+        socket.setTimeout(DAEMON_IDLE_TIMEOUT_MS);
+        socket.on('timeout', () => {
+            socket.destroy();
+            if (!connected) {
+                console.log(`🐍 [DEBUG] Athena daemon did not accept the connection in time, spawning script instead`);
+                resolve(null);
+                return;
+            }
+            // The script may already have made changes, so don't run it a second time by falling back
+            console.error(`❌ Athena daemon timed out after ${DAEMON_IDLE_TIMEOUT_MS}ms running ${path.basename(scriptPath)}`);
+            reject(new Error(`Athena daemon timed out after ${DAEMON_IDLE_TIMEOUT_MS}ms running ${path.basename(scriptPath)}`));
+        });
+
+        socket.on('data', (data) => {
+            dataString += data.toString();
+        });
+
+        socket.on('error', (error) => {
+            if (!connected) {
+                console.log(`🐍 [DEBUG] Athena daemon unavailable (${error.message}), spawning script instead`);
+                resolve(null);
+                return;
+            }
+            reject(new Error(`Athena daemon connection failed: ${error.message}`));
+        });
+
+        socket.on('end', () => {
+            // Scripts forked by the daemon may print other lines around the JSON document
+            const firstBrace = dataString.indexOf('{');
+            const lastBrace = dataString.lastIndexOf('}');
+            try {
+                const result = JSON.parse(dataString.substring(firstBrace, lastBrace + 1));
+                if (result.daemon_unsupported) {
+                    console.log(`🐍 [DEBUG] ${path.basename(scriptPath)} not served by Athena daemon, spawning script instead`);
+                    resolve(null);
+                    return;
+                }
+                console.log(`🐍 [DEBUG] ${path.basename(scriptPath)} served by Athena daemon`);
+                resolve(result);
+            } catch (error) {
+                // The script already ran, so don't run it a second time by falling back
+                console.error(`❌ Athena daemon returned no JSON for ${path.basename(scriptPath)}: ${dataString.substring(0, 500)}`);
+                reject(new Error(`Athena daemon returned no JSON for ${path.basename(scriptPath)}`));
+            }
+        });
+    });
+};
+
+// Helper function to run Python scripts; `input` is written to the script's stdin
+const runPythonScript = async (scriptPath: string, args: string[] = [], input?: string): Promise<any> => {
+    const daemonSocket = process.env.ATHENA_DAEMON_SOCKET;
+    if (daemonSocket) {
+        const result = await runViaDaemon(daemonSocket, scriptPath, args, input);
+        if (result !== null) {
+            return result;
+        }
+    }
+
     return new Promise((resolve, reject) => {
         console.log(`🐍 [DEBUG] Running Python script: ${scriptPath}`);
         console.log(`🐍 [DEBUG] With arguments: ${args.join(', ') || 'none'}`);
@@ -39,6 +112,11 @@ const runPythonScript = (scriptPath: string, args: string[] = []): Promise<any>
 
         const pythonProcess = spawn('python3', [scriptPath, ...args], { env });
 
+        if (input !== undefined) {
+            pythonProcess.stdin.write(input);
+        }
+        pythonProcess.stdin.end();
+
         let dataString = '';
         let errorString = '';
 
@@ -458,6 +536,57 @@ router.post('/devices/move', [
     }
 });
 
+// Move many devices in one call; Athena groups them by OU into batched moveDevicesToOu requests
+router.post('/devices/move/bulk', [
+    body('moves').isArray({ min: 1 }),
+    body('moves.*.deviceId').isString().trim().isLength({ min: 1 }),
+    body('moves.*.targetOrgUnit').isString().trim().isLength({ min: 1 }),
+    authenticateToken
+], async (req: any, res: any) => {
+    console.log(`🔄 [Google API] POST /devices/move/bulk - Request received`);
+    try {
+        const errors = validationResult(req);
+        if (!errors.isEmpty()) {
+            console.error('❌ [Google API] Validation errors:', errors.array());
+            return res.status(400).json({
+                error: 'Validation failed',
+                details: errors.array()
+            });
+        }
+
+        // Only admins and above can move devices
+        if (req.user.role === 'user') {
+            console.log('❌ [Google API] Access denied: insufficient permissions');
+            return res.status(403).json({ error: 'Admin access required' });
+        }
+
+        const moves = req.body.moves.map((move: any) => ({
+            device_id: move.deviceId,
+            org_unit: move.targetOrgUnit
+        }));
+
+        console.log(`✅ [Google API] Admin access confirmed, moving ${moves.length} devices`);
+        console.log(`👤 [Google API] Action performed by: ${req.user.email} (${req.user.userId})`);
+
+        const scriptPath = path.resolve(process.cwd(), './athena/scripts/move_devices.py');
+        const result = await runPythonScript(scriptPath, [], JSON.stringify(moves));
+
+        if (result.success) {
+            console.log(`✅ [Google API] Bulk move completed: ${result.message}`);
+        } else {
+            console.error(`❌ [Google API] Bulk move finished with failures: ${result.message || result.error}`);
+        }
+
+        res.json(result);
+    } catch (error) {
+        console.error('❌ [Google API] Error moving devices:', error);
+        res.status(500).json({
+            error: 'Internal server error',
+            message: 'Failed to move devices in Google API'
+        });
+    }
+});
+
 // Reset devices using WIPE_USERS command
 router.post('/devices/reset', [
     body('deviceIdentifiers').isArray().isLength({ min: 1 }),
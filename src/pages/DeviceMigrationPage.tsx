@@ -228,6 +228,7 @@ const DeviceMigrationPage: React.FC = () => {
       // Prepare device list for migration
       const deviceIdentifiers = validDevices;
       const statuses: MigrationStatus[] = [];
+      const devicesToMove: typeof chromebooks = [];
 
       // Initialize statuses
       deviceIdentifiers.forEach(identifier => {
@@ -237,76 +238,55 @@ const DeviceMigrationPage: React.FC = () => {
         );
 
         if (device) {
+          devicesToMove.push(device);
           statuses.push({
             device: `${device.assetTag} (${device.serialNumber})`,
             sourceOu: device.orgUnit || 'Unknown',
             targetOu: selectedOrgUnit,
-            status: 'pending'
+            status: 'processing'
           });
         }
       });
 
       setMigrationStatuses(statuses);
 
-      // Process each device
-      for (let i = 0; i < deviceIdentifiers.length; i++) {
-        const identifier = deviceIdentifiers[i];
-        const device = chromebooks.find(
-          c => c.serialNumber.toLowerCase() === identifier.toLowerCase() ||
-               c.assetTag.toLowerCase() === identifier.toLowerCase()
-        );
-
-        if (!device) continue;
-
-        // Update status to processing
-        setMigrationStatuses(prev => {
-          const updated = [...prev];
-          updated[i] = { ...updated[i], status: 'processing' };
-          return updated;
-        });
-
-        try {
-          // Call API to move device
-          const response = await fetch('/api/google/devices/move', {
-            method: 'POST',
-            headers: {
-              'Authorization': `Bearer ${token}`,
-              'Content-Type': 'application/json'
-            },
-            body: JSON.stringify({
+      try {
+        // Move every device in one request; the backend batches the Google API calls
+        const response = await fetch('/api/google/devices/move/bulk', {
+          method: 'POST',
+          headers: {
+            'Authorization': `Bearer ${token}`,
+            'Content-Type': 'application/json'
+          },
+          body: JSON.stringify({
+            moves: devicesToMove.map(device => ({
               deviceId: device.deviceId,
               targetOrgUnit: selectedOrgUnit
-            })
-          });
+            }))
+          })
+        });
 
-          if (response.ok) {
-            setMigrationStatuses(prev => {
-              const updated = [...prev];
-              updated[i] = {
-                ...updated[i],
-                status: 'success',
-                message: 'Successfully moved'
-              };
-              return updated;
-            });
-          } else {
-            const error = await response.json();
-            throw new Error(error.message || 'Failed to move device');
-          }
-        } catch (error) {
-          setMigrationStatuses(prev => {
-            const updated = [...prev];
-            updated[i] = {
-              ...updated[i],
-              status: 'error',
-              message: error instanceof Error ? error.message : 'Unknown error'
-            };
-            return updated;
-          });
+        const result = await response.json();
+        if (!response.ok || !Array.isArray(result.results)) {
+          throw new Error(result.message || result.error || 'Failed to move devices');
         }
 
-        // Add small delay between operations
-        await new Promise(resolve => setTimeout(resolve, 500));
+        // Map per-device outcomes back onto the status list
+        const outcomes = new Map<string, { success: boolean; error?: string }>(
+          result.results.map((outcome: { device_id: string; success: boolean; error?: string }) => [outcome.device_id, outcome])
+        );
+        setMigrationStatuses(prev => prev.map((status, i): MigrationStatus => {
+          const outcome = outcomes.get(devicesToMove[i].deviceId);
+          return outcome?.success
+            ? { ...status, status: 'success', message: 'Successfully moved' }
+            : { ...status, status: 'error', message: outcome?.error || 'Failed to move device' };
+        }));
+      } catch (error) {
+        setMigrationStatuses(prev => prev.map((status): MigrationStatus => ({
+          ...status,
+          status: 'error',
+          message: error instanceof Error ? error.message : 'Unknown error'
+        })));
       }
 
       setMigrationComplete(true);